@@ -0,0 +1,237 @@
+"""Add unique constraints for upserts of projects and events
+
+Revision ID: 5d3c81f0b6a2
+Revises: 8b2fd4c9a7e1
+Create Date: 2026-10-18 14:21:09.113482
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5d3c81f0b6a2"
+down_revision = "8b2fd4c9a7e1"
+branch_labels = None
+depends_on = None
+
+
+# table: (columns of the unique key, name of the constraint)
+UNIQUE_CONSTRAINTS = {
+    "git_projects": (
+        ["namespace", "repo_name", "project_url"],
+        "uq_git_projects_namespace_repo_name_project_url",
+    ),
+    "pull_requests": (["project_id", "pr_id"], "uq_pull_requests_project_id_pr_id"),
+    "project_issues": (
+        ["project_id", "issue_id"],
+        "uq_project_issues_project_id_issue_id",
+    ),
+    "git_branches": (["project_id", "name"], "uq_git_branches_project_id_name"),
+    "project_releases": (
+        ["project_id", "tag_name"],
+        "uq_project_releases_project_id_tag_name",
+    ),
+    "koji_build_tags": (
+        ["project_id", "task_id", "koji_tag_name"],
+        "uq_koji_build_tags_project_id_task_id_koji_tag_name",
+    ),
+}
+
+# tables referencing the project events through (type, event_id)
+PROJECT_EVENT_TYPES = {
+    "pull_requests": "pull_request",
+    "project_issues": "issue",
+    "git_branches": "branch_push",
+    "project_releases": "release",
+    "koji_build_tags": "koji_build_tag",
+}
+
+# tables referencing the projects through project_id
+PROJECT_REFERENCES = [
+    "pull_requests",
+    "project_issues",
+    "git_branches",
+    "project_releases",
+    "koji_build_tags",
+    "sync_release_pull_request",
+    "project_authentication_issue",
+    # the project is not a part of the unique key of the active events
+    "usage_rollup_events",
+]
+
+
+def find_duplicates(table: str, key: str) -> None:
+    """
+    Fill the `duplicates` temporary table with the IDs of the rows
+    that have the same key as a row with a lower ID, which is kept.
+    """
+    op.execute(
+        f"""
+        CREATE TEMPORARY TABLE duplicates AS
+        SELECT id, keep_id FROM (
+            SELECT id, min(id) OVER (PARTITION BY {key}) AS keep_id FROM {table}
+        ) AS numbered
+        WHERE id != keep_id
+        """
+    )
+
+
+def remove_duplicates(table: str) -> None:
+    op.execute(f"DELETE FROM {table} USING duplicates WHERE {table}.id = duplicates.id")
+    op.execute("DROP TABLE duplicates")
+
+
+def merge_projects() -> None:
+    find_duplicates("git_projects", "namespace, repo_name, project_url")
+
+    for table in PROJECT_REFERENCES:
+        op.execute(
+            f"""
+            UPDATE {table} SET project_id = duplicates.keep_id
+            FROM duplicates WHERE {table}.project_id = duplicates.id
+            """
+        )
+
+    # the rollups are unique per project, add the counts to the kept project
+    op.execute(
+        """
+        INSERT INTO usage_rollups
+            (granularity, bucket_start, project_id, project_event_type, job_type, count)
+        SELECT granularity, bucket_start, duplicates.keep_id,
+            project_event_type, job_type, sum(count)
+        FROM usage_rollups JOIN duplicates ON usage_rollups.project_id = duplicates.id
+        GROUP BY granularity, bucket_start, duplicates.keep_id,
+            project_event_type, job_type
+        ON CONFLICT (granularity, bucket_start, project_id, project_event_type, job_type)
+        DO UPDATE SET count = usage_rollups.count + EXCLUDED.count
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM usage_rollups USING duplicates
+        WHERE usage_rollups.project_id = duplicates.id
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE github_installations SET repositories = (
+            SELECT array_agg(project_id ORDER BY position) FROM (
+                SELECT DISTINCT ON (coalesce(duplicates.keep_id, repository))
+                    coalesce(duplicates.keep_id, repository) AS project_id, position
+                FROM unnest(github_installations.repositories)
+                    WITH ORDINALITY AS repositories(repository, position)
+                LEFT JOIN duplicates ON duplicates.id = repository
+                ORDER BY coalesce(duplicates.keep_id, repository), position
+            ) AS merged
+        )
+        WHERE repositories && ARRAY(SELECT id FROM duplicates)
+        """
+    )
+
+    remove_duplicates("git_projects")
+
+
+def merge_project_event_objects(table: str) -> None:
+    columns, _ = UNIQUE_CONSTRAINTS[table]
+    find_duplicates(table, ", ".join(columns))
+
+    op.execute(
+        f"""
+        UPDATE project_events SET event_id = duplicates.keep_id
+        FROM duplicates
+        WHERE project_events.type = '{PROJECT_EVENT_TYPES[table]}'
+            AND project_events.event_id = duplicates.id
+        """
+    )
+    # the active events are unique per bucket, keep the one of the kept object
+    # or the oldest one of its duplicates
+    op.execute(
+        f"""
+        DELETE FROM usage_rollup_events AS event USING duplicates
+        WHERE event.project_event_type = '{PROJECT_EVENT_TYPES[table]}'
+            AND event.event_id = duplicates.id AND EXISTS (
+                SELECT 1 FROM usage_rollup_events AS other
+                LEFT JOIN duplicates AS other_duplicates
+                    ON other.event_id = other_duplicates.id
+                WHERE other.project_event_type = event.project_event_type
+                    AND other.granularity = event.granularity
+                    AND other.bucket_start = event.bucket_start
+                    AND coalesce(other_duplicates.keep_id, other.event_id)
+                        = duplicates.keep_id
+                    AND (other.event_id = duplicates.keep_id OR other.id < event.id)
+            )
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE usage_rollup_events SET event_id = duplicates.keep_id
+        FROM duplicates
+        WHERE usage_rollup_events.project_event_type = '{PROJECT_EVENT_TYPES[table]}'
+            AND usage_rollup_events.event_id = duplicates.id
+        """
+    )
+    if table == "pull_requests":
+        for column in ("source_git_pull_request_id", "dist_git_pull_request_id"):
+            # the links are unique, keep the one of the kept PR
+            # or the oldest one of its duplicates
+            op.execute(
+                f"""
+                DELETE FROM source_git_pr_dist_git_pr AS link USING duplicates
+                WHERE link.{column} = duplicates.id AND EXISTS (
+                    SELECT 1 FROM source_git_pr_dist_git_pr AS other
+                    LEFT JOIN duplicates AS other_duplicates
+                        ON other.{column} = other_duplicates.id
+                    WHERE coalesce(other_duplicates.keep_id, other.{column})
+                            = duplicates.keep_id
+                        AND (other.{column} = duplicates.keep_id OR other.id < link.id)
+                )
+                """
+            )
+            op.execute(
+                f"""
+                UPDATE source_git_pr_dist_git_pr SET {column} = duplicates.keep_id
+                FROM duplicates WHERE source_git_pr_dist_git_pr.{column} = duplicates.id
+                """
+            )
+
+    remove_duplicates(table)
+
+
+def merge_project_events() -> None:
+    find_duplicates("project_events", "type, event_id, coalesce(commit_sha, '')")
+    op.execute(
+        """
+        UPDATE pipelines SET project_event_id = duplicates.keep_id
+        FROM duplicates WHERE pipelines.project_event_id = duplicates.id
+        """
+    )
+    remove_duplicates("project_events")
+
+
+def upgrade():
+    # the rows were created by concurrent check-then-insert calls before,
+    # merge the duplicates so that the unique constraints can be created
+    merge_projects()
+    for table in PROJECT_EVENT_TYPES:
+        merge_project_event_objects(table)
+    merge_project_events()
+
+    for table, (columns, name) in UNIQUE_CONSTRAINTS.items():
+        op.create_unique_constraint(name, table, columns)
+    op.create_index(
+        "uq_project_events_type_event_id_commit_sha",
+        "project_events",
+        ["type", "event_id", sa.text("coalesce(commit_sha, '')")],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "uq_project_events_type_event_id_commit_sha", table_name="project_events"
+    )
+    for table, (_, name) in reversed(UNIQUE_CONSTRAINTS.items()):
+        op.drop_constraint(name, table, type_="unique")
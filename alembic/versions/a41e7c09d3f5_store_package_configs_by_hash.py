@@ -0,0 +1,112 @@
+"""Store package configs of project events by hash
+
+Revision ID: a41e7c09d3f5
+Revises: 5d3c81f0b6a2
+Create Date: 2026-10-18 16:02:44.730915
+
+"""
+
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a41e7c09d3f5"
+down_revision = "5d3c81f0b6a2"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def get_hash(config: dict) -> str:
+    # same as PackageConfigModel.get_hash
+    content = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def upgrade():
+    op.create_table(
+        "package_configs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("hash", sa.String(), nullable=False),
+        sa.Column("config", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("hash"),
+    )
+    op.add_column(
+        "project_events",
+        sa.Column("packages_config_hash", sa.String(), nullable=True),
+    )
+    op.create_foreign_key(
+        None, "project_events", "package_configs", ["packages_config_hash"], ["hash"]
+    )
+    op.create_index(
+        op.f("ix_project_events_packages_config_hash"),
+        "project_events",
+        ["packages_config_hash"],
+        unique=False,
+    )
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, packages_config FROM project_events "
+                "WHERE packages_config IS NOT NULL AND id > :last_id "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+
+        configs = {}
+        events = []
+        for event_id, config in rows:
+            config_hash = get_hash(config)
+            configs[config_hash] = config
+            events.append({"id": event_id, "hash": config_hash})
+
+        bind.execute(
+            sa.text(
+                "INSERT INTO package_configs (hash, config) "
+                "VALUES (:hash, CAST(:config AS JSON)) ON CONFLICT (hash) DO NOTHING"
+            ),
+            [
+                {"hash": config_hash, "config": json.dumps(config)}
+                for config_hash, config in configs.items()
+            ],
+        )
+        bind.execute(
+            sa.text(
+                "UPDATE project_events SET packages_config_hash = :hash WHERE id = :id"
+            ),
+            events,
+        )
+        last_id = rows[-1][0]
+
+    op.drop_column("project_events", "packages_config")
+
+
+def downgrade():
+    op.add_column(
+        "project_events",
+        sa.Column("packages_config", sa.JSON(), autoincrement=False, nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE project_events SET packages_config = package_configs.config
+        FROM package_configs
+        WHERE project_events.packages_config_hash = package_configs.hash
+        """
+    )
+    op.drop_index(
+        op.f("ix_project_events_packages_config_hash"), table_name="project_events"
+    )
+    op.drop_column("project_events", "packages_config_hash")
+    op.drop_table("package_configs")
@@ -0,0 +1,788 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Caches shared by the web service and the workers.
+
+The shared state lives in the Redis instance used as the Celery broker,
+tests and local runs can use the in-memory stand-in instead.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from os import getenv
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import redis
+from cachetools import LRUCache, TTLCache
+from ogr.abstract import GitProject
+from packit.config import PackageConfig
+from packit.exceptions import PackitException
+
+from packit_service.constants import (
+    ALLOWLIST_INDEX_MAX_AGE,
+    CATALOG_CACHE_MAX_STALE,
+    CATALOG_CACHE_TTL,
+    CATALOG_REFRESH_LOCK_TTL,
+    FAS_GROUPS_CACHE_SIZE,
+    FAS_GROUPS_CACHE_TTL,
+    FAS_GROUPS_LOCAL_CACHE_TTL,
+    FAS_GROUPS_NEGATIVE_CACHE_TTL,
+    PACKAGE_CONFIG_CACHE_SIZE,
+    PACKAGE_CONFIG_CACHE_TTL,
+    PACKAGE_CONFIG_NEGATIVE_CACHE_TTL,
+    TASK_PAYLOAD_CACHE_SIZE,
+    TASK_PAYLOAD_TTL,
+)
+from packit_service.worker.monitoring import Pushgateway
+
+logger = logging.getLogger(__name__)
+
+COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}")
+# marks configs missing in the in-process cache, None is cached for repos without a config
+NOT_CACHED = object()
+
+
+class InMemoryStore:
+    """Process-local stand-in for Redis with the subset of commands we use."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        value, expires = self._data.get(key, (None, 0.0))
+        if expires <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value: str, ttl: int, only_new: bool = False) -> bool:
+        with self._lock:
+            if only_new and self._get(key) is not None:
+                return False
+            self._data[key] = (value, time.monotonic() + ttl)
+            return True
+
+    def expire(self, key: str, ttl: int) -> bool:
+        with self._lock:
+            if (value := self._get(key)) is None:
+                return False
+            self._data[key] = (value, time.monotonic() + ttl)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._get(key) or 0) + 1
+            self._data[key] = (str(value), float("inf"))
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisStore:
+    """Store backed by the Redis instance used as the Celery broker."""
+
+    def __init__(self):
+        self.client = redis.Redis(
+            host=getenv("REDIS_SERVICE_HOST", "redis"),
+            port=int(getenv("REDIS_SERVICE_PORT", "6379")),
+            db=int(getenv("REDIS_SERVICE_DB", "0")),
+            password=getenv("REDIS_PASSWORD") or None,
+            socket_timeout=1,
+            socket_connect_timeout=1,
+            decode_responses=True,
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str, ttl: int, only_new: bool = False) -> bool:
+        return bool(self.client.set(key, value, ex=ttl, nx=only_new))
+
+    def expire(self, key: str, ttl: int) -> bool:
+        return bool(self.client.expire(key, ttl))
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+
+class PackageConfigCache:
+    """
+    Cache of the package configs fetched from the forges.
+
+    The config on a commit never changes, so it's cached under the project
+    and the commit SHA: parsed in the process and serialized in Redis
+    so that the other workers don't need to fetch it again. Repositories
+    without a config are cached only for `negative_ttl` seconds, since
+    the config is also missing when e.g. the app is not installed yet.
+    Configs for branches and tags are always fetched since they can move.
+
+    Errors of the store are logged and the config is fetched as usual.
+    """
+
+    _store = None
+
+    def __init__(
+        self,
+        maxsize: int = PACKAGE_CONFIG_CACHE_SIZE,
+        ttl: int = PACKAGE_CONFIG_CACHE_TTL,
+        negative_ttl: int = PACKAGE_CONFIG_NEGATIVE_CACHE_TTL,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of configs kept in the process.
+            ttl: Number of seconds for which the configs are cached.
+            negative_ttl: Number of seconds for which repositories
+                without a config are cached.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.configs: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.missing: TTLCache = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+        self.lock = threading.Lock()
+        self.pushgateway = Pushgateway()
+
+    @property
+    def store(self):
+        if PackageConfigCache._store is None:
+            PackageConfigCache._store = RedisStore()
+        return PackageConfigCache._store
+
+    @staticmethod
+    def get_key(
+        project: GitProject, reference: Optional[str], path: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get the cache key of the config or None if it can't be cached,
+        i.e. the reference is not a commit SHA.
+        """
+        if not (reference and COMMIT_SHA_PATTERN.fullmatch(reference)):
+            return None
+        return (
+            f"packit:package-config:{project.service.instance_url}/"
+            f"{project.namespace}/{project.repo}:{reference}:{path or ''}"
+        )
+
+    def get(self, key: str) -> Tuple[bool, Optional[PackageConfig]]:
+        """
+        Get the config from the cache.
+
+        Returns:
+            Tuple of whether the config was found in the cache and the config
+            itself, which is None for repositories without a config.
+        """
+        with self.lock:
+            package_config = (
+                None if key in self.missing else self.configs.get(key, NOT_CACHED)
+            )
+        if package_config is not NOT_CACHED:
+            self.pushgateway.package_config_cache_hits.inc()
+            return True, package_config
+
+        try:
+            serialized = self.store.get(key)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to get the cached package config: {ex}")
+            serialized = None
+
+        if serialized is None:
+            self.pushgateway.package_config_cache_misses.inc()
+            return False, None
+
+        raw_config = json.loads(serialized)
+        package_config = (
+            PackageConfig.get_from_dict_without_setting_defaults(raw_config)
+            if raw_config
+            else None
+        )
+        with self.lock:
+            if package_config is None:
+                self.missing[key] = True
+            else:
+                self.configs[key] = package_config
+        self.pushgateway.package_config_cache_hits.inc()
+        return True, package_config
+
+    def set(self, key: str, package_config: Optional[PackageConfig]) -> None:
+        """Cache the config, None is cached for repositories without a config."""
+        with self.lock:
+            if package_config is None:
+                self.missing[key] = True
+            else:
+                self.configs[key] = package_config
+
+        serialized = json.dumps(
+            package_config.get_raw_dict_with_defaults() if package_config else None
+        )
+        try:
+            self.store.set(
+                key, serialized, self.ttl if package_config else self.negative_ttl
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to cache the package config: {ex}")
+
+
+class AllowlistIndex:
+    """
+    In-process prefix tree of the allowlist.
+
+    The namespaces are split into the path segments (e.g. `github.com`,
+    `packit`, `ogr.git`), so the statuses of a namespace and all its parents
+    are found in a single walk without querying the database.
+
+    Every change of the allowlist increments a version counter in Redis,
+    the index is reloaded once the version differs from the loaded one
+    or the index gets older than `max_age` seconds. If the version can't
+    be read, the loaded index is used until it gets older than `max_age`.
+    """
+
+    VERSION_KEY = "packit:allowlist-version"
+
+    _store = None
+
+    def __init__(
+        self,
+        load: Callable[[], Iterable[Tuple[str, str]]],
+        max_age: int = ALLOWLIST_INDEX_MAX_AGE,
+    ):
+        """
+        Args:
+            load: Function returning the namespaces in the allowlist
+                together with their statuses.
+            max_age: Maximum number of seconds for which the loaded
+                index is used.
+        """
+        self.load = load
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.tree: dict = {}
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+
+    @classmethod
+    def get_store(cls):
+        if AllowlistIndex._store is None:
+            AllowlistIndex._store = RedisStore()
+        return AllowlistIndex._store
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Let all the processes know the allowlist has changed."""
+        try:
+            cls.get_store().incr(cls.VERSION_KEY)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to invalidate the allowlist index: {ex}")
+
+    @staticmethod
+    def _split(namespace: str) -> List[str]:
+        return namespace.split("/")
+
+    def _build(self) -> dict:
+        tree: dict = {}
+        for namespace, status in self.load():
+            node = tree
+            for segment in self._split(namespace):
+                node = node.setdefault(segment, {})
+            # path segments can't contain a slash, so it's safe to use for the status
+            node["/"] = status
+        return tree
+
+    def _refresh(self) -> dict:
+        try:
+            version = self.get_store().get(self.VERSION_KEY) or "0"
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to get the version of the allowlist: {ex}")
+            version = None
+
+        with self.lock:
+            if (
+                self.loaded_at is None
+                or time.monotonic() - self.loaded_at > self.max_age
+                or (version is not None and version != self.version)
+            ):
+                logger.debug(f"Loading the allowlist index, version {version}.")
+                self.tree = self._build()
+                self.version = version
+                self.loaded_at = time.monotonic()
+            return self.tree
+
+    def get_statuses(self, namespace: str) -> List[Tuple[str, str]]:
+        """
+        Get the entries of the namespace and all its parents.
+
+        Args:
+            namespace: Namespace in format `example.com/namespace/repository.git`,
+                where `/repository.git` is optional.
+
+        Returns:
+            List of the matching namespaces and their statuses, starting with
+            the most specific one.
+        """
+        node = self._refresh()
+        segments = self._split(namespace)
+        statuses = []
+        for depth, segment in enumerate(segments, start=1):
+            if (node := node.get(segment)) is None:
+                break
+            if (status := node.get("/")) is not None:
+                statuses.append(("/".join(segments[:depth]), status))
+        return statuses[::-1]
+
+
+class FasGroupsCache:
+    """
+    Cache of the FAS groups of the users, used by the permission checks.
+
+    The groups are kept in Redis for `ttl` seconds, failed lookups
+    (e.g. of unknown users) only for `negative_ttl` seconds. The processes
+    keep them for at most `local_ttl` seconds, so once a membership is known
+    to have changed, `invalidate()` makes all the processes look the groups
+    of the user up again within that time.
+
+    Errors of the store are logged and the groups are looked up as usual.
+    """
+
+    PREFIX = "packit:fas-groups:"
+
+    _store = None
+
+    def __init__(
+        self,
+        maxsize: int = FAS_GROUPS_CACHE_SIZE,
+        ttl: int = FAS_GROUPS_CACHE_TTL,
+        negative_ttl: int = FAS_GROUPS_NEGATIVE_CACHE_TTL,
+        local_ttl: int = FAS_GROUPS_LOCAL_CACHE_TTL,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of users kept in the process.
+            ttl: Number of seconds for which the groups are cached.
+            negative_ttl: Number of seconds for which failed lookups are cached.
+            local_ttl: Maximum number of seconds for which the groups
+                and failed lookups are kept in the process.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.groups: TTLCache = TTLCache(maxsize=maxsize, ttl=min(ttl, local_ttl))
+        self.failed: TTLCache = TTLCache(
+            maxsize=maxsize, ttl=min(negative_ttl, local_ttl)
+        )
+        self.lock = threading.Lock()
+        self.pushgateway = Pushgateway()
+
+    @property
+    def store(self):
+        if FasGroupsCache._store is None:
+            FasGroupsCache._store = RedisStore()
+        return FasGroupsCache._store
+
+    def _get_cached(self, username: str) -> Tuple[bool, Optional[List[str]]]:
+        with self.lock:
+            if username in self.failed:
+                return True, None
+            if (groups := self.groups.get(username)) is not None:
+                return True, groups
+
+        try:
+            serialized = self.store.get(self.PREFIX + username)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to get the cached FAS groups: {ex}")
+            return False, None
+        if serialized is None:
+            return False, None
+
+        groups = json.loads(serialized)
+        with self.lock:
+            if groups is None:
+                self.failed[username] = True
+            else:
+                self.groups[username] = groups
+        return True, groups
+
+    def get(
+        self, username: str, lookup: Callable[[str], Optional[List[str]]]
+    ) -> Optional[List[str]]:
+        """
+        Get the groups of the user.
+
+        Args:
+            username: FAS username.
+            lookup: Function looking the groups of the user up in FAS,
+                returning None if the lookup fails.
+
+        Returns:
+            Names of the groups or None if they couldn't be looked up.
+        """
+        cached, groups = self._get_cached(username)
+        if cached:
+            self.pushgateway.fas_groups_cache_hits.inc()
+            return groups
+
+        self.pushgateway.fas_groups_cache_misses.inc()
+        groups = lookup(username)
+        with self.lock:
+            if groups is None:
+                self.failed[username] = True
+            else:
+                self.groups[username] = groups
+        try:
+            self.store.set(
+                self.PREFIX + username,
+                json.dumps(groups),
+                self.ttl if groups is not None else self.negative_ttl,
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to cache the FAS groups: {ex}")
+        return groups
+
+    def invalidate(self, username: str) -> None:
+        """Forget the groups of the user in this and all the other processes."""
+        with self.lock:
+            self.groups.pop(username, None)
+            self.failed.pop(username, None)
+        try:
+            self.store.delete(self.PREFIX + username)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to invalidate the cached FAS groups: {ex}")
+
+
+fas_groups = FasGroupsCache()
+
+
+class CatalogCache:
+    """
+    Cache of the catalogs of the external services, e.g. the Copr chroots
+    or the Testing Farm composes, which change only a few times a year.
+
+    The catalogs are served stale-while-revalidate: a catalog is fresh for
+    `ttl` seconds, after that it's still served while it's refreshed
+    in a background thread, unless it's older than `max_stale` seconds.
+    Only such old or missing catalogs are fetched before being served.
+    The catalogs are shared with the other processes through Redis,
+    so a catalog is usually refreshed by a single worker.
+
+    Failed fetches are not cached, the stale catalog (if any) is served instead.
+    """
+
+    PREFIX = "packit:catalog:"
+
+    _store = None
+
+    def __init__(
+        self,
+        ttl: int = CATALOG_CACHE_TTL,
+        max_stale: int = CATALOG_CACHE_MAX_STALE,
+        background_refresh: bool = True,
+    ):
+        """
+        Args:
+            ttl: Number of seconds for which a catalog is fresh.
+            max_stale: Number of seconds for which a catalog is served
+                while it's being refreshed.
+            background_refresh: Whether to refresh the stale catalogs
+                in a background thread instead of right after serving them.
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.background_refresh = background_refresh
+        # name of the catalog -> (items, time.time() of the fetch)
+        self.catalogs: Dict[str, Tuple[FrozenSet[str], float]] = {}
+        self.refreshing: Set[str] = set()
+        self.lock = threading.Lock()
+        self.pushgateway = Pushgateway()
+
+    @property
+    def store(self):
+        if CatalogCache._store is None:
+            CatalogCache._store = RedisStore()
+        return CatalogCache._store
+
+    def _load(self, name: str) -> Optional[Tuple[FrozenSet[str], float]]:
+        """Get the newest catalog known to this or the other processes."""
+        with self.lock:
+            entry = self.catalogs.get(name)
+        if entry and time.time() - entry[1] < self.ttl:
+            return entry
+
+        try:
+            serialized = self.store.get(self.PREFIX + name)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to get the cached catalog {name}: {ex}")
+            serialized = None
+        if serialized is None:
+            return entry
+
+        stored = json.loads(serialized)
+        if entry and entry[1] >= stored["fetched_at"]:
+            return entry
+        entry = frozenset(stored["items"]), stored["fetched_at"]
+        with self.lock:
+            self.catalogs[name] = entry
+        return entry
+
+    def _save(self, name: str, items: FrozenSet[str]) -> None:
+        fetched_at = time.time()
+        with self.lock:
+            self.catalogs[name] = items, fetched_at
+        try:
+            self.store.set(
+                self.PREFIX + name,
+                json.dumps({"items": sorted(items), "fetched_at": fetched_at}),
+                self.max_stale,
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to cache the catalog {name}: {ex}")
+
+    def refresh(
+        self, name: str, fetch: Callable[[], Optional[Iterable[str]]]
+    ) -> Optional[FrozenSet[str]]:
+        """
+        Fetch the catalog and cache it.
+
+        Returns:
+            The catalog or None if it couldn't be fetched.
+        """
+        logger.debug(f"Fetching the catalog {name}.")
+        items = fetch()
+        if items is None:
+            logger.warning(f"Failed to fetch the catalog {name}.")
+            return None
+        items = frozenset(items)
+        self._save(name, items)
+        return items
+
+    def _refresh_quietly(
+        self, name: str, fetch: Callable[[], Optional[Iterable[str]]]
+    ) -> None:
+        try:
+            self.refresh(name, fetch)
+        except Exception as ex:
+            logger.warning(f"Failed to refresh the catalog {name}: {ex!r}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(name)
+
+    def _refresh_stale(
+        self, name: str, fetch: Callable[[], Optional[Iterable[str]]]
+    ) -> None:
+        """Refresh the catalog unless this or another process is already doing it."""
+        with self.lock:
+            if name in self.refreshing:
+                return
+            self.refreshing.add(name)
+
+        try:
+            locked = self.store.set(
+                f"{self.PREFIX}{name}:refreshing",
+                "1",
+                CATALOG_REFRESH_LOCK_TTL,
+                only_new=True,
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to lock the catalog {name}: {ex}")
+            locked = True
+        if not locked:
+            with self.lock:
+                self.refreshing.discard(name)
+            return
+
+        if self.background_refresh:
+            threading.Thread(
+                target=self._refresh_quietly,
+                args=(name, fetch),
+                name=f"catalog-refresh-{name}",
+                daemon=True,
+            ).start()
+        else:
+            self._refresh_quietly(name, fetch)
+
+    def get(
+        self, name: str, fetch: Callable[[], Optional[Iterable[str]]]
+    ) -> Optional[FrozenSet[str]]:
+        """
+        Get the catalog.
+
+        Args:
+            name: Name of the catalog, unique across the services.
+            fetch: Function fetching the items of the catalog,
+                returning None if the fetch fails.
+
+        Returns:
+            Items of the catalog or None if it's not cached
+            and couldn't be fetched.
+
+        Raises:
+            Exceptions raised by `fetch` if the catalog is not cached.
+        """
+        entry = self._load(name)
+        if entry:
+            items, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                self.pushgateway.catalog_cache_hits.labels(
+                    catalog=name, stale="no"
+                ).inc()
+                return items
+            if age < self.max_stale:
+                self.pushgateway.catalog_cache_hits.labels(
+                    catalog=name, stale="yes"
+                ).inc()
+                self._refresh_stale(name, fetch)
+                return items
+
+        self.pushgateway.catalog_cache_misses.labels(catalog=name).inc()
+        try:
+            items = self.refresh(name, fetch)
+        except Exception:
+            if not entry:
+                raise
+            logger.warning(f"Serving the catalog {name} fetched at {entry[1]}.")
+            return entry[0]
+        return items if items is not None else (entry[0] if entry else None)
+
+
+catalogs = CatalogCache()
+
+
+class PackitTaskPayloadNotFoundException(PackitException):
+    """The payload of the task has expired or has never been stored."""
+
+
+class TaskPayloadStore:
+    """
+    Payloads of the Celery tasks (events, package configs) passed by reference.
+
+    The tasks created for a single event usually carry the same event
+    and package config, so the payloads are serialized once and stored
+    in Redis under their hash and the kwargs of the tasks only contain
+    the key. Within `batch()` (e.g. for all the tasks of an event) each
+    payload is serialized and stored only once. The workers resolve the keys
+    before running the tasks and keep the serialized payloads they've seen
+    in the process.
+    """
+
+    PREFIX = "packit:task-payload:"
+
+    _store = None
+
+    def __init__(
+        self,
+        maxsize: int = TASK_PAYLOAD_CACHE_SIZE,
+        ttl: int = TASK_PAYLOAD_TTL,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of serialized payloads kept in the process.
+            ttl: Number of seconds for which the payloads are stored in Redis.
+        """
+        self.ttl = ttl
+        self.payloads: LRUCache = LRUCache(maxsize=maxsize)
+        self.lock = threading.Lock()
+        # payloads stored within the current batch of the thread and their keys
+        self.local = threading.local()
+
+    @property
+    def store(self):
+        if TaskPayloadStore._store is None:
+            TaskPayloadStore._store = RedisStore()
+        return TaskPayloadStore._store
+
+    @classmethod
+    def is_reference(cls, value: Any) -> bool:
+        return isinstance(value, str) and value.startswith(cls.PREFIX)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Store each payload put within the block only once.
+        The payloads must not be modified after they are put.
+        """
+        self.local.batch = []
+        try:
+            yield
+        finally:
+            self.local.batch = None
+
+    def put(self, payload: Any) -> Any:
+        """
+        Store the payload.
+
+        Returns:
+            Reference to the payload or the payload itself if it can't be stored.
+        """
+        batch = getattr(self.local, "batch", None)
+        if batch is not None:
+            for stored_payload, key in batch:
+                if stored_payload == payload:
+                    return key
+
+        serialized = json.dumps(payload, sort_keys=True)
+        key = self.PREFIX + hashlib.sha256(serialized.encode()).hexdigest()
+        with self.lock:
+            known = key in self.payloads
+        try:
+            # the reference must stay resolvable for the TTL, extend it if the payload
+            # is known to the process, the copy in Redis could have expired
+            # or been evicted since though
+            if not (known and self.store.expire(key, self.ttl)):
+                self.store.set(key, serialized, self.ttl)
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to store the task payload, passing it as is: {ex}")
+            return payload
+
+        with self.lock:
+            self.payloads[key] = serialized
+        if batch is not None:
+            batch.append((payload, key))
+        return key
+
+    def get(self, key: str) -> Any:
+        """Get the payload stored under the reference."""
+        with self.lock:
+            serialized = self.payloads.get(key)
+        if serialized is None:
+            serialized = self.store.get(key)
+            if serialized is None:
+                raise PackitTaskPayloadNotFoundException(
+                    f"Payload {key} of the task not found, it has probably expired."
+                )
+            with self.lock:
+                self.payloads[key] = serialized
+        # the handlers can modify the payload, don't share the objects
+        return json.loads(serialized)
+
+    def resolve(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the references in the kwargs of a task with the payloads."""
+        return {
+            name: self.get(value) if self.is_reference(value) else value
+            for name, value in kwargs.items()
+        }
+
+
+task_payloads = TaskPayloadStore()
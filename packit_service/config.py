@@ -21,15 +21,20 @@ from packit.exceptions import (
     PackitException,
     PackitMissingConfigException,
 )
+from packit_service.cache import PackageConfigCache
 from packit_service.constants import (
     CONFIG_FILE_NAME,
     CONTACTS_URL,
+    DATABASE_MAX_OVERFLOW,
     DOCS_HOW_TO_CONFIGURE_URL,
     SANDCASTLE_DEFAULT_PROJECT,
     SANDCASTLE_IMAGE,
     SANDCASTLE_PVC,
     SANDCASTLE_WORK_DIR,
     TESTING_FARM_API_URL,
+    TESTING_FARM_BABYSIT_CONCURRENCY,
+    TESTING_FARM_BABYSIT_RATE_LIMIT,
+    WEBHOOK_DEDUPLICATION_WINDOW,
     DOCS_VALIDATE_CONFIG,
     DOCS_VALIDATE_HOOKS,
 )
@@ -113,6 +118,14 @@ class ServiceConfig(Config):
         package_config_path_override: Optional[str] = None,
         command_handler_storage_class: Optional[str] = None,
         appcode: Optional[str] = None,
+        testing_farm_babysit_concurrency: int = TESTING_FARM_BABYSIT_CONCURRENCY,
+        testing_farm_babysit_rate_limit: float = TESTING_FARM_BABYSIT_RATE_LIMIT,
+        webhook_deduplication_window: int = WEBHOOK_DEDUPLICATION_WINDOW,
+        database_pool_size: Optional[int] = None,
+        database_max_overflow: int = DATABASE_MAX_OVERFLOW,
+        database_pool_pre_ping: bool = True,
+        repository_cache_max_size: Optional[float] = None,
+        parallel_sync_release: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -183,6 +196,31 @@ class ServiceConfig(Config):
         # Appcode used in MP+ to differentiate applications
         self.appcode = appcode
 
+        # Number of concurrent requests and maximum requests per second
+        # used when babysitting pending Testing Farm runs
+        self.testing_farm_babysit_concurrency = testing_farm_babysit_concurrency
+        self.testing_farm_babysit_rate_limit = testing_farm_babysit_rate_limit
+
+        # Number of seconds for which webhook deliveries and pull request heads
+        # are remembered, 0 turns off the coalescing of redundant events
+        self.webhook_deduplication_window = webhook_deduplication_window
+
+        # Sizing of the database connection pool, if the pool size is not set,
+        # it's derived from the number of concurrent tasks of the worker
+        self.database_pool_size = database_pool_size
+        self.database_max_overflow = database_max_overflow
+        # Check the connections before using them so that the workers
+        # recover from a restart of the database
+        self.database_pool_pre_ping = database_pool_pre_ping
+
+        # Size budget of the repository cache in GiB, if set, the cache is managed
+        # by the service (mirrors are added, refreshed and evicted as needed)
+        self.repository_cache_max_size = repository_cache_max_size
+
+        # Run propose-downstream and pull-from-upstream for each dist-git branch
+        # in a separate task so that the branches are synced in parallel
+        self.parallel_sync_release = parallel_sync_release
+
     service_config = None
 
     def __repr__(self):
@@ -211,7 +249,15 @@ class ServiceConfig(Config):
             f"enabled_projects_for_srpm_in_copr= '{self.enabled_projects_for_srpm_in_copr}', "
             f"comment_command_prefix='{self.comment_command_prefix}', "
             f"redhat_api_refresh_token='{hide(self.redhat_api_refresh_token)}', "
-            f"package_config_path_override='{self.package_config_path_override}')"
+            f"package_config_path_override='{self.package_config_path_override}', "
+            f"testing_farm_babysit_concurrency='{self.testing_farm_babysit_concurrency}', "
+            f"testing_farm_babysit_rate_limit='{self.testing_farm_babysit_rate_limit}', "
+            f"webhook_deduplication_window='{self.webhook_deduplication_window}', "
+            f"database_pool_size='{self.database_pool_size}', "
+            f"database_max_overflow='{self.database_max_overflow}', "
+            f"database_pool_pre_ping='{self.database_pool_pre_ping}', "
+            f"repository_cache_max_size='{self.repository_cache_max_size}', "
+            f"parallel_sync_release='{self.parallel_sync_release}')"
         )
 
     @classmethod
@@ -286,6 +332,8 @@ class ServiceConfig(Config):
 
 
 class PackageConfigGetter:
+    package_config_cache = PackageConfigCache()
+
     @staticmethod
     def create_issue_if_needed(
         project: GitProject,
@@ -329,12 +377,21 @@ class PackageConfigGetter:
             return None
 
         project_to_search_in = base_project or project
+        package_config_path = (
+            ServiceConfig.get_service_config().package_config_path_override
+        )
+        cache = PackageConfigGetter.package_config_cache
+        key = cache.get_key(project_to_search_in, reference, package_config_path)
         try:
-            package_config: PackageConfig = get_package_config_from_repo(
-                project=project_to_search_in,
-                ref=reference,
-                package_config_path=ServiceConfig.get_service_config().package_config_path_override,
-            )
+            cached, package_config = cache.get(key) if key else (False, None)
+            if not cached:
+                package_config = get_package_config_from_repo(
+                    project=project_to_search_in,
+                    ref=reference,
+                    package_config_path=package_config_path,
+                )
+                if key:
+                    cache.set(key, package_config)
             if not package_config and fail_when_missing:
                 raise PackitMissingConfigException(
                     f"No config file for packit (e.g. `.packit.yaml`) found in "
@@ -37,6 +37,89 @@ TESTING_FARM_EXTRA_PARAM_MERGED_SUBTREES = (
 )
 TESTING_FARM_ARTIFACTS_KEY = "artifacts"
 
+# Babysitting of pending Testing Farm runs:
+# number of requests to the TF API in flight at the same time
+TESTING_FARM_BABYSIT_CONCURRENCY = 10
+# maximum number of requests per second sent to a single TF API host
+TESTING_FARM_BABYSIT_RATE_LIMIT = 20.0
+# number of pipelines polled before the finished ones are processed
+TESTING_FARM_BABYSIT_BATCH_SIZE = 100
+
+# number of seconds for which webhook deliveries and pull request heads are remembered
+# to drop duplicate deliveries and events for superseded commits
+WEBHOOK_DEDUPLICATION_WINDOW = 600
+
+# Connection pool of the database engine:
+# minimal number of connections kept open, the pool grows with the worker concurrency
+DATABASE_POOL_SIZE = 5
+# number of connections allowed above the pool size when there is a spike in the load
+DATABASE_MAX_OVERFLOW = 10
+
+# number of decoded packages configs of the project events kept in each process
+STORED_PACKAGES_CONFIG_CACHE_SIZE = 256
+
+# number of project IDs kept in each process, used when registering the events
+PROJECT_ID_CACHE_SIZE = 4096
+
+# number of rows fetched from the database at once when streaming the data exports
+EXPORT_BATCH_SIZE = 500
+
+# Cache of the package configs on commits:
+# maximum number of parsed configs kept in each process
+PACKAGE_CONFIG_CACHE_SIZE = 256
+# number of seconds for which the configs are kept in the process and in Redis
+PACKAGE_CONFIG_CACHE_TTL = 6 * 3600
+# number of seconds for which a repository without a config is remembered,
+# the config may also be missing because the app is not installed yet
+PACKAGE_CONFIG_NEGATIVE_CACHE_TTL = 60
+
+# Payloads of the Celery tasks passed by reference:
+# number of seconds for which the payloads are kept in Redis,
+# it needs to cover the waiting in the queues and the retries of the tasks
+TASK_PAYLOAD_TTL = 3 * 24 * 3600
+# maximum number of serialized payloads kept in each process
+TASK_PAYLOAD_CACHE_SIZE = 128
+
+# Cache of the FAS groups of the users:
+# maximum number of users kept in each process
+FAS_GROUPS_CACHE_SIZE = 1024
+# number of seconds for which the groups are kept in the process and in Redis
+FAS_GROUPS_CACHE_TTL = 900
+# number of seconds for which a failed lookup (e.g. unknown user) is remembered
+FAS_GROUPS_NEGATIVE_CACHE_TTL = 60
+# maximum number of seconds for which the groups are kept in each process,
+# i.e. how long it takes for an invalidation to reach all the processes
+FAS_GROUPS_LOCAL_CACHE_TTL = 60
+
+# Kerberos ticket shared by the checks of a worker:
+# number of seconds of the remaining lifetime below which the ticket is renewed
+KERBEROS_TICKET_RENEW_BEFORE = 300
+# number of seconds the ticket is reused for if its lifetime can't be read
+KERBEROS_TICKET_DEFAULT_LIFETIME = 3600
+# lowercase parts of the error messages meaning the ticket is no longer accepted
+KERBEROS_AUTH_ERRORS = (
+    "kerberos",
+    "gssapi",
+    "ticket expired",
+    "credentials cache",
+    "autherror",
+    "unable to log in",
+)
+
+# Catalogs of the external services (Copr chroots, Testing Farm composes):
+# number of seconds for which a catalog is served without being refreshed
+CATALOG_CACHE_TTL = 3600
+# number of seconds for which a stale catalog is served while it's being refreshed
+# in the background, older catalogs are fetched before being served
+CATALOG_CACHE_MAX_STALE = 7 * 24 * 3600
+# number of seconds for which the other workers don't refresh a catalog
+# that is already being refreshed
+CATALOG_REFRESH_LOCK_TTL = 60
+
+# number of seconds after which the in-process allowlist index is reloaded
+# even if no change of the allowlist was announced
+ALLOWLIST_INDEX_MAX_AGE = 600
+
 MSG_DOWNSTREAM_JOB_ERROR_HEADER = (
     "Packit failed on creating {object} in dist-git "
     "({dist_git_url}):\n\n"
@@ -119,12 +202,54 @@ BASE_RETRY_INTERVAL_IN_SECONDS_FOR_INTERNAL_ERRORS = 10
 # timeout/internal error. Nothing should hopefully run for 7 days.
 DEFAULT_JOB_TIMEOUT = 7 * 24 * 3600
 
+# Babysitting of pending Copr builds:
+# number of requests to Copr in flight at the same time
+COPR_BABYSIT_CONCURRENCY = 10
+# a build is checked again after 1/COPR_BABYSIT_BACKOFF_FACTOR of its age,
+# but at least every COPR_BABYSIT_MAX_CHECK_INTERVAL seconds
+COPR_BABYSIT_BACKOFF_FACTOR = 4
+COPR_BABYSIT_MAX_CHECK_INTERVAL = 6 * 3600
+
 # SRPM builds older than this number of days are considered
 # outdated and their logs can be discarded.
 SRPMBUILDS_OUTDATED_AFTER_DAYS = 30
 
 PACKAGE_CONFIGS_OUTDATED_AFTER_DAYS = 1
 
+# minimal number of seconds between pushes of the metrics of a worker
+METRICS_PUSH_INTERVAL = 15
+# maximal number of seconds to wait before pushing again after a failure
+METRICS_PUSH_MAX_BACKOFF = 5 * 60
+# number of seconds after which a push of the metrics is given up
+METRICS_PUSH_TIMEOUT = 10
+
+# size of the parts of the database backup uploaded to S3, i.e. the memory
+# needed for the buffer, S3 requires at least 5 MiB
+BACKUP_PART_SIZE = 16 * 1024 * 1024
+# number of bytes of the pg_dump output read at once
+BACKUP_READ_SIZE = 1024 * 1024
+
+# maximum number of rows updated by one statement of the nightly database maintenance
+RETENTION_BATCH_SIZE = 1000
+# number of seconds to wait between the statements of the maintenance
+RETENTION_BATCH_PAUSE = 0.5
+
+# number of seconds after which a mirror in the repository cache is refreshed
+# by `git fetch` in the background when it is used
+REPOSITORY_CACHE_FETCH_INTERVAL = 3600
+
+# number of seconds the check runs of a commit are buffered for, only the last
+# state of each check set within this window is sent to GitHub
+CHECK_RUN_COALESCING_WINDOW = 2
+# number of check runs sent per second in the long run
+CHECK_RUN_RATE = 1
+# number of check runs that can be sent at once
+CHECK_RUN_BURST = 20
+# number of seconds no check runs are sent for after hitting a rate limit
+CHECK_RUN_RATE_LIMIT_PAUSE = 60
+# number of seconds for which the last state sent for each check is remembered
+CHECK_RUN_SENT_TTL = 24 * 3600
+
 ALLOWLIST_CONSTANTS = {
     "approved_automatically": "approved_automatically",
     "waiting": "waiting",
@@ -136,6 +261,9 @@ CELERY_TASK_DEFAULT_QUEUE = "short-running"
 
 CELERY_DEFAULT_MAIN_TASK_NAME = "task.steve_jobs.process_message"
 
+# compression of the webhook payloads sent to the workers
+CELERY_EVENT_COMPRESSION = "zlib"
+
 MSG_TABLE_HEADER_WITH_DETAILS = "| Name/Job | URL |\n" "| --- | --- |\n"
 
 DEFAULT_MAPPING_TF = {
@@ -302,3 +430,6 @@ USAGE_PAST_MONTH_DATE_STR = (datetime.now() - timedelta(days=30)).strftime("%Y-%
 USAGE_PAST_YEAR_DATE_STR = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
 USAGE_DATE_IN_THE_PAST = USAGE_CURRENT_DATE.replace(year=USAGE_CURRENT_DATE.year - 100)
 USAGE_DATE_IN_THE_PAST_STR = USAGE_DATE_IN_THE_PAST.strftime("%Y-%m-%d")
+# maximum number of pipelines and jobs of each type folded into the usage rollups
+# in one transaction
+USAGE_ROLLUP_BATCH_SIZE = 10000
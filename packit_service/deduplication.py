@@ -0,0 +1,135 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Short-window coalescing of redundant webhook deliveries.
+
+The web service registers every delivery and remembers the latest head commit
+of each pull request, the workers then skip events for commits that have
+already been superseded by a newer push to the same pull request.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import redis
+from packit.utils import nested_get
+
+from packit_service.cache import RedisStore
+from packit_service.constants import WEBHOOK_DEDUPLICATION_WINDOW
+
+logger = logging.getLogger(__name__)
+
+# (project URL, PR/MR ID, head commit SHA)
+PullRequestHead = Tuple[str, int, str]
+
+
+def get_pr_head_from_webhook(
+    event: dict, source: str, event_type: Optional[str]
+) -> Optional[PullRequestHead]:
+    """
+    Get the pull request and its head commit from the webhook payload.
+
+    The values match the `project_url`, `pr_id` and `commit_sha` of the event
+    the workers parse from the same payload.
+
+    Returns:
+        Tuple of project URL, PR ID and commit SHA or None if the webhook
+        is not about new commits in a pull request.
+    """
+    if source == "github" and event_type == "pull_request":
+        head = (
+            nested_get(event, "repository", "html_url"),
+            event.get("number"),
+            nested_get(event, "pull_request", "head", "sha"),
+        )
+    elif source == "gitlab" and event_type == "Merge Request Hook":
+        head = (
+            nested_get(event, "project", "web_url"),
+            nested_get(event, "object_attributes", "iid"),
+            nested_get(event, "object_attributes", "last_commit", "id"),
+        )
+    else:
+        return None
+
+    return head if all(head) else None
+
+
+class EventDeduplicator:
+    """
+    Drops exact duplicate webhook deliveries and recognizes events
+    for pull request commits that were superseded by a newer push.
+
+    Errors of the store are logged and the events are processed as usual.
+    """
+
+    _store = None
+
+    def __init__(self, window: int = WEBHOOK_DEDUPLICATION_WINDOW):
+        """
+        Args:
+            window: Number of seconds for which the deliveries and pull request
+                heads are remembered, 0 turns the coalescing off.
+        """
+        self.window = window
+
+    @property
+    def store(self):
+        if EventDeduplicator._store is None:
+            EventDeduplicator._store = RedisStore()
+        return EventDeduplicator._store
+
+    @staticmethod
+    def _pr_head_key(project_url: str, pr_id: int) -> str:
+        return f"packit:pr-head:{project_url}:{pr_id}"
+
+    def register_delivery(self, delivery_id: Optional[str]) -> bool:
+        """
+        Remember the delivery.
+
+        Returns:
+            False if the delivery was already registered within the window.
+        """
+        if not (self.window and delivery_id):
+            return True
+        try:
+            return self.store.set(
+                f"packit:delivery:{delivery_id}", "1", self.window, only_new=True
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to register delivery {delivery_id}: {ex}")
+            return True
+
+    def unregister_delivery(self, delivery_id: Optional[str]) -> None:
+        """Forget the delivery so that its redelivery is not dropped."""
+        if not (self.window and delivery_id):
+            return
+        try:
+            self.store.delete(f"packit:delivery:{delivery_id}")
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to unregister delivery {delivery_id}: {ex}")
+
+    def record_pr_head(self, project_url: str, pr_id: int, commit_sha: str) -> None:
+        """Remember the commit as the latest one pushed to the pull request."""
+        if not self.window:
+            return
+        try:
+            self.store.set(
+                self._pr_head_key(project_url, pr_id), commit_sha, self.window
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to record head of {project_url} PR#{pr_id}: {ex}")
+
+    def is_superseded(self, project_url: str, pr_id: int, commit_sha: str) -> bool:
+        """
+        Check whether a newer commit has been pushed to the pull request
+        within the window.
+        """
+        if not self.window:
+            return False
+        try:
+            head = self.store.get(self._pr_head_key(project_url, pr_id))
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to get head of {project_url} PR#{pr_id}: {ex}")
+            return False
+        return head is not None and head != commit_sha
@@ -6,12 +6,18 @@ Data layer on top of PSQL using sqlalch
 """
 
 import enum
+import hashlib
+import json
 import logging
+import threading
 from collections import Counter
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from os import getenv
 from typing import (
+    Any,
+    Callable,
     Dict,
     Generator,
     Iterable,
@@ -27,13 +33,16 @@ from typing import (
 from urllib.parse import urlparse
 
 from cachetools.func import ttl_cache
-from cachetools import cached, TTLCache
+from cachetools import cached, LRUCache, TTLCache
+from cachetools.keys import hashkey
+from lazy_object_proxy import Proxy
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -44,21 +53,37 @@ from sqlalchemy import (
     null,
     case,
     Table,
+    UniqueConstraint,
     asc,
+    tuple_,
+    select,
+    literal_column,
+    or_,
 )
-from sqlalchemy.dialects.postgresql import array as psql_array
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import array as psql_array, insert as psql_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import (
+    Query,
     Session as SQLASession,
+    aliased,
     relationship,
     scoped_session,
+    selectinload,
     sessionmaker,
 )
 from sqlalchemy.sql.functions import count
 from sqlalchemy.types import ARRAY
 
 from packit.config import JobConfigTriggerType
-from packit_service.constants import ALLOWLIST_CONSTANTS
+from packit_service.cache import AllowlistIndex
+from packit_service.config import ServiceConfig
+from packit_service.constants import (
+    ALLOWLIST_CONSTANTS,
+    DATABASE_POOL_SIZE,
+    EXPORT_BATCH_SIZE,
+    PROJECT_ID_CACHE_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,8 +108,6 @@ sqlalchemy_echo = getenv("SQLALCHEMY_ECHO", "False").lower() in (
     "y",
     "1",
 )
-engine = create_engine(get_pg_url(), echo=sqlalchemy_echo)
-Session = sessionmaker(bind=engine)
 
 
 def is_multi_threaded() -> bool:
@@ -95,15 +118,49 @@ def is_multi_threaded() -> bool:
     )
 
 
-if is_multi_threaded():
-    # Multi-(green)threaded workers can't use scoped_session()
-    # Downside of a single session is that if postgres is (oom)killed and a transaction
-    # fails to rollback you have to restart the workers so that they pick another session.
-    singleton_session = Session()
-    logger.debug("Going to use a single SQLAlchemy session.")
-else:  # service/httpd
-    Session = scoped_session(Session)
-    singleton_session = None
+def get_engine_pool_options() -> dict:
+    """
+    Get the sizing of the connection pool from the service config.
+
+    Every (green)thread holds its own session and thus possibly a connection,
+    so unless configured otherwise, the pool is as big as the number
+    of concurrent tasks of the worker.
+    """
+    config = ServiceConfig.get_service_config()
+    return {
+        "pool_size": config.database_pool_size
+        or max(DATABASE_POOL_SIZE, int(getenv("CONCURRENCY", 1))),
+        "max_overflow": config.database_max_overflow,
+        "pool_pre_ping": config.database_pool_pre_ping,
+    }
+
+
+def create_database_engine() -> Engine:
+    return create_engine(
+        get_pg_url(), echo=sqlalchemy_echo, **get_engine_pool_options()
+    )
+
+
+def get_session_scope() -> Optional[Callable[[], Any]]:
+    """
+    Get the function identifying the scope of the session.
+
+    Multi-(green)threaded workers get a session per greenlet, i.e. per Celery task,
+    so that a failed transaction in one task can't affect the others,
+    everything else uses a session per thread.
+    """
+    if not is_multi_threaded():
+        return None
+
+    from greenlet import getcurrent
+
+    logger.debug("Going to use a SQLAlchemy session per greenlet.")
+    return getcurrent
+
+
+# the engine is created on the first use, once the service config is loaded
+engine: Engine = Proxy(create_database_engine)
+Session = scoped_session(sessionmaker(bind=engine), scopefunc=get_session_scope())
 
 
 @contextmanager
@@ -119,8 +176,8 @@ def sa_session_transaction(commit: bool = False) -> SQLASession:
         commit: Whether to call `Session.commit()` upon exiting the context. Should be set to True
             if any changes are made within the context. Defaults to False.
     """
-    # if we use single session, use it, otherwise get a new session from registry
-    session = singleton_session or Session()
+    # get the session of the current (green)thread from the registry
+    session = Session()
     try:
         yield session
         if commit:
@@ -131,6 +188,70 @@ def sa_session_transaction(commit: bool = False) -> SQLASession:
         raise
 
 
+def upsert(session: SQLASession, model: Type["Base"], index_elements: list, **values):
+    """
+    Insert a row or get the existing one in a single
+    `INSERT ... ON CONFLICT ... DO UPDATE ... RETURNING` statement.
+
+    The existing row is "updated" to the value it already has (rather than
+    using `DO NOTHING`) so that it's returned even if it has just been
+    inserted by a concurrent transaction, which makes this safe to call
+    from parallel workers.
+
+    Args:
+        session: Session to execute the statement in.
+        model: Model of the row.
+        index_elements: Columns (or expressions) of the unique index
+            the row may conflict on.
+        values: Values of the new row.
+
+    Returns:
+        Instance of the model for the new or the existing row.
+    """
+    first_column = next(iter(values))
+    stmt = (
+        psql_insert(model)
+        .values(**values)
+        .on_conflict_do_update(
+            index_elements=index_elements,
+            set_={first_column: getattr(model, first_column)},
+        )
+        .returning(*model.__table__.columns)
+    )
+    return session.execute(
+        select(model).from_statement(stmt).execution_options(populate_existing=True)
+    ).scalar_one()
+
+
+def update_batch(query: Query, values: Optional[dict], batch_size: int) -> int:
+    """
+    Update (or delete) a batch of rows matched by the query with a single
+    `UPDATE ... WHERE id IN (SELECT id ... LIMIT n)` statement
+    in its own transaction.
+
+    The query must not match the rows once they are updated,
+    so that the next batch continues with the remaining rows.
+
+    Args:
+        query: Query for the rows of a single model.
+        values: New values of the columns, None to delete the rows.
+        batch_size: Maximum number of rows in the batch.
+
+    Returns:
+        Number of updated (deleted) rows.
+    """
+    model = query.column_descriptions[0]["entity"]
+    with sa_session_transaction(commit=True) as session:
+        batch = session.query(model).filter(
+            model.id.in_(
+                query.with_entities(model.id).limit(batch_size).scalar_subquery()
+            )
+        )
+        if values is None:
+            return batch.delete(synchronize_session=False)
+        return batch.update(values, synchronize_session=False)
+
+
 def optional_time(
     datetime_object: Union[datetime, None], fmt: str = "%d/%m/%Y %H:%M:%S"
 ) -> Union[str, None]:
@@ -162,6 +283,25 @@ def optional_timestamp(datetime_object: Optional[datetime]) -> Optional[int]:
     return None if datetime_object is None else int(datetime_object.timestamp())
 
 
+def iterate_in_batches(query: Query, batch_size: int) -> Iterable[List[Any]]:
+    """
+    Iterate over the results of the query in batches.
+
+    The rows are fetched through a server-side cursor, so only a single batch
+    is held in memory at a time no matter how many rows the query matches.
+
+    Args:
+        query: Query to get the rows of.
+        batch_size: Number of rows in a batch.
+
+    Returns:
+        Iterable of the lists of rows.
+    """
+    rows = iter(query.yield_per(batch_size))
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
 def get_submitted_time_from_model(
     model: Union["CoprBuildTargetModel", "TFTTestRunTargetModel"]
 ) -> datetime:
@@ -594,6 +734,14 @@ class AnityaVersionModel(BuildsAndTestsConnector, Base):
 
 class GitProjectModel(Base):
     __tablename__ = "git_projects"
+    __table_args__ = (
+        UniqueConstraint(
+            "namespace",
+            "repo_name",
+            "project_url",
+            name="uq_git_projects_namespace_repo_name_project_url",
+        ),
+    )
     id = Column(Integer, primary_key=True)
     # github.com/NAMESPACE/REPO_NAME
     namespace = Column(String, index=True)
@@ -631,19 +779,35 @@ class GitProjectModel(Base):
         cls, namespace: str, repo_name: str, project_url: str
     ) -> "GitProjectModel":
         with sa_session_transaction(commit=True) as session:
-            project = (
-                session.query(GitProjectModel)
-                .filter_by(
-                    namespace=namespace, repo_name=repo_name, project_url=project_url
-                )
-                .first()
+            return upsert(
+                session,
+                GitProjectModel,
+                ["namespace", "repo_name", "project_url"],
+                namespace=namespace,
+                repo_name=repo_name,
+                project_url=project_url,
+                instance_url=urlparse(project_url).hostname,
             )
-            if not project:
-                project = cls(
-                    repo_name=repo_name, namespace=namespace, project_url=project_url
-                )
-                session.add(project)
-            return project
+
+    @classmethod
+    @cached(
+        cache=LRUCache(maxsize=PROJECT_ID_CACHE_SIZE),
+        key=lambda cls, namespace, repo_name, project_url: hashkey(
+            namespace, repo_name, project_url
+        ),
+        lock=threading.Lock(),
+    )
+    def get_or_create_id(cls, namespace: str, repo_name: str, project_url: str) -> int:
+        """
+        Same as `get_or_create`, but returns just the ID of the project.
+
+        The projects are never removed from the database, so the IDs are cached
+        for the lifetime of the process and the database is queried only
+        for the first event of each project.
+        """
+        return cls.get_or_create(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        ).id
 
     @classmethod
     def get_all(cls) -> Iterable["GitProjectModel"]:
@@ -658,38 +822,65 @@ class GitProjectModel(Base):
             return session.query(GitProjectModel).filter_by(id=id_).first()
 
     @classmethod
-    def get_range(cls, first: int, last: int) -> Iterable["GitProjectModel"]:
+    def get_range(
+        cls, first: int, last: int, after: Optional[Tuple[str, int]] = None
+    ) -> Iterable["GitProjectModel"]:
+        """
+        Return projects ordered by namespace, optionally only those after
+        the given (namespace, id) of the last project on the previous page.
+        """
         with sa_session_transaction() as session:
-            return (
-                session.query(GitProjectModel)
-                .order_by(GitProjectModel.namespace)
-                .slice(first, last)
+            query = session.query(GitProjectModel).order_by(
+                GitProjectModel.namespace, GitProjectModel.id
             )
+            if after is not None:
+                query = query.filter(
+                    tuple_(GitProjectModel.namespace, GitProjectModel.id)
+                    > tuple_(*after)
+                )
+            return query.slice(first, last)
 
     @classmethod
     def get_by_forge(
-        cls, first: int, last: int, forge: str
+        cls,
+        first: int,
+        last: int,
+        forge: str,
+        after: Optional[Tuple[str, int]] = None,
     ) -> Iterable["GitProjectModel"]:
-        """Return projects of given forge"""
+        """Return projects of given forge, optionally after the (namespace, id)"""
         with sa_session_transaction() as session:
-            return (
+            query = (
                 session.query(GitProjectModel)
                 .filter_by(instance_url=forge)
-                .order_by(GitProjectModel.namespace)
-                .slice(first, last)
+                .order_by(GitProjectModel.namespace, GitProjectModel.id)
             )
+            if after is not None:
+                query = query.filter(
+                    tuple_(GitProjectModel.namespace, GitProjectModel.id)
+                    > tuple_(*after)
+                )
+            return query.slice(first, last)
 
     @classmethod
     def get_by_forge_namespace(
-        cls, first: int, last: int, forge: str, namespace: str
+        cls,
+        first: int,
+        last: int,
+        forge: str,
+        namespace: str,
+        after: Optional[int] = None,
     ) -> Iterable["GitProjectModel"]:
-        """Return projects of given forge and namespace"""
+        """Return projects of given forge and namespace, optionally after the id"""
         with sa_session_transaction() as session:
-            return (
+            query = (
                 session.query(GitProjectModel)
                 .filter_by(instance_url=forge, namespace=namespace)
-                .slice(first, last)
+                .order_by(GitProjectModel.id)
             )
+            if after is not None:
+                query = query.filter(GitProjectModel.id > after)
+            return query.slice(first, last)
 
     @classmethod
     def get_project(
@@ -1224,6 +1415,11 @@ class PullRequestModel(BuildsAndTestsConnector, Base):
     pr_id = Column(Integer, index=True)
     project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
     project = relationship("GitProjectModel", back_populates="pull_requests")
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "pr_id", name="uq_pull_requests_project_id_pr_id"
+        ),
+    )
 
     job_config_trigger_type = JobConfigTriggerType.pull_request
     project_event_model_type = ProjectEventModelType.pull_request
@@ -1232,33 +1428,29 @@ class PullRequestModel(BuildsAndTestsConnector, Base):
     def get_or_create(
         cls, pr_id: int, namespace: str, repo_name: str, project_url: str
     ) -> "PullRequestModel":
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
         with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
+            return upsert(
+                session,
+                PullRequestModel,
+                ["project_id", "pr_id"],
+                pr_id=pr_id,
+                project_id=project_id,
             )
-            pr = (
-                session.query(PullRequestModel)
-                .filter_by(pr_id=pr_id, project_id=project.id)
-                .first()
-            )
-            if not pr:
-                pr = PullRequestModel()
-                pr.pr_id = pr_id
-                pr.project_id = project.id
-                session.add(pr)
-            return pr
 
     @classmethod
     def get(
         cls, pr_id: int, namespace: str, repo_name: str, project_url: str
     ) -> Optional["PullRequestModel"]:
-        with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
-            )
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
+        with sa_session_transaction() as session:
             return (
                 session.query(PullRequestModel)
-                .filter_by(pr_id=pr_id, project_id=project.id)
+                .filter_by(pr_id=pr_id, project_id=project_id)
                 .first()
             )
 
@@ -1277,6 +1469,11 @@ class IssueModel(BuildsAndTestsConnector, Base):
     issue_id = Column(Integer, index=True)
     project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
     project = relationship("GitProjectModel", back_populates="issues")
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "issue_id", name="uq_project_issues_project_id_issue_id"
+        ),
+    )
     # TODO: Fix this hardcoding! This is only to make propose-downstream work!
     job_config_trigger_type = JobConfigTriggerType.release
     project_event_model_type = ProjectEventModelType.issue
@@ -1285,21 +1482,17 @@ class IssueModel(BuildsAndTestsConnector, Base):
     def get_or_create(
         cls, issue_id: int, namespace: str, repo_name: str, project_url: str
     ) -> "IssueModel":
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
         with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
+            return upsert(
+                session,
+                IssueModel,
+                ["project_id", "issue_id"],
+                issue_id=issue_id,
+                project_id=project_id,
             )
-            issue = (
-                session.query(IssueModel)
-                .filter_by(issue_id=issue_id, project_id=project.id)
-                .first()
-            )
-            if not issue:
-                issue = IssueModel()
-                issue.issue_id = issue_id
-                issue.project_id = project.id
-                session.add(issue)
-            return issue
 
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["IssueModel"]:
@@ -1316,6 +1509,9 @@ class GitBranchModel(BuildsAndTestsConnector, Base):
     name = Column(String)
     project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
     project = relationship("GitProjectModel", back_populates="branches")
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_git_branches_project_id_name"),
+    )
 
     job_config_trigger_type = JobConfigTriggerType.commit
     project_event_model_type = ProjectEventModelType.branch_push
@@ -1324,21 +1520,17 @@ class GitBranchModel(BuildsAndTestsConnector, Base):
     def get_or_create(
         cls, branch_name: str, namespace: str, repo_name: str, project_url: str
     ) -> "GitBranchModel":
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
         with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
+            return upsert(
+                session,
+                GitBranchModel,
+                ["project_id", "name"],
+                name=branch_name,
+                project_id=project_id,
             )
-            git_branch = (
-                session.query(GitBranchModel)
-                .filter_by(name=branch_name, project_id=project.id)
-                .first()
-            )
-            if not git_branch:
-                git_branch = GitBranchModel()
-                git_branch.name = branch_name
-                git_branch.project_id = project.id
-                session.add(git_branch)
-            return git_branch
 
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["GitBranchModel"]:
@@ -1356,6 +1548,11 @@ class ProjectReleaseModel(BuildsAndTestsConnector, Base):
     commit_hash = Column(String)
     project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
     project = relationship("GitProjectModel", back_populates="releases")
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id", "tag_name", name="uq_project_releases_project_id_tag_name"
+        ),
+    )
 
     job_config_trigger_type = JobConfigTriggerType.release
     project_event_model_type = ProjectEventModelType.release
@@ -1369,22 +1566,19 @@ class ProjectReleaseModel(BuildsAndTestsConnector, Base):
         project_url: str,
         commit_hash: Optional[str] = None,
     ) -> "ProjectReleaseModel":
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
         with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
-            )
-            project_release = (
-                session.query(ProjectReleaseModel)
-                .filter_by(tag_name=tag_name, project_id=project.id)
-                .first()
+            # the commit hash of an existing release is kept
+            return upsert(
+                session,
+                ProjectReleaseModel,
+                ["project_id", "tag_name"],
+                tag_name=tag_name,
+                project_id=project_id,
+                commit_hash=commit_hash,
             )
-            if not project_release:
-                project_release = ProjectReleaseModel()
-                project_release.tag_name = tag_name
-                project_release.project = project
-                project_release.commit_hash = commit_hash
-                session.add(project_release)
-            return project_release
 
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["ProjectReleaseModel"]:
@@ -1407,6 +1601,14 @@ class KojiBuildTagModel(BuildsAndTestsConnector, Base):
     target = Column(String)
     project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
     project = relationship("GitProjectModel", back_populates="koji_build_tags")
+    __table_args__ = (
+        UniqueConstraint(
+            "project_id",
+            "task_id",
+            "koji_tag_name",
+            name="uq_koji_build_tags_project_id_task_id_koji_tag_name",
+        ),
+    )
 
     job_config_trigger_type = JobConfigTriggerType.koji_build
     project_event_model_type = ProjectEventModelType.koji_build_tag
@@ -1421,25 +1623,19 @@ class KojiBuildTagModel(BuildsAndTestsConnector, Base):
         repo_name: str,
         project_url: str,
     ) -> "KojiBuildTagModel":
+        project_id = GitProjectModel.get_or_create_id(
+            namespace=namespace, repo_name=repo_name, project_url=project_url
+        )
         with sa_session_transaction(commit=True) as session:
-            project = GitProjectModel.get_or_create(
-                namespace=namespace, repo_name=repo_name, project_url=project_url
-            )
-            koji_build_tag = (
-                session.query(KojiBuildTagModel)
-                .filter_by(
-                    task_id=task_id, koji_tag_name=koji_tag_name, project_id=project.id
-                )
-                .first()
+            return upsert(
+                session,
+                KojiBuildTagModel,
+                ["project_id", "task_id", "koji_tag_name"],
+                task_id=task_id,
+                koji_tag_name=koji_tag_name,
+                target=target,
+                project_id=project_id,
             )
-            if not koji_build_tag:
-                koji_build_tag = KojiBuildTagModel()
-                koji_build_tag.task_id = task_id
-                koji_build_tag.koji_tag_name = koji_tag_name
-                koji_build_tag.target = target
-                koji_build_tag.project_id = project.id
-                session.add(koji_build_tag)
-            return koji_build_tag
 
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["KojiBuildTagModel"]:
@@ -1476,6 +1672,60 @@ MODEL_FOR_PROJECT_EVENT: Dict[
 }
 
 
+class PackageConfigModel(Base):
+    """
+    Packages config stored by project events, see `ProjectEventModel.set_packages_config`.
+
+    Most of the commits of a project share the same config, so the configs
+    are stored only once under the hash of their content.
+    """
+
+    __tablename__ = "package_configs"
+    id = Column(Integer, primary_key=True)
+    hash = Column(String, unique=True, nullable=False)
+    config = Column(JSON)
+
+    @staticmethod
+    def get_hash(config: dict) -> str:
+        """Get the hash of the content of the config, independent of the order of keys."""
+        content = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @classmethod
+    def upsert(cls, session: SQLASession, config: dict) -> "PackageConfigModel":
+        """
+        Store the config in the transaction of the given session. The row stays locked
+        until the transaction ends, so it can't be deleted as unreferenced meanwhile.
+        """
+        return upsert(
+            session,
+            PackageConfigModel,
+            ["hash"],
+            hash=cls.get_hash(config),
+            config=config,
+        )
+
+    @classmethod
+    def get_by_hash(cls, hash_: str) -> Optional["PackageConfigModel"]:
+        with sa_session_transaction() as session:
+            return session.query(PackageConfigModel).filter_by(hash=hash_).first()
+
+    @classmethod
+    def get_unreferenced(cls) -> Iterable["PackageConfigModel"]:
+        """Return the configs no project event refers to."""
+        with sa_session_transaction() as session:
+            return session.query(PackageConfigModel).filter(
+                ~session.query(ProjectEventModel)
+                .filter(
+                    ProjectEventModel.packages_config_hash == PackageConfigModel.hash
+                )
+                .exists()
+            )
+
+    def __repr__(self):
+        return f"PackageConfigModel(id={self.id}, hash={self.hash})"
+
+
 class ProjectEventModel(Base):
     """
     Model representing a "project event" which triggers some packit task.
@@ -1498,7 +1748,9 @@ class ProjectEventModel(Base):
     type = Column(Enum(ProjectEventModelType))
     event_id = Column(Integer, index=True)
     commit_sha = Column(String, index=True)
-    packages_config = Column(JSON)
+    packages_config_hash = Column(
+        String, ForeignKey("package_configs.hash"), index=True
+    )
 
     runs = relationship("PipelineModel", back_populates="project_event")
 
@@ -1664,18 +1916,14 @@ class ProjectEventModel(Base):
         cls, type: ProjectEventModelType, event_id: int, commit_sha: str
     ) -> "ProjectEventModel":
         with sa_session_transaction(commit=True) as session:
-            project_event = (
-                session.query(ProjectEventModel)
-                .filter_by(type=type, event_id=event_id, commit_sha=commit_sha)
-                .first()
+            return upsert(
+                session,
+                ProjectEventModel,
+                list(PROJECT_EVENT_UNIQUE_KEY),
+                type=type,
+                event_id=event_id,
+                commit_sha=commit_sha,
             )
-            if not project_event:
-                project_event = ProjectEventModel()
-                project_event.type = type
-                project_event.event_id = event_id
-                project_event.commit_sha = commit_sha
-                session.add(project_event)
-            return project_event
 
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["ProjectEventModel"]:
@@ -1691,15 +1939,21 @@ class ProjectEventModel(Base):
         with sa_session_transaction() as session:
             return (
                 session.query(ProjectEventModel)
-                .filter(ProjectEventModel.packages_config.isnot(None))
+                .filter(ProjectEventModel.packages_config_hash.isnot(None))
                 .filter(
                     ~ProjectEventModel.runs.any(PipelineModel.datetime >= delta_ago)
                 )
             )
 
-    def set_packages_config(self, packages_config: dict):
+    def set_packages_config(self, packages_config: Optional[dict]):
+        # in a single transaction, otherwise the config could be deleted
+        # as unreferenced before the hash is stored
         with sa_session_transaction(commit=True) as session:
-            self.packages_config = packages_config
+            self.packages_config_hash = (
+                PackageConfigModel.upsert(session, packages_config).hash
+                if packages_config
+                else None
+            )
             session.add(self)
 
     def get_project_event_object(self) -> Optional[AbstractProjectObjectDbType]:
@@ -1710,6 +1964,40 @@ class ProjectEventModel(Base):
                 .first()
             )
 
+    @staticmethod
+    def get_project_event_objects(
+        project_events: Iterable["ProjectEventModel"],
+    ) -> Dict[int, AbstractProjectObjectDbType]:
+        """
+        Load the project event objects (and their projects) for multiple project
+        events at once, issuing a single query per project event type.
+
+        Args:
+            project_events: Project events to get the objects for.
+
+        Returns:
+            Dictionary mapping the ID of the project event to its project event
+            object.
+        """
+        event_ids_per_type: Dict[ProjectEventModelType, Dict[int, List[int]]] = {}
+        for project_event in project_events:
+            event_ids_per_type.setdefault(project_event.type, {}).setdefault(
+                project_event.event_id, []
+            ).append(project_event.id)
+
+        result: Dict[int, AbstractProjectObjectDbType] = {}
+        with sa_session_transaction() as session:
+            for type, event_ids in event_ids_per_type.items():
+                model = MODEL_FOR_PROJECT_EVENT[type]
+                for project_event_object in (
+                    session.query(model)
+                    .options(selectinload(model.project))
+                    .filter(model.id.in_(list(event_ids)))
+                ):
+                    for project_event_id in event_ids[project_event_object.id]:
+                        result[project_event_id] = project_event_object
+        return result
+
     def __repr__(self):
         return (
             f"ProjectEventModel(type={self.type}, event_id={self.event_id}, "
@@ -1717,6 +2005,19 @@ class ProjectEventModel(Base):
         )
 
 
+# some events have no commit SHA and NULLs never conflict, compare them as ''
+PROJECT_EVENT_UNIQUE_KEY = (
+    ProjectEventModel.type,
+    ProjectEventModel.event_id,
+    func.coalesce(ProjectEventModel.commit_sha, literal_column("''")),
+)
+Index(
+    "uq_project_events_type_event_id_commit_sha",
+    *PROJECT_EVENT_UNIQUE_KEY,
+    unique=True,
+)
+
+
 class PipelineModel(Base):
     """
     Represents one pipeline.
@@ -1822,9 +2123,44 @@ class PipelineModel(Base):
             )
 
     @classmethod
-    def get_merged_chroots(cls, first: int, last: int) -> Iterable["PipelineModel"]:
+    def get_merged_chroots(
+        cls, first: int, last: int, after: Optional[int] = None
+    ) -> Iterable["PipelineModel"]:
+        """
+        Return merged runs ordered by their first ID, optionally only those
+        before the `merged_id` of the last run on the previous page.
+
+        The first runs of the page are found by walking the IDs down from
+        the cursor, only the runs merged with them are then aggregated.
+        """
+        with sa_session_transaction() as session:
+            earlier = aliased(PipelineModel)
+            first_runs = session.query(
+                PipelineModel.id, PipelineModel.srpm_build_id
+            ).filter(
+                ~session.query(earlier)
+                .filter(
+                    earlier.srpm_build_id == PipelineModel.srpm_build_id,
+                    earlier.id < PipelineModel.id,
+                )
+                .exists()
+            )
+            if after is not None:
+                first_runs = first_runs.filter(PipelineModel.id < after)
+            first_runs = (
+                first_runs.order_by(desc(PipelineModel.id))
+                .slice(first, last)
+                .subquery()
+            )
+
         return (
             cls.__query_merged_runs()
+            .filter(
+                or_(
+                    PipelineModel.id.in_(select(first_runs.c.id)),
+                    PipelineModel.srpm_build_id.in_(select(first_runs.c.srpm_build_id)),
+                )
+            )
             .group_by(
                 PipelineModel.srpm_build_id,
                 case(
@@ -1833,7 +2169,6 @@ class PipelineModel(Base):
                 ),
             )
             .order_by(desc("merged_id"))
-            .slice(first, last)
         )
 
     @classmethod
@@ -1902,6 +2237,21 @@ class CoprBuildGroupModel(ProjectAndEventsConnector, GroupModel, Base):
         with sa_session_transaction() as session:
             return session.query(CoprBuildGroupModel).filter_by(id=group_id).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["CoprBuildGroupModel"]:
+        """Get multiple groups at once, together with their targets and runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(CoprBuildGroupModel)
+                .options(
+                    selectinload(CoprBuildGroupModel.copr_build_targets),
+                    selectinload(CoprBuildGroupModel.runs).joinedload(
+                        PipelineModel.project_event
+                    ),
+                )
+                .filter(CoprBuildGroupModel.id.in_(ids))
+            )
+
 
 class BuildStatus(str, enum.Enum):
     """An enum of all possible build statuses"""
@@ -1942,6 +2292,10 @@ class CoprBuildTargetModel(GroupAndTargetModelConnector, Base):
     build_submitted_time = Column(DateTime, default=datetime.utcnow)
     build_start_time = Column(DateTime)
     build_finished_time = Column(DateTime)
+    # for babysitting: when the state of the build was last checked in Copr
+    # and the state of the whole Copr build at that time
+    status_checked_time = Column(DateTime)
+    status_checked_copr_state = Column(String)
 
     # project name as shown in copr
     project_name = Column(String)
@@ -2005,6 +2359,27 @@ class CoprBuildTargetModel(GroupAndTargetModelConnector, Base):
             self.build_id = build_id
             session.add(self)
 
+    @classmethod
+    def set_status_checked(
+        cls,
+        build_id: Union[str, int],
+        copr_state: Optional[str],
+        checked_time: datetime,
+    ):
+        """
+        Record the time and the state of the last check of the Copr build
+        for all the targets of the build.
+        """
+        with sa_session_transaction(commit=True) as session:
+            session.query(CoprBuildTargetModel).filter_by(
+                build_id=str(build_id)
+            ).update(
+                {
+                    CoprBuildTargetModel.status_checked_time: checked_time,
+                    CoprBuildTargetModel.status_checked_copr_state: copr_state,
+                }
+            )
+
     def get_srpm_build(self) -> Optional["SRPMBuildModel"]:
         # All SRPMBuild models for all the runs have to be same.
         return (
@@ -2025,15 +2400,71 @@ class CoprBuildTargetModel(GroupAndTargetModelConnector, Base):
                 desc(CoprBuildTargetModel.id)
             )
 
+    @classmethod
+    def get_for_export(
+        cls,
+        datetime_from: Optional[str] = None,
+        datetime_to: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterable[List["CoprBuildTargetModel"]]:
+        """
+        Get the builds submitted in the given time range in batches, ordered by ID,
+        together with their groups, runs and project events.
+        """
+        with sa_session_transaction() as session:
+            query = (
+                session.query(CoprBuildTargetModel)
+                .options(
+                    selectinload(CoprBuildTargetModel.group_of_targets)
+                    .selectinload(CoprBuildGroupModel.runs)
+                    .joinedload(PipelineModel.project_event)
+                )
+                .order_by(CoprBuildTargetModel.id)
+            )
+            if datetime_from:
+                query = query.filter(
+                    CoprBuildTargetModel.build_submitted_time >= datetime_from
+                )
+            if datetime_to:
+                query = query.filter(
+                    CoprBuildTargetModel.build_submitted_time <= datetime_to
+                )
+            yield from iterate_in_batches(query, batch_size)
+
     @classmethod
     def get_merged_chroots(
-        cls, first: int, last: int
+        cls, first: int, last: int, after: Optional[int] = None
     ) -> Iterable["CoprBuildTargetModel"]:
         """Returns a list of unique build ids with merged status, chroots
         Details:
         https://github.com/packit/packit-service/pull/674#discussion_r439819852
+
+        If `after` is set, only the builds before the `new_id` of the last build
+        on the previous page are returned. The first rows of the builds
+        on the page are found by walking the IDs down from the cursor, only
+        the rows of those builds are then aggregated. Rows without a Copr build
+        ID are listed separately.
         """
         with sa_session_transaction() as session:
+            earlier = aliased(CoprBuildTargetModel)
+            first_builds = session.query(
+                CoprBuildTargetModel.id, CoprBuildTargetModel.build_id
+            ).filter(
+                ~session.query(earlier)
+                .filter(
+                    earlier.build_id == CoprBuildTargetModel.build_id,
+                    earlier.id < CoprBuildTargetModel.id,
+                )
+                .exists()
+            )
+            if after is not None:
+                first_builds = first_builds.filter(CoprBuildTargetModel.id < after)
+            first_builds = (
+                first_builds.order_by(desc(CoprBuildTargetModel.id))
+                .slice(first, last)
+                .subquery()
+            )
+
             return (
                 session.query(
                     # We need something to order our merged builds by,
@@ -2052,11 +2483,22 @@ class CoprBuildTargetModel(GroupAndTargetModelConnector, Base):
                         "packit_id_per_chroot"
                     ),
                 )
+                .filter(
+                    or_(
+                        CoprBuildTargetModel.id.in_(select(first_builds.c.id)),
+                        CoprBuildTargetModel.build_id.in_(
+                            select(first_builds.c.build_id)
+                        ),
+                    )
+                )
                 .group_by(
-                    CoprBuildTargetModel.build_id
+                    CoprBuildTargetModel.build_id,
+                    case(
+                        (CoprBuildTargetModel.build_id.isnot(null()), 0),
+                        else_=CoprBuildTargetModel.id,
+                    ),
                 )  # Group by identical element(s)
                 .order_by(desc("new_id"))
-                .slice(first, last)
             )
 
     # Returns all builds with that build_id, irrespective of target
@@ -2220,6 +2662,21 @@ class KojiBuildGroupModel(ProjectAndEventsConnector, GroupModel, Base):
         with sa_session_transaction() as session:
             return session.query(KojiBuildGroupModel).filter_by(id=id_).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["KojiBuildGroupModel"]:
+        """Get multiple groups at once, together with their targets and runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(KojiBuildGroupModel)
+                .options(
+                    selectinload(KojiBuildGroupModel.koji_build_targets),
+                    selectinload(KojiBuildGroupModel.runs).joinedload(
+                        PipelineModel.project_event
+                    ),
+                )
+                .filter(KojiBuildGroupModel.id.in_(ids))
+            )
+
     @classmethod
     def create(cls, run_model: "PipelineModel") -> "KojiBuildGroupModel":
         with sa_session_transaction(commit=True) as session:
@@ -2316,13 +2773,16 @@ class BodhiUpdateTargetModel(GroupAndTargetModelConnector, Base):
             return session.query(BodhiUpdateTargetModel)
 
     @classmethod
-    def get_range(cls, first: int, last: int) -> Iterable["BodhiUpdateTargetModel"]:
+    def get_range(
+        cls, first: int, last: int, after: Optional[int] = None
+    ) -> Iterable["BodhiUpdateTargetModel"]:
         with sa_session_transaction() as session:
-            return (
-                session.query(BodhiUpdateTargetModel)
-                .order_by(desc(BodhiUpdateTargetModel.id))
-                .slice(first, last)
+            query = session.query(BodhiUpdateTargetModel).order_by(
+                desc(BodhiUpdateTargetModel.id)
             )
+            if after is not None:
+                query = query.filter(BodhiUpdateTargetModel.id < after)
+            return query.slice(first, last)
 
     @classmethod
     def get_all_projects(cls) -> Set["GitProjectModel"]:
@@ -2390,6 +2850,21 @@ class BodhiUpdateGroupModel(ProjectAndEventsConnector, GroupModel, Base):
         with sa_session_transaction() as session:
             return session.query(BodhiUpdateGroupModel).filter_by(id=id_).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["BodhiUpdateGroupModel"]:
+        """Get multiple groups at once, together with their targets and runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(BodhiUpdateGroupModel)
+                .options(
+                    selectinload(BodhiUpdateGroupModel.bodhi_update_targets),
+                    selectinload(BodhiUpdateGroupModel.runs).joinedload(
+                        PipelineModel.project_event
+                    ),
+                )
+                .filter(BodhiUpdateGroupModel.id.in_(ids))
+            )
+
     @classmethod
     def create(cls, run_model: "PipelineModel") -> "BodhiUpdateGroupModel":
         with sa_session_transaction(commit=True) as session:
@@ -2508,7 +2983,11 @@ class KojiBuildTargetModel(GroupAndTargetModelConnector, Base):
 
     @classmethod
     def get_range(
-        cls, first: int, last: int, scratch: bool = None
+        cls,
+        first: int,
+        last: int,
+        scratch: bool = None,
+        after: Optional[int] = None,
     ) -> Iterable["KojiBuildTargetModel"]:
         with sa_session_transaction() as session:
             query = session.query(KojiBuildTargetModel).order_by(
@@ -2517,6 +2996,8 @@ class KojiBuildTargetModel(GroupAndTargetModelConnector, Base):
 
             if scratch is not None:
                 query = query.filter_by(scratch=scratch)
+            if after is not None:
+                query = query.filter(KojiBuildTargetModel.id < after)
 
             return query.slice(first, last)
 
@@ -2681,14 +3162,29 @@ class SRPMBuildModel(ProjectAndEventsConnector, Base):
             return session.query(SRPMBuildModel).filter_by(id=id_).first()
 
     @classmethod
-    def get_range(cls, first: int, last: int) -> Iterable["SRPMBuildModel"]:
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["SRPMBuildModel"]:
+        """Get multiple SRPM builds at once, together with their runs."""
         with sa_session_transaction() as session:
             return (
                 session.query(SRPMBuildModel)
-                .order_by(desc(SRPMBuildModel.id))
-                .slice(first, last)
+                .options(
+                    selectinload(SRPMBuildModel.runs).joinedload(
+                        PipelineModel.project_event
+                    )
+                )
+                .filter(SRPMBuildModel.id.in_(ids))
             )
 
+    @classmethod
+    def get_range(
+        cls, first: int, last: int, after: Optional[int] = None
+    ) -> Iterable["SRPMBuildModel"]:
+        with sa_session_transaction() as session:
+            query = session.query(SRPMBuildModel).order_by(desc(SRPMBuildModel.id))
+            if after is not None:
+                query = query.filter(SRPMBuildModel.id < after)
+            return query.slice(first, last)
+
     @classmethod
     def get_by_copr_build_id(
         cls, copr_build_id: Union[str, int]
@@ -2801,7 +3297,9 @@ class AllowlistModel(Base):
                 namespace_entry.fas_account = fas_account
 
             session.add(namespace_entry)
-            return namespace_entry
+
+        AllowlistIndex.invalidate()
+        return namespace_entry
 
     @classmethod
     def get_namespace(cls, namespace: str) -> Optional["AllowlistModel"]:
@@ -2841,6 +3339,8 @@ class AllowlistModel(Base):
             if namespace_entry.one_or_none():
                 namespace_entry.delete()
 
+        AllowlistIndex.invalidate()
+
     @classmethod
     def get_all(cls) -> Iterable["AllowlistModel"]:
         with sa_session_transaction() as session:
@@ -2943,6 +3443,21 @@ class TFTTestRunGroupModel(ProjectAndEventsConnector, GroupModel, Base):
         with sa_session_transaction() as session:
             return session.query(TFTTestRunGroupModel).filter_by(id=group_id).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["TFTTestRunGroupModel"]:
+        """Get multiple groups at once, together with their targets and runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(TFTTestRunGroupModel)
+                .options(
+                    selectinload(TFTTestRunGroupModel.tft_test_run_targets),
+                    selectinload(TFTTestRunGroupModel.runs).joinedload(
+                        PipelineModel.project_event
+                    ),
+                )
+                .filter(TFTTestRunGroupModel.id.in_(ids))
+            )
+
 
 class TFTTestRunTargetModel(GroupAndTargetModelConnector, Base):
     __tablename__ = "tft_test_run_targets"
@@ -3075,13 +3590,47 @@ class TFTTestRunTargetModel(GroupAndTargetModelConnector, Base):
             return query
 
     @classmethod
-    def get_range(cls, first: int, last: int) -> Iterable["TFTTestRunTargetModel"]:
+    def get_range(
+        cls, first: int, last: int, after: Optional[int] = None
+    ) -> Iterable["TFTTestRunTargetModel"]:
         with sa_session_transaction() as session:
-            return (
+            query = session.query(TFTTestRunTargetModel).order_by(
+                desc(TFTTestRunTargetModel.id)
+            )
+            if after is not None:
+                query = query.filter(TFTTestRunTargetModel.id < after)
+            return query.slice(first, last)
+
+    @classmethod
+    def get_for_export(
+        cls,
+        datetime_from: Optional[str] = None,
+        datetime_to: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterable[List["TFTTestRunTargetModel"]]:
+        """
+        Get the test runs submitted in the given time range in batches, ordered by ID,
+        together with their groups, runs and project events.
+        """
+        with sa_session_transaction() as session:
+            query = (
                 session.query(TFTTestRunTargetModel)
-                .order_by(desc(TFTTestRunTargetModel.id))
-                .slice(first, last)
+                .options(
+                    selectinload(TFTTestRunTargetModel.group_of_targets)
+                    .selectinload(TFTTestRunGroupModel.runs)
+                    .joinedload(PipelineModel.project_event)
+                )
+                .order_by(TFTTestRunTargetModel.id)
             )
+            if datetime_from:
+                query = query.filter(
+                    TFTTestRunTargetModel.submitted_time >= datetime_from
+                )
+            if datetime_to:
+                query = query.filter(
+                    TFTTestRunTargetModel.submitted_time <= datetime_to
+                )
+            yield from iterate_in_batches(query, batch_size)
 
     def __repr__(self):
         return f"TFTTestRunTargetModel(id={self.id}, pipeline_id={self.pipeline_id})"
@@ -3264,11 +3813,52 @@ class SyncReleaseModel(ProjectAndEventsConnector, Base):
             self.status = status
             session.add(self)
 
+    def set_status_if_running(self, status: SyncReleaseStatus) -> bool:
+        """
+        Atomically finish the run unless someone else has already done that,
+        the targets of the run can be processed by several workers at once.
+
+        Returns:
+            Whether the status was set.
+        """
+        with sa_session_transaction(commit=True) as session:
+            updated = (
+                session.query(SyncReleaseModel)
+                .filter_by(id=self.id, status=SyncReleaseStatus.running)
+                .update({"status": status}, synchronize_session=False)
+            )
+        return updated == 1
+
+    def get_current_targets(self) -> List["SyncReleaseTargetModel"]:
+        """Get the targets with their state as changed by the other workers."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(SyncReleaseTargetModel)
+                .filter_by(sync_release_id=self.id)
+                .populate_existing()
+                .all()
+            )
+
     @classmethod
     def get_by_id(cls, id_: int) -> Optional["SyncReleaseModel"]:
         with sa_session_transaction() as session:
             return session.query(SyncReleaseModel).filter_by(id=id_).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["SyncReleaseModel"]:
+        """Get multiple sync release runs at once, together with their targets and runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(SyncReleaseModel)
+                .options(
+                    selectinload(SyncReleaseModel.sync_release_targets),
+                    selectinload(SyncReleaseModel.runs).joinedload(
+                        PipelineModel.project_event
+                    ),
+                )
+                .filter(SyncReleaseModel.id.in_(ids))
+            )
+
     @classmethod
     def get_all_by_status(cls, status: str) -> Iterable["SyncReleaseModel"]:
         with sa_session_transaction() as session:
@@ -3280,14 +3870,17 @@ class SyncReleaseModel(ProjectAndEventsConnector, Base):
         first: int,
         last: int,
         job_type: SyncReleaseJobType = SyncReleaseJobType.propose_downstream,
+        after: Optional[int] = None,
     ) -> Iterable["SyncReleaseModel"]:
         with sa_session_transaction() as session:
-            return (
+            query = (
                 session.query(SyncReleaseModel)
                 .order_by(desc(SyncReleaseModel.id))
                 .filter_by(job_type=job_type)
-                .slice(first, last)
             )
+            if after is not None:
+                query = query.filter(SyncReleaseModel.id < after)
+            return query.slice(first, last)
 
 
 AbstractBuildTestDbType = Union[
@@ -3583,6 +4176,20 @@ class VMImageBuildTargetModel(ProjectAndEventsConnector, Base):
         with sa_session_transaction() as session:
             return session.query(VMImageBuildTargetModel).filter_by(id=id_).first()
 
+    @classmethod
+    def get_by_ids(cls, ids: Iterable[int]) -> Iterable["VMImageBuildTargetModel"]:
+        """Get multiple VM image builds at once, together with their runs."""
+        with sa_session_transaction() as session:
+            return (
+                session.query(VMImageBuildTargetModel)
+                .options(
+                    selectinload(VMImageBuildTargetModel.runs).joinedload(
+                        PipelineModel.project_event
+                    )
+                )
+                .filter(VMImageBuildTargetModel.id.in_(ids))
+            )
+
     @classmethod
     def get_all(cls) -> Iterable["VMImageBuildTargetModel"]:
         with sa_session_transaction() as session:
@@ -3783,7 +4390,7 @@ class SidetagModel(Base):
         provides a corresponding instance of `SidetagModel` to be updated within the context
         and commits the changes upon exiting the context, all within a single transaction.
         """
-        session = singleton_session or Session()
+        session = Session()
         session.begin()
 
         try:
@@ -3824,10 +4431,395 @@ class SidetagModel(Base):
             return session.query(SidetagModel).filter_by(koji_name=koji_name).first()
 
 
-@cached(cache=TTLCache(maxsize=2048, ttl=(60 * 60 * 24)))
+class UsageRollupGranularity(str, enum.Enum):
+    hour = "hour"
+    day = "day"
+
+
+# job models the usage statistics are collected for, together with the pipeline
+# column referencing them
+USAGE_JOB_MODELS: Dict[str, Column] = {
+    "srpm_builds": PipelineModel.srpm_build_id,
+    "copr_build_groups": PipelineModel.copr_build_group_id,
+    "koji_build_groups": PipelineModel.koji_build_group_id,
+    "vm_image_build_targets": PipelineModel.vm_image_build_id,
+    "tft_test_run_groups": PipelineModel.test_run_group_id,
+    "sync_release_runs": PipelineModel.sync_release_run_id,
+}
+# job type reported for the number of project event objects (e.g. pull requests)
+# with at least one pipeline, also the name of the watermark of the pipelines
+USAGE_ROLLUP_EVENTS = "events"
+
+
+def _get_bucket_start(
+    datetime_: datetime, granularity: UsageRollupGranularity
+) -> datetime:
+    bucket_start = datetime_.replace(minute=0, second=0, microsecond=0)
+    if granularity == UsageRollupGranularity.day:
+        bucket_start = bucket_start.replace(hour=0)
+    return bucket_start
+
+
+def _to_naive_utc(datetime_: Union[datetime, str, None]) -> Optional[datetime]:
+    """Convert the (ISO formatted) datetime to the naive UTC one used in the DB."""
+    if isinstance(datetime_, str):
+        datetime_ = datetime.fromisoformat(datetime_)
+    if datetime_ and datetime_.tzinfo:
+        datetime_ = datetime_.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime_
+
+
+class UsageRollupWatermarkModel(Base):
+    """
+    Remembers the last row of each kind that has been folded into the usage rollups:
+    the last pipeline for the project events (`name == USAGE_ROLLUP_EVENTS`)
+    and the last job for each of the job types from `USAGE_JOB_MODELS`.
+
+    The jobs are tracked by their own IDs since they are often attached
+    to a pipeline long after the pipeline has been created
+    (e.g. the Testing Farm runs once the Copr builds are finished).
+    """
+
+    __tablename__ = "usage_rollup_watermarks"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True)
+    last_id = Column(Integer, default=0)
+    updated_time = Column(DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def get_or_create(
+        cls, session: SQLASession, name: str
+    ) -> "UsageRollupWatermarkModel":
+        watermark = session.query(cls).filter_by(name=name).first()
+        if not watermark:
+            watermark = cls()
+            watermark.name = name
+            watermark.last_id = 0
+            session.add(watermark)
+        return watermark
+
+    def move(self, session: SQLASession, last_id: int) -> None:
+        self.last_id = last_id
+        self.updated_time = datetime.utcnow()
+        session.add(self)
+
+
+class UsageRollupEventModel(Base):
+    """
+    Project event objects (e.g. pull requests) with at least one pipeline
+    during the time bucket (hour or day).
+
+    The objects are stored instead of being counted so that an object active
+    during multiple buckets of a period is counted only once.
+    """
+
+    __tablename__ = "usage_rollup_events"
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity",
+            "bucket_start",
+            "project_event_type",
+            "event_id",
+        ),
+    )
+    id = Column(Integer, primary_key=True)
+    granularity = Column(Enum(UsageRollupGranularity))
+    bucket_start = Column(DateTime, index=True)
+    project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
+    project_event_type = Column(String)
+    event_id = Column(Integer)
+
+
+class UsageRollupModel(Base):
+    """
+    Number of jobs aggregated per time bucket (hour or day), project,
+    project event type and job type (a table name from `USAGE_JOB_MODELS`).
+
+    Each job is counted once, in the bucket of its first pipeline. The project events
+    are tracked separately, see `UsageRollupEventModel`.
+
+    The rollups are updated incrementally by `fold_new_usage`, only the jobs
+    and pipelines created since the last run are processed.
+    """
+
+    __tablename__ = "usage_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity",
+            "bucket_start",
+            "project_id",
+            "project_event_type",
+            "job_type",
+        ),
+    )
+    id = Column(Integer, primary_key=True)
+    granularity = Column(Enum(UsageRollupGranularity))
+    bucket_start = Column(DateTime, index=True)
+    project_id = Column(Integer, ForeignKey("git_projects.id"), index=True)
+    project_event_type = Column(String)
+    job_type = Column(String)
+    count = Column(Integer, default=0)
+
+    @classmethod
+    def fold_new_usage(cls, batch_size: int = 10000) -> int:
+        """
+        Fold the jobs and pipelines created since the last run into the rollups.
+
+        Args:
+            batch_size: Maximum number of jobs of each type and pipelines
+                processed in one run.
+
+        Returns:
+            The largest number of jobs of a single type or pipelines processed,
+            i.e. `batch_size` if there can be more to fold.
+        """
+        with sa_session_transaction(commit=True) as session:
+            processed = [cls._fold_new_events(session, batch_size)]
+            for job_type, column in USAGE_JOB_MODELS.items():
+                processed.append(
+                    cls._fold_new_jobs(session, job_type, column, batch_size)
+                )
+            return max(processed)
+
+    @staticmethod
+    def _get_project_ids(
+        session: SQLASession, pipelines: list
+    ) -> Dict[Tuple[ProjectEventModelType, int], int]:
+        """Get git project IDs for the project event objects of the pipelines."""
+        event_ids_per_type: Dict[ProjectEventModelType, Set[int]] = {}
+        for pipeline in pipelines:
+            event_ids_per_type.setdefault(pipeline.type, set()).add(pipeline.event_id)
+
+        project_ids = {}
+        for type, event_ids in event_ids_per_type.items():
+            model = MODEL_FOR_PROJECT_EVENT[type]
+            if model.project.property.mapper.class_ is not GitProjectModel:
+                # usage statistics are collected only for git projects
+                continue
+            for event_id, project_id in session.query(
+                model.id, model.project_id
+            ).filter(model.id.in_(event_ids)):
+                project_ids[type, event_id] = project_id
+        return project_ids
+
+    @classmethod
+    def _fold_new_jobs(
+        cls, session: SQLASession, job_type: str, column: Column, batch_size: int
+    ) -> int:
+        watermark = UsageRollupWatermarkModel.get_or_create(session, job_type)
+        job_ids = [
+            job_id
+            for (job_id,) in session.query(column)
+            .filter(column > watermark.last_id)
+            .distinct()
+            .order_by(column)
+            .limit(batch_size)
+        ]
+        if not job_ids:
+            return 0
+
+        # the first pipeline of each job
+        first_pipelines = {}
+        for pipeline in (
+            session.query(
+                column.label("job_id"),
+                PipelineModel.datetime,
+                ProjectEventModel.type,
+                ProjectEventModel.event_id,
+            )
+            .join(
+                ProjectEventModel,
+                PipelineModel.project_event_id == ProjectEventModel.id,
+            )
+            .filter(column.in_(job_ids))
+            .order_by(PipelineModel.datetime)
+        ):
+            first_pipelines.setdefault(pipeline.job_id, pipeline)
+
+        project_ids = cls._get_project_ids(session, list(first_pipelines.values()))
+        counts: Counter = Counter()
+        for pipeline in first_pipelines.values():
+            if not (project_id := project_ids.get((pipeline.type, pipeline.event_id))):
+                continue
+            for granularity in UsageRollupGranularity:
+                counts[
+                    granularity,
+                    _get_bucket_start(pipeline.datetime, granularity),
+                    project_id,
+                    pipeline.type.value,
+                    job_type,
+                ] += 1
+        cls._add_counts(session, counts)
+
+        watermark.move(session, job_ids[-1])
+        return len(job_ids)
+
+    @classmethod
+    def _fold_new_events(cls, session: SQLASession, batch_size: int) -> int:
+        watermark = UsageRollupWatermarkModel.get_or_create(
+            session, USAGE_ROLLUP_EVENTS
+        )
+        pipelines = (
+            session.query(
+                PipelineModel.id,
+                PipelineModel.datetime,
+                ProjectEventModel.type,
+                ProjectEventModel.event_id,
+            )
+            .join(
+                ProjectEventModel,
+                PipelineModel.project_event_id == ProjectEventModel.id,
+            )
+            .filter(PipelineModel.id > watermark.last_id)
+            .order_by(PipelineModel.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not pipelines:
+            return 0
+
+        project_ids = cls._get_project_ids(session, pipelines)
+        active_events = {}
+        for pipeline in pipelines:
+            if not (project_id := project_ids.get((pipeline.type, pipeline.event_id))):
+                continue
+            for granularity in UsageRollupGranularity:
+                bucket_start = _get_bucket_start(pipeline.datetime, granularity)
+                active_events[
+                    granularity, bucket_start, pipeline.type.value, pipeline.event_id
+                ] = project_id
+
+        if active_events:
+            session.execute(
+                psql_insert(UsageRollupEventModel)
+                .values(
+                    [
+                        dict(
+                            granularity=granularity,
+                            bucket_start=bucket_start,
+                            project_id=project_id,
+                            project_event_type=project_event_type,
+                            event_id=event_id,
+                        )
+                        for (
+                            granularity,
+                            bucket_start,
+                            project_event_type,
+                            event_id,
+                        ), project_id in active_events.items()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+        watermark.move(session, pipelines[-1].id)
+        return len(pipelines)
+
+    @classmethod
+    def _add_counts(cls, session: SQLASession, counts: Counter) -> None:
+        existing_rollups = {
+            (
+                rollup.granularity,
+                rollup.bucket_start,
+                rollup.project_id,
+                rollup.project_event_type,
+                rollup.job_type,
+            ): rollup
+            for rollup in session.query(cls).filter(
+                cls.bucket_start.in_(list({key[1] for key in counts}))
+            )
+        }
+        for key, count_ in counts.items():
+            if not (rollup := existing_rollups.get(key)):
+                rollup = cls()
+                (
+                    rollup.granularity,
+                    rollup.bucket_start,
+                    rollup.project_id,
+                    rollup.project_event_type,
+                    rollup.job_type,
+                ) = key
+                rollup.count = 0
+            rollup.count += count_
+            session.add(rollup)
+
+    @classmethod
+    def get_usage_numbers(
+        cls, datetime_from=None, datetime_to=None
+    ) -> List[Tuple[str, str, str, str, int]]:
+        """
+        Sum the rollups of the given period.
+
+        The daily rollups are used if the period is aligned to days,
+        the hourly ones otherwise. The period is extended to whole buckets,
+        i.e. the buckets containing `datetime_from` and `datetime_to`
+        are included completely.
+
+        Returns:
+            List of (project URL, instance URL, project event type, job type, count),
+            where the job type is `USAGE_ROLLUP_EVENTS` for the number of distinct
+            project event objects with at least one pipeline during the period.
+        """
+        datetime_from, datetime_to = (
+            _to_naive_utc(d) for d in (datetime_from, datetime_to)
+        )
+        granularity = (
+            UsageRollupGranularity.day
+            if all(
+                d is None or d == _get_bucket_start(d, UsageRollupGranularity.day)
+                for d in (datetime_from, datetime_to)
+            )
+            else UsageRollupGranularity.hour
+        )
+
+        def filter_period(query: Query, model) -> Query:
+            query = query.join(
+                GitProjectModel, GitProjectModel.id == model.project_id
+            ).filter(model.granularity == granularity)
+            if datetime_from:
+                query = query.filter(
+                    model.bucket_start >= _get_bucket_start(datetime_from, granularity)
+                )
+            if datetime_to:
+                # unaligned end of the period is in the bucket starting before it
+                query = query.filter(model.bucket_start < datetime_to)
+            return query.group_by(
+                GitProjectModel.project_url,
+                GitProjectModel.instance_url,
+                model.project_event_type,
+            )
+
+        with sa_session_transaction() as session:
+            jobs = filter_period(
+                session.query(
+                    GitProjectModel.project_url,
+                    GitProjectModel.instance_url,
+                    cls.project_event_type,
+                    cls.job_type,
+                    func.sum(cls.count),
+                ),
+                cls,
+            ).group_by(cls.job_type)
+            events = filter_period(
+                session.query(
+                    GitProjectModel.project_url,
+                    GitProjectModel.instance_url,
+                    UsageRollupEventModel.project_event_type,
+                    func.count(UsageRollupEventModel.event_id.distinct()),
+                ),
+                UsageRollupEventModel,
+            )
+            return jobs.all() + [
+                (project_url, instance_url, project_event_type, USAGE_ROLLUP_EVENTS, n)
+                for project_url, instance_url, project_event_type, n in events
+            ]
+
+
+@cached(cache=TTLCache(maxsize=2048, ttl=(60 * 60)))
 def get_usage_data(datetime_from=None, datetime_to=None, top=10) -> dict:
     """
-    Get usage data.
+    Get usage data (computed from the usage rollups, see `UsageRollupModel`
+    and `UsageRollupEventModel`).
 
     Example:
     ```
@@ -4032,84 +5024,74 @@ def get_usage_data(datetime_from=None, datetime_to=None, top=10) -> dict:
 
     ```
     """
-    jobs = {}
-    for job_model in [
-        SRPMBuildModel,
-        CoprBuildGroupModel,
-        KojiBuildGroupModel,
-        VMImageBuildTargetModel,
-        TFTTestRunGroupModel,
-        SyncReleaseModel,
-    ]:
-        if not hasattr(job_model, "__tablename__"):
-            # otherwise mypi complains:
-            # "type[ProjectAndEventsConnector]" has no attribute "__tablename__"
-            continue
-
-        jobs[job_model.__tablename__] = dict(
-            job_runs=GitProjectModel.get_job_usage_numbers_count_all_project_events(
-                datetime_from=datetime_from,
-                datetime_to=datetime_to,
-                job_result_model=job_model,
-            ),
-            top_projects_by_job_runs=GitProjectModel.get_job_usage_numbers_all_project_events(
-                datetime_from=datetime_from,
-                datetime_to=datetime_to,
-                top=top,
-                job_result_model=job_model,
-            ),
-        )
-        jobs[job_model.__tablename__]["per_event"] = {
-            project_event_type.value: dict(
-                job_runs=GitProjectModel.get_job_usage_numbers_count(
-                    datetime_from=datetime_from,
-                    datetime_to=datetime_to,
-                    job_result_model=job_model,
-                    project_event_type=project_event_type,
-                ),
-                top_projects_by_job_runs=GitProjectModel.get_job_usage_numbers(
-                    datetime_from=datetime_from,
-                    datetime_to=datetime_to,
-                    top=top,
-                    job_result_model=job_model,
-                    project_event_type=project_event_type,
-                ),
-            )
+    events: Dict[str, Counter] = {
+        project_event_type.value: Counter()
+        for project_event_type in ProjectEventModelType
+    }
+    jobs_per_event: Dict[str, Dict[str, Counter]] = {
+        job_type: {
+            project_event_type.value: Counter()
             for project_event_type in ProjectEventModelType
         }
+        for job_type in USAGE_JOB_MODELS
+    }
+    active_projects_per_instance: Dict[str, Set[str]] = {}
+
+    for (
+        project_url,
+        instance_url,
+        project_event_type,
+        job_type,
+        count_,
+    ) in UsageRollupModel.get_usage_numbers(
+        datetime_from=datetime_from, datetime_to=datetime_to
+    ):
+        if job_type == USAGE_ROLLUP_EVENTS:
+            events[project_event_type][project_url] += count_
+            active_projects_per_instance.setdefault(instance_url, set()).add(
+                project_url
+            )
+        elif job_type in jobs_per_event:
+            jobs_per_event[job_type][project_event_type][project_url] += count_
+
+    def get_top(usage_numbers: Counter) -> Dict[str, int]:
+        return dict(usage_numbers.most_common(top))
+
+    jobs = {}
+    for job_type, per_event in jobs_per_event.items():
+        all_project_events: Counter = sum(per_event.values(), Counter())
+        jobs[job_type] = dict(
+            job_runs=sum(all_project_events.values()),
+            top_projects_by_job_runs=get_top(all_project_events),
+            per_event={
+                project_event_type: dict(
+                    job_runs=sum(usage_numbers.values()),
+                    top_projects_by_job_runs=get_top(usage_numbers),
+                )
+                for project_event_type, usage_numbers in per_event.items()
+            },
+        )
 
+    all_events: Counter = sum(events.values(), Counter())
     return dict(
         all_projects=dict(
             project_count=GitProjectModel.get_project_count(),
             instances=GitProjectModel.get_instance_numbers(),
         ),
         active_projects=dict(
-            project_count=GitProjectModel.get_active_projects_count(
-                datetime_from=datetime_from,
-                datetime_to=datetime_to,
-            ),
-            top_projects_by_events_handled=GitProjectModel.get_active_projects_usage_numbers(
-                datetime_from=datetime_from, datetime_to=datetime_to, top=top
-            ),
-            instances=GitProjectModel.get_instance_numbers_for_active_projects(
-                datetime_from=datetime_from, datetime_to=datetime_to
-            ),
+            project_count=len(all_events),
+            top_projects_by_events_handled=get_top(all_events),
+            instances={
+                instance: len(projects)
+                for instance, projects in active_projects_per_instance.items()
+            },
         ),
         events={
-            project_event_type.value: dict(
-                events_handled=GitProjectModel.get_project_event_usage_count(
-                    datetime_from=datetime_from,
-                    datetime_to=datetime_to,
-                    project_event_type=project_event_type,
-                ),
-                top_projects=GitProjectModel.get_project_event_usage_numbers(
-                    datetime_from=datetime_from,
-                    datetime_to=datetime_to,
-                    top=top,
-                    project_event_type=project_event_type,
-                ),
+            project_event_type: dict(
+                events_handled=sum(usage_numbers.values()),
+                top_projects=get_top(usage_numbers),
             )
-            for project_event_type in ProjectEventModelType
+            for project_event_type, usage_numbers in events.items()
         },
         jobs=jobs,
     )
@@ -83,6 +83,14 @@ class ServiceConfigSchema(UserConfigSchema):
     package_config_path_override = fields.String()
     command_handler_storage_class = fields.String(missing="gp2")
     appcode = fields.String()
+    testing_farm_babysit_concurrency = fields.Integer()
+    testing_farm_babysit_rate_limit = fields.Float()
+    webhook_deduplication_window = fields.Integer()
+    database_pool_size = fields.Integer()
+    database_max_overflow = fields.Integer()
+    database_pool_pre_ping = fields.Bool()
+    repository_cache_max_size = fields.Float()
+    parallel_sync_release = fields.Bool()
 
     @post_load
     def make_instance(self, data, **kwargs):
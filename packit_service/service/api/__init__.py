@@ -19,6 +19,7 @@ from packit_service.service.api.usage import usage_ns
 from packit_service.service.api.pull_from_upstream import ns as pull_from_upstream_ns
 from packit_service.service.api.system import ns as system_ns
 from packit_service.service.api.bodhi_updates import ns as bodhi_updates_ns
+from packit_service.service.api.export import export_ns
 
 # https://flask-restplus.readthedocs.io/en/stable/scaling.html
 blueprint = Blueprint("api", __name__, url_prefix="/api")
@@ -44,3 +45,4 @@ api.add_namespace(usage_ns)
 api.add_namespace(pull_from_upstream_ns)
 api.add_namespace(system_ns)
 api.add_namespace(bodhi_updates_ns)
+api.add_namespace(export_ns)
@@ -11,7 +11,12 @@ from packit_service.models import (
     BodhiUpdateTargetModel,
     BodhiUpdateGroupModel,
 )
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import get_project_info_from_build, response_maker
 
 logger = getLogger("packit_service")
@@ -28,7 +33,8 @@ class BodhiUpdatesList(Resource):
         first, last = indices()
         result = []
 
-        for update in BodhiUpdateTargetModel.get_range(first, last):
+        updates = list(BodhiUpdateTargetModel.get_range(first, last, cursor(int)))
+        for update in updates:
             update_dict = {
                 "packit_id": update.id,
                 "status": update.status,
@@ -54,7 +60,7 @@ class BodhiUpdatesList(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"bodhi-updates {first + 1}-{last}/*"
+        set_range_headers(resp, "bodhi-updates", first, last, updates)
         return resp
 
 
@@ -12,7 +12,12 @@ from packit_service.models import (
     BuildStatus,
     CoprBuildGroupModel,
 )
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import get_project_info_from_build, response_maker
 
 logger = getLogger("packit_service")
@@ -33,7 +38,8 @@ class CoprBuildsList(Resource):
         result = []
 
         first, last = indices()
-        for build in CoprBuildTargetModel.get_merged_chroots(first, last):
+        builds = list(CoprBuildTargetModel.get_merged_chroots(first, last, cursor(int)))
+        for build in builds:
             build_info = CoprBuildTargetModel.get_by_build_id(build.build_id, None)
             if build_info.status == BuildStatus.waiting_for_srpm:
                 continue
@@ -76,7 +82,9 @@ class CoprBuildsList(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"copr-builds {first + 1}-{last}/*"
+        set_range_headers(
+            resp, "copr-builds", first, last, builds, lambda build: (build.new_id,)
+        )
         return resp
 
 
@@ -0,0 +1,153 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import json
+import zlib
+from http import HTTPStatus
+from logging import getLogger
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from flask import Response, request, stream_with_context
+from flask_restx import Namespace, Resource
+
+from packit_service.models import (
+    CoprBuildTargetModel,
+    ProjectEventModel,
+    TFTTestRunTargetModel,
+    optional_timestamp,
+)
+from packit_service.service.api.usage import process_timestamps
+from packit_service.service.api.utils import (
+    get_project_info_from_project_event_object,
+    response_maker,
+)
+
+logger = getLogger("packit_service")
+
+export_ns = Namespace(
+    "export", description="Streaming exports of the builds and test runs"
+)
+
+
+def get_copr_build_export_info(build: CoprBuildTargetModel) -> Dict[str, Any]:
+    return {
+        "packit_id": build.id,
+        "build_id": build.build_id,
+        "status": build.status,
+        "chroot": build.target,
+        "copr_project": build.project_name,
+        "copr_owner": build.owner,
+        "web_url": build.web_url,
+        "build_logs_url": build.build_logs_url,
+        "build_submitted_time": optional_timestamp(build.build_submitted_time),
+        "build_start_time": optional_timestamp(build.build_start_time),
+        "build_finished_time": optional_timestamp(build.build_finished_time),
+    }
+
+
+def get_test_run_export_info(test_run: TFTTestRunTargetModel) -> Dict[str, Any]:
+    return {
+        "packit_id": test_run.id,
+        "pipeline_id": test_run.pipeline_id,
+        "status": test_run.status,
+        "target": test_run.target,
+        "web_url": test_run.web_url,
+        "submitted_time": optional_timestamp(test_run.submitted_time),
+    }
+
+
+# model type in the URL: (getter of the batches, serializer of a single entry)
+EXPORTS: Dict[str, tuple] = {
+    "copr-builds": (CoprBuildTargetModel.get_for_export, get_copr_build_export_info),
+    "test-runs": (TFTTestRunTargetModel.get_for_export, get_test_run_export_info),
+}
+
+
+def get_project_event(entry) -> Optional[ProjectEventModel]:
+    group = entry.group_of_targets
+    return group.runs[0].project_event if group and group.runs else None
+
+
+def export_lines(
+    batches: Iterable[List[Any]], serialize: Callable[[Any], Dict[str, Any]]
+) -> Iterable[str]:
+    """
+    Serialize the entries into lines of newline-delimited JSON.
+
+    The project event objects (and their projects) are loaded once per batch
+    instead of once per entry.
+    """
+    for batch in batches:
+        project_events = [get_project_event(entry) for entry in batch]
+        project_event_objects = ProjectEventModel.get_project_event_objects(
+            filter(None, set(project_events))
+        )
+
+        chunk = []
+        for entry, project_event in zip(batch, project_events):
+            entry_info = serialize(entry)
+            entry_info["commit_sha"] = (
+                project_event.commit_sha if project_event else None
+            )
+            entry_info.update(
+                get_project_info_from_project_event_object(
+                    project_event_objects.get(project_event.id)
+                    if project_event
+                    else None
+                )
+            )
+            chunk.append(json.dumps(entry_info) + "\n")
+        yield "".join(chunk)
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterable[bytes]:
+    """Compress the streamed chunks into a single gzip stream."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk.encode()):
+            yield data
+    yield compressor.flush()
+
+
+@export_ns.route("/<model_type>")
+@export_ns.param("model_type", f"Type of the exported entries: {', '.join(EXPORTS)}")
+class Export(Resource):
+    @export_ns.response(HTTPStatus.OK, "Newline-delimited JSON follows")
+    @export_ns.response(HTTPStatus.BAD_REQUEST, "Timestamps are in wrong format")
+    @export_ns.response(HTTPStatus.NOT_FOUND, "Unknown type of the entries")
+    def get(self, model_type):
+        """
+        Stream all the entries of the given type as newline-delimited JSON.
+
+        You can use `from` and `to` arguments to specify a time range
+        (e.g. `/api/export/copr-builds?from=2024-01-01&to=2024-02-01`).
+        The entries are ordered by their ID and the response is compressed
+        if the client accepts gzip.
+        """
+        if model_type not in EXPORTS:
+            return response_maker(
+                {"error": f"Unknown type, use one of: {', '.join(EXPORTS)}"},
+                status=HTTPStatus.NOT_FOUND,
+            )
+
+        errors, datetime_from, datetime_to = process_timestamps(
+            request.args.get("from"),
+            request.args.get("to"),
+        )
+        if errors:
+            return response_maker({"errors": errors}, status=HTTPStatus.BAD_REQUEST)
+
+        get_batches, serialize = EXPORTS[model_type]
+        logger.info(f"Exporting {model_type} from {datetime_from} to {datetime_to}.")
+        lines = export_lines(get_batches(datetime_from, datetime_to), serialize)
+
+        headers = {"Vary": "Accept-Encoding"}
+        if request.accept_encodings["gzip"]:
+            headers["Content-Encoding"] = "gzip"
+            lines = gzip_chunks(lines)
+
+        return Response(
+            stream_with_context(lines),
+            mimetype="application/x-ndjson",
+            headers=headers,
+        )
@@ -12,7 +12,12 @@ from packit_service.models import (
     optional_timestamp,
     KojiBuildGroupModel,
 )
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import get_project_info_from_build, response_maker
 
 logger = getLogger("packit_service")
@@ -34,7 +39,10 @@ class KojiBuildsList(Resource):
         first, last = indices()
         result = []
 
-        for build in KojiBuildTargetModel.get_range(first, last, scratch):
+        builds = list(
+            KojiBuildTargetModel.get_range(first, last, scratch, after=cursor(int))
+        )
+        for build in builds:
             build_dict = {
                 "packit_id": build.id,
                 "task_id": build.task_id,
@@ -61,7 +69,7 @@ class KojiBuildsList(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"koji-builds {first + 1}-{last}/*"
+        set_range_headers(resp, "koji-builds", first, last, builds)
         return resp
 
 
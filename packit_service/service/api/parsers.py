@@ -1,9 +1,15 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from flask import request
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+from typing import Any, Callable, Sequence
 
-from flask_restx import reqparse
+from flask import request, Response
+
+from flask_restx import abort, reqparse
 
 DEFAULT_PAGE = 1
 DEFAULT_PER_PAGE = 10
@@ -20,6 +26,13 @@ pagination_arguments.add_argument(
     default=DEFAULT_PER_PAGE,
     help="Results per page",
 )
+pagination_arguments.add_argument(
+    "after",
+    type=str,
+    required=False,
+    help="Opaque cursor of the last entry on the previous page, "
+    "taken from the Next-Range header; pages are then counted from it",
+)
 
 
 def indices():
@@ -32,3 +45,64 @@ def indices():
     first = (page - 1) * per_page
     last = page * per_page
     return first, last
+
+
+def encode_cursor(*values) -> str:
+    """Encode the values of the sort key of an entry into an opaque cursor"""
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def cursor(*types: type) -> Any:
+    """
+    Return the values of the sort key from the `after` cursor.
+
+    Args:
+        types: Types of the values in the sort key.
+
+    Returns:
+        None if no cursor was given, the value for single-value sort keys,
+        tuple of the values otherwise. Invalid cursor aborts the request.
+    """
+    args = pagination_arguments.parse_args(request)
+    if not (token := args.get("after")):
+        return None
+
+    try:
+        values = json.loads(urlsafe_b64decode(token.encode()))
+    except (ValueError, binascii.Error):
+        values = None
+    if not (
+        isinstance(values, list)
+        and len(values) == len(types)
+        and all(isinstance(value, type_) for value, type_ in zip(values, types))
+    ):
+        abort(HTTPStatus.BAD_REQUEST, "Invalid pagination cursor.")
+
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+def set_range_headers(
+    resp: Response,
+    unit: str,
+    first: int,
+    last: int,
+    entries: Sequence = (),
+    sort_key: Callable[[Any], tuple] = lambda entry: (entry.id,),
+) -> None:
+    """
+    Set the Content-Range header and, if the page is full, the Next-Range
+    header with the cursor for getting the next page.
+
+    Args:
+        resp: Response of the list endpoint.
+        unit: Name of the listed entries.
+        first: Index of the first entry.
+        last: Index after the last entry.
+        entries: Entries fetched from the database for the page.
+        sort_key: Values of the sort key of an entry the page is ordered by.
+    """
+    resp.headers["Content-Range"] = f"{unit} {first + 1}-{last}/*"
+    if entries and len(entries) == last - first:
+        resp.headers["Next-Range"] = (
+            f"{unit} after={encode_cursor(*sort_key(entries[-1]))}"
+        )
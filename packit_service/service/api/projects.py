@@ -7,7 +7,12 @@ from logging import getLogger
 from flask_restx import Namespace, Resource
 
 from packit_service.models import GitProjectModel
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import response_maker
 from packit_service.service.urls import get_srpm_build_info_url
 
@@ -29,7 +34,8 @@ class ProjectsList(Resource):
         result = []
         first, last = indices()
 
-        for project in GitProjectModel.get_range(first, last):
+        projects = list(GitProjectModel.get_range(first, last, cursor(str, int)))
+        for project in projects:
             project_info = {
                 "namespace": project.namespace,
                 "repo_name": project.repo_name,
@@ -45,7 +51,14 @@ class ProjectsList(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT if result else HTTPStatus.OK,
         )
-        resp.headers["Content-Range"] = f"git-projects {first + 1}-{last}/*"
+        set_range_headers(
+            resp,
+            "git-projects",
+            first,
+            last,
+            projects,
+            lambda project: (project.namespace, project.id),
+        )
         return resp
 
 
@@ -87,7 +100,10 @@ class ProjectsForge(Resource):
         result = []
         first, last = indices()
 
-        for project in GitProjectModel.get_by_forge(first, last, forge):
+        projects = list(
+            GitProjectModel.get_by_forge(first, last, forge, cursor(str, int))
+        )
+        for project in projects:
             project_info = {
                 "namespace": project.namespace,
                 "repo_name": project.repo_name,
@@ -103,7 +119,14 @@ class ProjectsForge(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT if result else HTTPStatus.OK,
         )
-        resp.headers["Content-Range"] = f"git-projects {first + 1}-{last}/*"
+        set_range_headers(
+            resp,
+            "git-projects",
+            first,
+            last,
+            projects,
+            lambda project: (project.namespace, project.id),
+        )
         return resp
 
 
@@ -118,9 +141,12 @@ class ProjectsNamespace(Resource):
         result = []
         first, last = indices()
 
-        for project in GitProjectModel.get_by_forge_namespace(
-            first, last, forge, namespace
-        ):
+        projects = list(
+            GitProjectModel.get_by_forge_namespace(
+                first, last, forge, namespace, cursor(int)
+            )
+        )
+        for project in projects:
             project_info = {
                 "namespace": project.namespace,
                 "repo_name": project.repo_name,
@@ -136,7 +162,7 @@ class ProjectsNamespace(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT if result else HTTPStatus.OK,
         )
-        resp.headers["Content-Range"] = f"git-projects {first + 1}-{last}/*"
+        set_range_headers(resp, "git-projects", first, last, projects)
         return resp
 
 
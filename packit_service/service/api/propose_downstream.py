@@ -11,7 +11,12 @@ from packit_service.models import (
     SyncReleaseModel,
     SyncReleaseJobType,
 )
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import (
     response_maker,
     get_sync_release_info,
@@ -32,13 +37,19 @@ class ProposeDownstreamList(Resource):
 
         result = []
         first, last = indices()
-        for propose_downstream_results in SyncReleaseModel.get_range(
-            first, last, job_type=SyncReleaseJobType.propose_downstream
-        ):
+        sync_releases = list(
+            SyncReleaseModel.get_range(
+                first,
+                last,
+                job_type=SyncReleaseJobType.propose_downstream,
+                after=cursor(int),
+            )
+        )
+        for propose_downstream_results in sync_releases:
             result.append(get_sync_release_info(propose_downstream_results))
 
         resp = response_maker(result, status=HTTPStatus.PARTIAL_CONTENT)
-        resp.headers["Content-Range"] = f"propose-downstreams {first + 1}-{last}/*"
+        set_range_headers(resp, "propose-downstreams", first, last, sync_releases)
         return resp
 
 
@@ -3,7 +3,7 @@
 
 from http import HTTPStatus
 from logging import getLogger
-from typing import Dict
+from typing import Any, Dict, Set
 
 from flask_restx import Namespace, Resource
 
@@ -11,6 +11,7 @@ from packit_service.models import (
     CoprBuildGroupModel,
     KojiBuildGroupModel,
     PipelineModel,
+    ProjectEventModel,
     SyncReleaseModel,
     SRPMBuildModel,
     TFTTestRunTargetModel,
@@ -21,9 +22,15 @@ from packit_service.models import (
     BodhiUpdateTargetModel,
     VMImageBuildTargetModel,
 )
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import (
     get_project_info_from_build,
+    get_project_info_from_project_event_object,
     response_maker,
 )
 
@@ -32,7 +39,9 @@ logger = getLogger("packit_service")
 ns = Namespace("runs", description="Pipelines")
 
 
-def _add_sync_release(run: SyncReleaseModel, response_dict: Dict):
+def _add_sync_release(
+    run: SyncReleaseModel, response_dict: Dict, trigger: Dict[str, Any]
+):
     targets = response_dict[run.job_type.value]
 
     for target in run.sync_release_targets:
@@ -46,10 +55,12 @@ def _add_sync_release(run: SyncReleaseModel, response_dict: Dict):
 
     if "trigger" not in response_dict:
         response_dict["time_submitted"] = optional_timestamp(run.submitted_time)
-        response_dict["trigger"] = get_project_info_from_build(run)
+        response_dict["trigger"] = trigger
 
 
-def _add_vm_image_build(run: VMImageBuildTargetModel, response_dict: Dict):
+def _add_vm_image_build(
+    run: VMImageBuildTargetModel, response_dict: Dict, trigger: Dict[str, Any]
+):
     response_dict["vm_image_build"].append(
         {
             "packit_id": run.id,
@@ -59,24 +70,83 @@ def _add_vm_image_build(run: VMImageBuildTargetModel, response_dict: Dict):
     )
     if "trigger" not in response_dict:
         response_dict["time_submitted"] = optional_timestamp(run.build_submitted_time)
-        response_dict["trigger"] = get_project_info_from_build(run)
+        response_dict["trigger"] = trigger
 
 
 def flatten_and_remove_none(ids):
     return filter(None, map(lambda arr: arr[0], ids))
 
 
+GROUP_MODELS = (
+    ("copr", CoprBuildGroupModel, "copr_build_group_id"),
+    ("koji", KojiBuildGroupModel, "koji_build_group_id"),
+    ("test_run", TFTTestRunGroupModel, "test_run_group_id"),
+    ("bodhi_update", BodhiUpdateGroupModel, "bodhi_update_group_id"),
+)
+
+
+def _get_models_by_id(Model, ids: Set[int]) -> Dict[int, Any]:
+    """Load all the models with given IDs using a single (eager-loading) query."""
+    return {model.id: model for model in Model.get_by_ids(list(ids))} if ids else {}
+
+
 def process_runs(runs):
     """
     Process `PipelineModel`s and construct a JSON that is returned from the endpoints
     that return merged chroots.
 
+    All the related models are loaded in bulk (one query per model type) so that
+    the number of queries does not grow with the number of processed runs.
+
     Args:
         runs: Iterator over merged `PipelineModel`s.
 
     Returns:
         List of JSON objects where each represents pipelines run on single SRPM.
     """
+    runs = list(runs)
+
+    srpm_build_ids = {pipeline.srpm_build_id for pipeline in runs} - {None}
+    group_ids: Dict[str, Set[int]] = {
+        model_type: set() for model_type, *_ in GROUP_MODELS
+    }
+    sync_release_ids, vm_image_build_ids = set(), set()
+    for pipeline in runs:
+        for model_type, _, column in GROUP_MODELS:
+            group_ids[model_type].update(
+                flatten_and_remove_none(getattr(pipeline, column))
+            )
+        if sync_release := list(flatten_and_remove_none(pipeline.sync_release_run_id)):
+            sync_release_ids.add(sync_release[0])
+        vm_image_build_ids.update(flatten_and_remove_none(pipeline.vm_image_build_id))
+
+    srpm_builds = _get_models_by_id(SRPMBuildModel, srpm_build_ids)
+    groups = {
+        model_type: _get_models_by_id(Model, group_ids[model_type])
+        for model_type, Model, _ in GROUP_MODELS
+    }
+    sync_releases = _get_models_by_id(SyncReleaseModel, sync_release_ids)
+    vm_image_builds = _get_models_by_id(VMImageBuildTargetModel, vm_image_build_ids)
+
+    # all the models of a merged run share the project event, resolve the project
+    # event objects (and their projects) for all of them at once
+    project_events = {
+        model.runs[0].project_event_id: model.runs[0].project_event
+        for models in (srpm_builds, sync_releases, vm_image_builds, *groups.values())
+        for model in models.values()
+        if model.runs
+    }
+    project_event_objects = ProjectEventModel.get_project_event_objects(
+        filter(None, project_events.values())
+    )
+
+    def get_trigger(model) -> Dict[str, Any]:
+        if not model.runs:
+            return {}
+        return get_project_info_from_project_event_object(
+            project_event_objects.get(model.runs[0].project_event_id)
+        )
+
     result = []
 
     for pipeline in runs:
@@ -92,7 +162,7 @@ def process_runs(runs):
             "vm_image_build": [],
         }
 
-        if srpm_build := SRPMBuildModel.get_by_id(pipeline.srpm_build_id):
+        if srpm_build := srpm_builds.get(pipeline.srpm_build_id):
             response_dict["srpm"] = {
                 "packit_id": srpm_build.id,
                 "status": srpm_build.status,
@@ -100,16 +170,12 @@ def process_runs(runs):
             response_dict["time_submitted"] = optional_timestamp(
                 srpm_build.build_submitted_time
             )
-            response_dict["trigger"] = get_project_info_from_build(srpm_build)
+            response_dict["trigger"] = get_trigger(srpm_build)
 
-        for model_type, Model, packit_ids in (
-            ("copr", CoprBuildGroupModel, pipeline.copr_build_group_id),
-            ("koji", KojiBuildGroupModel, pipeline.koji_build_group_id),
-            ("test_run", TFTTestRunGroupModel, pipeline.test_run_group_id),
-            ("bodhi_update", BodhiUpdateGroupModel, pipeline.bodhi_update_group_id),
-        ):
-            for packit_id in set(flatten_and_remove_none(packit_ids)):
-                group_row = Model.get_by_id(packit_id)
+        for model_type, _, column in GROUP_MODELS:
+            for packit_id in set(flatten_and_remove_none(getattr(pipeline, column))):
+                if not (group_row := groups[model_type].get(packit_id)):
+                    continue
                 for row in group_row.grouped_targets:
                     if row.status == BuildStatus.waiting_for_srpm:
                         continue
@@ -132,23 +198,24 @@ def process_runs(runs):
                         response_dict["time_submitted"] = optional_timestamp(
                             submitted_time
                         )
-                        response_dict["trigger"] = get_project_info_from_build(row)
+                        response_dict["trigger"] = get_trigger(group_row)
 
         # handle propose-downstream and pull-from-upstream
-        if sync_release := list(flatten_and_remove_none(pipeline.sync_release_run_id)):
+        if (
+            sync_release := list(flatten_and_remove_none(pipeline.sync_release_run_id))
+        ) and (sync_release_run := sync_releases.get(sync_release[0])):
             _add_sync_release(
-                SyncReleaseModel.get_by_id(sync_release[0]),
-                response_dict,
+                sync_release_run, response_dict, get_trigger(sync_release_run)
             )
 
         # handle VM image builds
         for vm_image_build_id in set(
             flatten_and_remove_none(pipeline.vm_image_build_id)
         ):
-            _add_vm_image_build(
-                VMImageBuildTargetModel.get_by_id(vm_image_build_id),
-                response_dict,
-            )
+            if vm_image_build := vm_image_builds.get(vm_image_build_id):
+                _add_vm_image_build(
+                    vm_image_build, response_dict, get_trigger(vm_image_build)
+                )
 
         result.append(response_dict)
 
@@ -162,12 +229,13 @@ class RunsList(Resource):
     def get(self):
         """List all runs."""
         first, last = indices()
-        result = process_runs(PipelineModel.get_merged_chroots(first, last))
+        runs = list(PipelineModel.get_merged_chroots(first, last, cursor(int)))
+        result = process_runs(runs)
         resp = response_maker(
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"runs {first + 1}-{last}/*"
+        set_range_headers(resp, "runs", first, last, runs, lambda run: (run.merged_id,))
         return resp
 
 
@@ -8,7 +8,12 @@ from packit_service.service.urls import get_srpm_build_info_url
 from flask_restx import Namespace, Resource
 
 from packit_service.models import SRPMBuildModel, optional_timestamp
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import get_project_info_from_build, response_maker
 
 logger = getLogger("packit_service")
@@ -26,7 +31,8 @@ class SRPMBuildsList(Resource):
         result = []
 
         first, last = indices()
-        for build in SRPMBuildModel.get_range(first, last):
+        builds = list(SRPMBuildModel.get_range(first, last, cursor(int)))
+        for build in builds:
             build_dict = {
                 "srpm_build_id": build.id,
                 "status": build.status,
@@ -48,7 +54,7 @@ class SRPMBuildsList(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"srpm-builds {first + 1}-{last}/*"
+        set_range_headers(resp, "srpm-builds", first, last, builds)
         return resp
 
 
@@ -17,7 +17,12 @@ from packit_service.models import (
     TFTTestRunGroupModel,
 )
 from packit_service.service.api.errors import ValidationFailed
-from packit_service.service.api.parsers import indices, pagination_arguments
+from packit_service.service.api.parsers import (
+    cursor,
+    indices,
+    pagination_arguments,
+    set_range_headers,
+)
 from packit_service.service.api.utils import get_project_info_from_build, response_maker
 
 logger = logging.getLogger("packit_service")
@@ -114,7 +119,8 @@ class TestingFarmResults(Resource):
         first, last = indices()
         # results have nothing other than ref in common, so it doesn't make sense to
         # merge them like copr builds
-        for tf_result in TFTTestRunTargetModel.get_range(first, last):
+        tf_results = list(TFTTestRunTargetModel.get_range(first, last, cursor(int)))
+        for tf_result in tf_results:
             result_dict = {
                 "packit_id": tf_result.id,
                 "pipeline_id": tf_result.pipeline_id,
@@ -137,7 +143,7 @@ class TestingFarmResults(Resource):
             result,
             status=HTTPStatus.PARTIAL_CONTENT,
         )
-        resp.headers["Content-Range"] = f"test-results {first + 1}-{last}/*"
+        set_range_headers(resp, "test-results", first, last, tf_results)
         return resp
 
 
@@ -11,17 +11,7 @@ from typing import Any
 from flask import request, escape, redirect, Response
 from flask_restx import Namespace, Resource
 
-from packit_service.models import (
-    CoprBuildGroupModel,
-    GitProjectModel,
-    ProjectEventModelType,
-    KojiBuildGroupModel,
-    SRPMBuildModel,
-    SyncReleaseModel,
-    TFTTestRunGroupModel,
-    VMImageBuildTargetModel,
-    get_usage_data,
-)
+from packit_service.models import get_usage_data
 from packit_service.service.api.utils import response_maker
 from packit_service.constants import (
     USAGE_DATE_IN_THE_PAST_STR,
@@ -259,62 +249,36 @@ def get_project_usage_data(project: str, datetime_from=None, datetime_to=None):
         position: 1
     ```
     """
+    usage_data = get_usage_data(datetime_from, datetime_to, top=None)
+
     jobs: dict[str, Any] = {}
-    for job_model in [
-        SRPMBuildModel,
-        CoprBuildGroupModel,
-        KojiBuildGroupModel,
-        VMImageBuildTargetModel,
-        TFTTestRunGroupModel,
-        SyncReleaseModel,
-    ]:
-        job_name: str = job_model.__tablename__  # type: ignore
+    for job_name, job_data in usage_data["jobs"].items():
         jobs[job_name] = get_result_dictionary(
             project,
-            top_projects=GitProjectModel.get_job_usage_numbers_all_project_events(
-                datetime_from=datetime_from,
-                datetime_to=datetime_to,
-                top=None,
-                job_result_model=job_model,
-            ),
+            top_projects=job_data["top_projects_by_job_runs"],
             count_name="job_runs",
         )
-
-        jobs[job_name]["per_event"] = {}
-        for project_event_type in ProjectEventModelType:
-            jobs[job_name]["per_event"][project_event_type.value] = (
-                get_result_dictionary(
-                    project,
-                    top_projects=GitProjectModel.get_job_usage_numbers(
-                        datetime_from=datetime_from,
-                        datetime_to=datetime_to,
-                        top=None,
-                        job_result_model=job_model,
-                        project_event_type=project_event_type,
-                    ),
-                    count_name="job_runs",
-                )
+        jobs[job_name]["per_event"] = {
+            project_event_type: get_result_dictionary(
+                project,
+                top_projects=data["top_projects_by_job_runs"],
+                count_name="job_runs",
             )
+            for project_event_type, data in job_data["per_event"].items()
+        }
 
     events_handled: dict[str, Any] = get_result_dictionary(
         project=project,
-        top_projects=GitProjectModel.get_active_projects_usage_numbers(
-            datetime_from=datetime_from, datetime_to=datetime_to, top=None
-        ),
+        top_projects=usage_data["active_projects"]["top_projects_by_events_handled"],
         count_name="events_handled",
     )
     events_handled["per_event"] = {
-        project_event_type.value: get_result_dictionary(
+        project_event_type: get_result_dictionary(
             project=project,
-            top_projects=GitProjectModel.get_project_event_usage_numbers(
-                datetime_from=datetime_from,
-                datetime_to=datetime_to,
-                top=None,
-                project_event_type=project_event_type,
-            ),
+            top_projects=data["top_projects"],
             count_name="events_handled",
         )
-        for project_event_type in ProjectEventModelType
+        for project_event_type, data in usage_data["events"].items()
     }
 
     return dict(
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 from http import HTTPStatus
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from flask.json import jsonify
 
@@ -21,6 +21,13 @@ from packit_service.models import (
     BodhiUpdateTargetModel,
     VMImageBuildTargetModel,
     AnityaProjectModel,
+    AbstractProjectObjectDbType,
+    AnityaVersionModel,
+    GitBranchModel,
+    IssueModel,
+    KojiBuildTagModel,
+    ProjectReleaseModel,
+    PullRequestModel,
 )
 
 
@@ -59,6 +66,50 @@ def get_project_info_from_build(
     return result_dict
 
 
+def get_project_info_from_project_event_object(
+    project_event_object: Optional[AbstractProjectObjectDbType],
+) -> Dict[str, Any]:
+    """
+    Same as `get_project_info_from_build`, but works with an already loaded
+    project event object and does not query the database (given the project
+    of the object has been loaded as well).
+    """
+    if not project_event_object or not (project := project_event_object.project):
+        return {}
+
+    branch_name = None
+    if isinstance(project_event_object, GitBranchModel):
+        branch_name = project_event_object.name
+    elif isinstance(project_event_object, KojiBuildTagModel):
+        branch_name = project_event_object.target
+
+    result_dict = {
+        "pr_id": (
+            project_event_object.pr_id
+            if isinstance(project_event_object, PullRequestModel)
+            else None
+        ),
+        "issue_id": (
+            project_event_object.issue_id
+            if isinstance(project_event_object, IssueModel)
+            else None
+        ),
+        "branch_name": branch_name,
+        "release": (
+            project_event_object.tag_name
+            if isinstance(project_event_object, ProjectReleaseModel)
+            else None
+        ),
+        "anitya_version": (
+            project_event_object.version
+            if isinstance(project_event_object, AnityaVersionModel)
+            else None
+        ),
+    }
+    result_dict.update(get_project_info(project))
+    return result_dict
+
+
 def get_sync_release_target_info(sync_release_model: SyncReleaseTargetModel):
     pr_model = sync_release_model.pull_request
     job_result_dict = {
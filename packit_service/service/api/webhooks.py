@@ -8,16 +8,23 @@ from hashlib import sha256
 from http import HTTPStatus
 from logging import getLogger
 from os import getenv
+from typing import Any, Optional, Union
 
 import jwt
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from ogr.parsing import parse_git_repo
+from packit.utils import nested_get
 from prometheus_client import Counter
 
 from packit_service.celerizer import celery_app
 from packit_service.config import ServiceConfig
-from packit_service.constants import CELERY_DEFAULT_MAIN_TASK_NAME, GITLAB_ISSUE
+from packit_service.constants import (
+    CELERY_DEFAULT_MAIN_TASK_NAME,
+    CELERY_EVENT_COMPRESSION,
+    GITLAB_ISSUE,
+)
+from packit_service.deduplication import EventDeduplicator, get_pr_head_from_webhook
 from packit_service.models import ProjectAuthenticationIssueModel
 from packit_service.service.api.errors import ValidationFailed
 
@@ -45,6 +52,237 @@ ping_payload_gitlab = ns.model(
     },
 )
 
+# Parts of the webhook payloads read by the parsers in Parser.MAPPING,
+# only these are sent to the workers. `True` keeps the whole value,
+# a dict keeps only the given keys of the value (of each item for lists).
+# Keep in sync with packit_service/worker/parser.py.
+_GITHUB_REPOSITORY = {
+    "name": True,
+    "full_name": True,
+    "html_url": True,
+    "owner": {"login": True},
+}
+_GITHUB_PR_REPO = {"name": True, "owner": {"login": True}}
+_GITLAB_PROJECT = {"name": True, "web_url": True}
+_GITLAB_PUSH = {
+    "object_kind": True,
+    "ref": True,
+    "before": True,
+    "after": True,
+    "checkout_sha": True,
+    "user_username": True,
+    "total_commits_count": True,
+    "commits": {"id": True, "title": True, "message": True},
+    "project": _GITLAB_PROJECT,
+}
+PAYLOAD_FIELDS = {
+    "github": {
+        "check_run": {
+            "action": True,
+            "check_run": {
+                "name": True,
+                "external_id": True,
+                "head_sha": True,
+                "app": {"slug": True},
+            },
+            "repository": _GITHUB_REPOSITORY,
+            "sender": {"login": True},
+        },
+        "pull_request": {
+            "action": True,
+            "number": True,
+            "pull_request": {
+                "head": {"sha": True, "repo": _GITHUB_PR_REPO},
+                "base": {"repo": _GITHUB_PR_REPO},
+                "user": {"login": True},
+            },
+            "repository": _GITHUB_REPOSITORY,
+        },
+        "issue_comment": {
+            "action": True,
+            "issue": {
+                "number": True,
+                "pull_request": True,
+                "user": {"login": True},
+            },
+            "comment": {"id": True, "body": True, "user": {"login": True}},
+            "repository": _GITHUB_REPOSITORY,
+        },
+        "release": {
+            "action": True,
+            "release": {"tag_name": True},
+            "repository": _GITHUB_REPOSITORY,
+        },
+        "push": {
+            "ref": True,
+            "before": True,
+            "after": True,
+            "head": True,
+            "head_commit": True,
+            "deleted": True,
+            "size": True,
+            "pusher": {"name": True},
+            "repository": _GITHUB_REPOSITORY,
+        },
+        "installation": {
+            "action": True,
+            "installation": {
+                "id": True,
+                "created_at": True,
+                "account": {"id": True, "login": True, "url": True, "type": True},
+            },
+            "repositories": {"full_name": True},
+            "sender": {"id": True, "login": True},
+        },
+    },
+    "gitlab": {
+        "Merge Request Hook": {
+            "object_kind": True,
+            "object_attributes": {
+                "id": True,
+                "iid": True,
+                "state": True,
+                "action": True,
+                "source": {"web_url": True},
+                "source_branch": True,
+                "target_branch": True,
+                "last_commit": {"id": True},
+                "oldrev": True,
+                "title": True,
+                "description": True,
+                "url": True,
+            },
+            "user": {"username": True},
+            "project": _GITLAB_PROJECT,
+        },
+        "Note Hook": {
+            "object_kind": True,
+            "object_attributes": {"id": True, "note": True, "action": True},
+            "merge_request": {
+                "id": True,
+                "iid": True,
+                "state": True,
+                "action": True,
+                "source": {"web_url": True},
+                "last_commit": {"id": True},
+            },
+            "issue": {"iid": True, "state": True},
+            "user": {"username": True},
+            "project": _GITLAB_PROJECT,
+        },
+        "Push Hook": _GITLAB_PUSH,
+        "Tag Push Hook": _GITLAB_PUSH,
+        "Pipeline Hook": {
+            "object_kind": True,
+            "object_attributes": {
+                "id": True,
+                "ref": True,
+                "sha": True,
+                "status": True,
+                "detailed_status": True,
+                "source": True,
+            },
+            "merge_request": {"url": True},
+            "project": _GITLAB_PROJECT,
+        },
+        "Release Hook": {
+            "object_kind": True,
+            "action": True,
+            "tag": True,
+            "commit": {"id": True},
+            "project": _GITLAB_PROJECT,
+        },
+    },
+}
+
+
+def slim_payload(payload: Any, fields: Union[bool, dict]) -> Any:
+    """
+    Keep only the given fields of the payload.
+
+    Args:
+        payload: Webhook payload or its part.
+        fields: Fields to keep, see PAYLOAD_FIELDS.
+
+    Returns:
+        Slimmed payload.
+    """
+    if fields is True:
+        return payload
+    if isinstance(payload, list):
+        return [slim_payload(item, fields) for item in payload]
+    if isinstance(payload, dict):
+        return {
+            key: slim_payload(payload[key], value)
+            for key, value in fields.items()
+            if key in payload
+        }
+    return payload
+
+
+def slim_event(event: dict, source: str, event_type: Optional[str]) -> dict:
+    """
+    Drop the parts of the webhook payload the workers do not need.
+
+    Payloads of unknown event types are returned unchanged, the workers
+    try all the parsers for them.
+    """
+    fields = nested_get(PAYLOAD_FIELDS, source, event_type)
+    return slim_payload(event, fields) if fields else event
+
+
+webhook_duplicate_deliveries = Counter(
+    "webhook_duplicate_deliveries",
+    "Number of webhook deliveries dropped because they were already accepted",
+    ["source", "process_id"],
+)
+
+
+def register_delivery(source: str, delivery_id: Optional[str]) -> bool:
+    """
+    Remember the webhook delivery.
+
+    Returns:
+        False if the same delivery was already accepted recently
+        and should be dropped.
+    """
+    deduplicator = EventDeduplicator(config.webhook_deduplication_window)
+    if deduplicator.register_delivery(delivery_id):
+        return True
+
+    logger.info(f"/webhooks/{source}: dropping duplicate delivery {delivery_id}.")
+    webhook_duplicate_deliveries.labels(source=source, process_id=os.getpid()).inc()
+    return False
+
+
+def unregister_delivery(delivery_id: Optional[str]) -> None:
+    """Forget the webhook delivery that couldn't be passed to the workers."""
+    EventDeduplicator(config.webhook_deduplication_window).unregister_delivery(
+        delivery_id
+    )
+
+
+def send_event_to_workers(event: dict, source: str, event_type: Optional[str]):
+    """
+    Send the slimmed and compressed webhook payload to the workers.
+
+    For new commits in pull requests the head commit is recorded first
+    so that the workers can skip the events for the superseded commits.
+    """
+    if pr_head := get_pr_head_from_webhook(event, source, event_type):
+        EventDeduplicator(config.webhook_deduplication_window).record_pr_head(*pr_head)
+
+    celery_app.send_task(
+        name=getenv("CELERY_MAIN_TASK_NAME") or CELERY_DEFAULT_MAIN_TASK_NAME,
+        kwargs={
+            "event": slim_event(event, source, event_type),
+            "source": source,
+            "event_type": event_type,
+        },
+        compression=CELERY_EVENT_COMPRESSION,
+    )
+
+
 github_webhook_calls = Counter(
     "github_webhook_calls",
     "Number of times the GitHub webhook is called",
@@ -94,14 +332,21 @@ class GithubWebhook(Resource):
             ).inc()
             return "Thanks but we don't care about this event", HTTPStatus.ACCEPTED
 
-        celery_app.send_task(
-            name=getenv("CELERY_MAIN_TASK_NAME") or CELERY_DEFAULT_MAIN_TASK_NAME,
-            kwargs={
-                "event": msg,
-                "source": "github",
-                "event_type": request.headers.get("X-GitHub-Event"),
-            },
-        )
+        delivery_id = request.headers.get("X-GitHub-Delivery")
+        if not register_delivery("github", delivery_id):
+            github_webhook_calls.labels(
+                result="duplicate", process_id=os.getpid()
+            ).inc()
+            return "Duplicate delivery, already accepted.", HTTPStatus.ACCEPTED
+
+        try:
+            send_event_to_workers(
+                msg, source="github", event_type=request.headers.get("X-GitHub-Event")
+            )
+        except Exception:
+            # GitHub redelivers the event with the same ID
+            unregister_delivery(delivery_id)
+            raise
         github_webhook_calls.labels(result="accepted", process_id=os.getpid()).inc()
 
         return "Webhook accepted. We thank you, Github.", HTTPStatus.ACCEPTED
@@ -197,14 +442,18 @@ class GitlabWebhook(Resource):
         if not self.interested():
             return "Thanks but we don't care about this event", HTTPStatus.ACCEPTED
 
-        celery_app.send_task(
-            name=getenv("CELERY_MAIN_TASK_NAME") or CELERY_DEFAULT_MAIN_TASK_NAME,
-            kwargs={
-                "event": msg,
-                "source": "gitlab",
-                "event_type": request.headers.get("X-Gitlab-Event"),
-            },
-        )
+        delivery_id = request.headers.get("X-Gitlab-Event-UUID")
+        if not register_delivery("gitlab", delivery_id):
+            return "Duplicate delivery, already accepted.", HTTPStatus.ACCEPTED
+
+        try:
+            send_event_to_workers(
+                msg, source="gitlab", event_type=request.headers.get("X-Gitlab-Event")
+            )
+        except Exception:
+            # GitLab redelivers the event with the same UUID
+            unregister_delivery(delivery_id)
+            raise
 
         return "Webhook accepted. We thank you, Gitlab.", HTTPStatus.ACCEPTED
 
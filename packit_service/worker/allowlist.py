@@ -12,6 +12,7 @@ from ogr.abstract import GitProject
 from packit.api import PackitAPI
 from packit.config.job_config import JobConfig, JobType
 from packit.exceptions import PackitException, PackitCommandFailedError
+from packit_service.cache import AllowlistIndex
 from packit_service.config import ServiceConfig
 from packit_service.constants import (
     FASJSON_URL,
@@ -47,6 +48,7 @@ from packit_service.worker.events.koji import KojiBuildEvent, KojiBuildTagEvent
 from packit_service.worker.events.new_hotness import NewHotnessUpdateEvent
 from packit_service.worker.helpers.build import CoprBuildJobHelper
 from packit_service.worker.helpers.testing_farm import TestingFarmJobHelper
+from packit_service.worker.kerberos import KerberosTicket
 from packit_service.worker.reporting import BaseCommitStatus
 
 logger = logging.getLogger(__name__)
@@ -66,6 +68,13 @@ UncheckedEvent = Union[
 
 
 class Allowlist:
+    # statuses of the namespaces and their parents are looked up in memory
+    index = AllowlistIndex(
+        load=lambda: (
+            (entry.namespace, entry.status) for entry in AllowlistModel.get_all()
+        )
+    )
+
     def __init__(self, service_config: ServiceConfig):
         self.service_config = service_config
 
@@ -94,9 +103,11 @@ class Allowlist:
         """
         try:
             logger.debug("Initialising Kerberos ticket so that we can use fasjson API.")
-            PackitAPI(
-                config=self.service_config, package_config=None
-            ).init_kerberos_ticket()
+            KerberosTicket.init(
+                PackitAPI(
+                    config=self.service_config, package_config=None
+                ).init_kerberos_ticket
+            )
         except PackitCommandFailedError as ex:
             msg = f"Kerberos authentication error: {ex.stderr_output}"
             logger.error(msg)
@@ -131,6 +142,7 @@ class Allowlist:
         # e.g. User not found
         except APIError as e:
             logger.debug(f"We were not able to get the user: {e}")
+            KerberosTicket.invalidate_on_auth_error(e)
             return False
 
         is_private = user_info.get("is_private")
@@ -191,17 +203,13 @@ class Allowlist:
         if not namespace:
             return False
 
-        separated_path = [namespace, None]
-        while len(separated_path) > 1:
-            if matching_namespace := AllowlistModel.get_namespace(separated_path[0]):
-                status = AllowlistStatus(matching_namespace.status)
-                if status != AllowlistStatus.waiting:
-                    return status in (
-                        AllowlistStatus.approved_automatically,
-                        AllowlistStatus.approved_manually,
-                    )
-
-            separated_path = separated_path[0].rsplit("/", 1)
+        for _, status in Allowlist.index.get_statuses(namespace):
+            status = AllowlistStatus(status)
+            if status != AllowlistStatus.waiting:
+                return status in (
+                    AllowlistStatus.approved_automatically,
+                    AllowlistStatus.approved_manually,
+                )
 
         logger.info(f"Could not find approved entry for: {namespace}")
         return False
@@ -221,23 +229,18 @@ class Allowlist:
         if not namespace:
             return False
 
-        separated_path = [namespace, None]
-        while len(separated_path) > 1:
-            if matching_namespace := AllowlistModel.get_namespace(separated_path[0]):
-                status = AllowlistStatus(matching_namespace.status)
-                if status == AllowlistStatus.denied:
-                    logger.info(f"Namespace {namespace} is denied.")
-                    return True
-
-            separated_path = separated_path[0].rsplit("/", 1)
+        for _, status in Allowlist.index.get_statuses(namespace):
+            if AllowlistStatus(status) == AllowlistStatus.denied:
+                logger.info(f"Namespace {namespace} is denied.")
+                return True
 
         logger.info(f"Could not find denied entry for: {namespace}")
         return False
 
     @staticmethod
     def is_denied(namespace: str) -> bool:
-        model = AllowlistModel.get_namespace(namespace)
-        return bool(model) and model.status == AllowlistStatus.denied
+        statuses = Allowlist.index.get_statuses(namespace)
+        return bool(statuses) and statuses[0] == (namespace, AllowlistStatus.denied)
 
     @staticmethod
     def remove_namespace(namespace: str) -> bool:
@@ -1,26 +1,119 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import tarfile
+import zlib
+from base64 import b64encode
 from datetime import timedelta
 from gzip import open as gzip_open
+from hashlib import md5
 from logging import getLogger, DEBUG, INFO
 from os import getenv
 from pathlib import Path
 from shutil import copyfileobj
+from subprocess import PIPE, Popen
+from tempfile import TemporaryDirectory, TemporaryFile
+from time import sleep
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
 
 from boto3 import client as boto3_client
 from botocore.exceptions import ClientError
+from sqlalchemy.orm import Query
 
+from packit.exceptions import PackitCommandFailedError, PackitException
 from packit.utils.commands import run_command
 from packit_service.constants import (
+    BACKUP_PART_SIZE,
+    BACKUP_READ_SIZE,
     SRPMBUILDS_OUTDATED_AFTER_DAYS,
     PACKAGE_CONFIGS_OUTDATED_AFTER_DAYS,
+    RETENTION_BATCH_PAUSE,
+    RETENTION_BATCH_SIZE,
+)
+from packit_service.models import (
+    get_pg_url,
+    PackageConfigModel,
+    SRPMBuildModel,
+    ProjectEventModel,
+    update_batch,
 )
-from packit_service.models import get_pg_url, SRPMBuildModel, ProjectEventModel
 
 logger = getLogger(__name__)
 
 DB_NAME = getenv("POSTGRESQL_DATABASE")
+BACKUP_BUCKET = f"arr-packit-{getenv('DEPLOYMENT', 'dev')}"
+
+
+class PackitBackupException(PackitException):
+    """The uploaded backup doesn't match the dumped data."""
+
+
+class RetentionJob(NamedTuple):
+    """Rows matched by the query are updated to the values or deleted if they're None."""
+
+    name: str
+    query: Callable[[], Query]
+    values: Optional[dict]
+
+
+def get_retention_setting(name: str, default):
+    return type(default)(getenv(name, default))
+
+
+def run_retention_job(
+    job: RetentionJob,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_BATCH_PAUSE,
+    dry_run: bool = False,
+) -> int:
+    """
+    Update (delete) the rows matched by the retention job in batches,
+    each of them is a single statement in its own transaction, so that
+    the locks are held and the WAL is written only for a bounded number
+    of rows at a time.
+
+    Args:
+        job: Retention job to run.
+        batch_size: Maximum number of rows updated by one statement.
+        pause: Number of seconds to wait between the batches.
+        dry_run: Only count the matching rows.
+
+    Returns:
+        Number of updated (deleted) rows, or of matching rows for the dry run.
+    """
+    if dry_run:
+        count = job.query().count()
+        logger.info(f"Dry run: {job.name} would affect {count} rows.")
+        return count
+
+    total = 0
+    while True:
+        count = update_batch(job.query(), job.values, batch_size)
+        total += count
+        logger.debug(f"{job.name}: {count} rows in the batch, {total} in total.")
+        if count < batch_size:
+            break
+        sleep(pause)
+
+    logger.info(f"{job.name}: {total} rows affected.")
+    return total
+
+
+def run_retention_jobs(jobs: Iterable[RetentionJob]) -> Dict[str, int]:
+    """
+    Run the retention jobs with the batch size, pause and dry run mode
+    set by the `RETENTION_BATCH_SIZE`, `RETENTION_BATCH_PAUSE`
+    and `RETENTION_DRY_RUN` environment variables.
+
+    Returns:
+        Number of rows affected by each of the jobs.
+    """
+    batch_size = get_retention_setting("RETENTION_BATCH_SIZE", RETENTION_BATCH_SIZE)
+    pause = get_retention_setting("RETENTION_BATCH_PAUSE", RETENTION_BATCH_PAUSE)
+    dry_run = getenv("RETENTION_DRY_RUN", "").lower() in ("1", "true", "yes")
+    return {
+        job.name: run_retention_job(job, batch_size, pause, dry_run) for job in jobs
+    }
 
 
 def discard_old_srpm_build_logs():
@@ -30,13 +123,15 @@ def discard_old_srpm_build_logs():
         "SRPMBUILDS_OUTDATED_AFTER_DAYS", SRPMBUILDS_OUTDATED_AFTER_DAYS
     )
     ago = timedelta(days=int(outdated_after_days))
-    for build in SRPMBuildModel.get_older_than(ago):
-        logger.debug(
-            f"SRPM build {build.id} is older than '{ago}'. "
-            "Discarding log and artifact url."
-        )
-        build.set_logs(None)
-        build.set_url(None)
+    run_retention_jobs(
+        [
+            RetentionJob(
+                name="Discarding logs and artifact URLs of old SRPM builds",
+                query=lambda: SRPMBuildModel.get_older_than(ago),
+                values={"logs": None, "url": None},
+            )
+        ]
+    )
 
 
 def discard_old_package_configs():
@@ -46,12 +141,22 @@ def discard_old_package_configs():
         "PACKAGE_CONFIGS_OUTDATED_AFTER_DAYS", PACKAGE_CONFIGS_OUTDATED_AFTER_DAYS
     )
     ago = timedelta(days=int(outdated_after_days))
-    for event in ProjectEventModel.get_older_than_with_packages_config(ago):
-        logger.debug(
-            f"ProjectEventModel {event.id} has all runs older than '{ago}'. "
-            "Discarding package config."
-        )
-        event.set_packages_config(None)
+    run_retention_jobs(
+        [
+            RetentionJob(
+                name="Discarding package configs of old project events",
+                query=lambda: ProjectEventModel.get_older_than_with_packages_config(
+                    ago
+                ),
+                values={"packages_config_hash": None},
+            ),
+            RetentionJob(
+                name="Deleting package configs no longer used by any event",
+                query=PackageConfigModel.get_unreferenced,
+                values=None,
+            ),
+        ]
+    )
 
 
 def gzip_file(file: Path) -> Path:
@@ -76,9 +181,7 @@ def gzip_file(file: Path) -> Path:
     return compressed_file
 
 
-def upload_to_s3(
-    file: Path, bucket: str = f"arr-packit-{getenv('DEPLOYMENT', 'dev')}"
-) -> None:
+def upload_to_s3(file: Path, bucket: str = BACKUP_BUCKET) -> None:
     """Upload a file to an S3 bucket.
 
     Args:
@@ -100,7 +203,105 @@ def is_aws_configured() -> bool:
     return bool(getenv("AWS_ACCESS_KEY_ID") and getenv("AWS_SECRET_ACCESS_KEY"))
 
 
-def dump_to(file: Path):
+class S3MultipartUpload:
+    """
+    Multipart upload of a stream of data to S3.
+
+    The written data are buffered and uploaded in parts of the given size,
+    so the memory needed doesn't depend on the size of the uploaded object.
+    The upload is aborted if the context is left with an exception,
+    otherwise it's completed and the ETag of the object is verified against
+    the MD5 checksums of the uploaded parts.
+    """
+
+    def __init__(
+        self, s3_client, bucket: str, key: str, part_size: int = BACKUP_PART_SIZE
+    ):
+        """
+        Args:
+            s3_client: boto3 S3 client.
+            bucket: Bucket to upload to.
+            key: Key of the uploaded object.
+            part_size: Size of the uploaded parts in bytes,
+                S3 requires at least 5 MiB for all the parts but the last one.
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.upload_id: Optional[str] = None
+        self.buffer = bytearray()
+        self.parts: List[dict] = []
+        self.checksums: List[bytes] = []
+
+    def __enter__(self) -> "S3MultipartUpload":
+        logger.info(f"Starting upload of {self.key} to S3 ({self.bucket})")
+        self.upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket, Key=self.key
+        )["UploadId"]
+        return self
+
+    def write(self, data: bytes) -> int:
+        self.buffer.extend(data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[: self.part_size]))
+            del self.buffer[: self.part_size]
+        return len(data)
+
+    def _upload_part(self, data: bytes) -> None:
+        checksum = md5(data).digest()
+        part_number = len(self.parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data,
+            # S3 rejects the part if it doesn't match
+            ContentMD5=b64encode(checksum).decode(),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.checksums.append(checksum)
+        logger.debug(f"Uploaded part {part_number} of {self.key}")
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type:
+            logger.error(f"Aborting upload of {self.key}: {exc_value!r}")
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            return
+
+        if self.buffer or not self.parts:
+            self._upload_part(bytes(self.buffer))
+            self.buffer.clear()
+        response = self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+        # ETag of a multipart object is the MD5 of the MD5s of its parts
+        expected_etag = (
+            f'"{md5(b"".join(self.checksums)).hexdigest()}-{len(self.checksums)}"'
+        )
+        if response["ETag"] != expected_etag:
+            raise PackitBackupException(
+                f"Uploaded {self.key} has ETag {response['ETag']}, "
+                f"expected {expected_etag}."
+            )
+        logger.info(f"Uploaded {self.key} in {len(self.parts)} parts")
+
+
+def get_pg_dump_command(*args: str) -> List[str]:
+    # We have to specify libpq connection string to be able to pass the
+    # password to the pg_dump. Luckily get_pg_url() does almost what we need.
+    pg_connection = get_pg_url().replace("+psycopg2", "")
+    return ["pg_dump", *args, f"--dbname={pg_connection}"]
+
+
+def dump_to(file: Path, *args: str):
     """Dump 'packit' database into a file.
 
     To restore db from this file, run:
@@ -108,13 +309,11 @@ def dump_to(file: Path):
 
     Args:
         file: File where to put the dump.
+        args: Additional arguments of pg_dump, e.g. the format.
     Raises:
         PackitCommandFailedError: When pg_dump fails.
     """
-    # We have to specify libpq connection string to be able to pass the
-    # password to the pg_dump. Luckily get_pg_url() does almost what we need.
-    pg_connection = get_pg_url().replace("+psycopg2", "")
-    cmd = ["pg_dump", f"--file={file}", f"--dbname={pg_connection}"]
+    cmd = get_pg_dump_command(f"--file={file}", *args)
     packit_logger = getLogger("packit")
     was_debug = packit_logger.level == DEBUG
 
@@ -129,14 +328,82 @@ def dump_to(file: Path):
             packit_logger.setLevel(DEBUG)
 
 
+def stream_gzipped_output(
+    cmd: List[str], upload: S3MultipartUpload, read_size: int = BACKUP_READ_SIZE
+) -> None:
+    """
+    Compress the output of the command on the fly and write it to the upload.
+
+    The pipe blocks the command while a part is being uploaded,
+    so only a bounded amount of the output is held in the memory.
+
+    Raises:
+        PackitCommandFailedError: When the command fails.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    with TemporaryFile() as stderr:
+        with Popen(cmd, stdout=PIPE, stderr=stderr) as process:
+            while chunk := process.stdout.read(read_size):
+                upload.write(compressor.compress(chunk))
+        if process.returncode:
+            stderr.seek(0)
+            # don't include the command, it contains the password
+            raise PackitCommandFailedError(
+                f"{cmd[0]} failed with exit code {process.returncode}",
+                stdout_output="",
+                stderr_output=stderr.read(),
+            )
+    upload.write(compressor.flush())
+
+
+def stream_backup_to_s3(key: str, jobs: int = 1, bucket: str = BACKUP_BUCKET) -> None:
+    """
+    Dump the database and upload it to S3 without storing the whole dump
+    on the disk.
+
+    Args:
+        key: Key of the uploaded object.
+        jobs: Number of tables dumped in parallel. With more than one job,
+            the dump is created in the directory format (which pg_dump needs
+            for parallel dumps) in a temporary directory and its gzipped tarball
+            is streamed to S3. Otherwise the plain SQL output of pg_dump is gzipped
+            and streamed to S3 directly.
+        bucket: Bucket to upload to.
+    """
+    with S3MultipartUpload(boto3_client("s3"), bucket, key) as upload:
+        if jobs <= 1:
+            logger.info(f"Streaming '{DB_NAME}' database backup to S3")
+            stream_gzipped_output(get_pg_dump_command(), upload)
+            return
+
+        with TemporaryDirectory() as tmp:
+            directory = Path(tmp) / "dump"
+            dump_to(directory, "--format=directory", f"--jobs={jobs}")
+            with tarfile.open(fileobj=upload, mode="w|gz") as tar:
+                tar.add(directory, arcname=directory.name)
+
+
 def backup():
-    """Dump the 'packit' database into a file, compress and upload to S3."""
+    """Dump the 'packit' database, compress it and upload to S3.
+
+    By default the dump is streamed to S3, set `DATABASE_BACKUP_STREAMING`
+    to `false` to dump it into a file first and `DATABASE_BACKUP_JOBS`
+    to the number of tables dumped in parallel.
+    """
     if not is_aws_configured():
         logger.info("Not backing up database since AWS is not configured.")
         # probably dev/test deployment
         return
 
     project = getenv("PROJECT", "packit")
+    if getenv("DATABASE_BACKUP_STREAMING", "true").lower() != "false":
+        jobs = int(getenv("DATABASE_BACKUP_JOBS", 1))
+        extension = "tar.gz" if jobs > 1 else "sql.gz"
+        logger.info("About to backup database")
+        stream_backup_to_s3(f"{project}_database_{DB_NAME}.{extension}", jobs=jobs)
+        logger.info("Backup complete")
+        return
+
     file = Path(f"/tmp/{project}_database_{DB_NAME}.sql")
     compressed_file = None
     try:
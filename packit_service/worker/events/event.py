@@ -5,16 +5,22 @@
 Generic/abstract event classes.
 """
 import copy
+import enum
+import threading
 from datetime import datetime, timezone
+from functools import wraps
 from logging import getLogger
-from typing import Dict, Optional, Type, Union, Set, List
+from typing import Any, Callable, Dict, Optional, Type, Union, Set, List
 
+from cachetools import LRUCache, cached
 from ogr.abstract import GitProject, PullRequest
 from ogr.parsing import RepoUrl
 from packit.config import JobConfigTriggerType, PackageConfig
 from packit_service.config import PackageConfigGetter, ServiceConfig
+from packit_service.constants import STORED_PACKAGES_CONFIG_CACHE_SIZE
 from packit_service.models import (
     AbstractProjectObjectDbType,
+    PackageConfigModel,
     ProjectEventModel,
     CoprBuildTargetModel,
     TFTTestRunTargetModel,
@@ -28,6 +34,22 @@ logger = getLogger(__name__)
 MAP_EVENT_TO_JOB_CONFIG_TRIGGER_TYPE: Dict[Type["Event"], JobConfigTriggerType] = {}
 
 
+@cached(
+    cache=LRUCache(maxsize=STORED_PACKAGES_CONFIG_CACHE_SIZE), lock=threading.Lock()
+)
+def get_stored_packages_config(packages_config_hash: str) -> Optional[PackageConfig]:
+    """
+    Get the packages config stored by a project event.
+
+    The stored configs are addressed by the hash of their content, so they
+    never change and each of them is loaded and decoded only once per process.
+    """
+    stored_config = PackageConfigModel.get_by_hash(packages_config_hash)
+    if not (stored_config and stored_config.config):
+        return None
+    return PackageConfig.get_from_dict_without_setting_defaults(stored_config.config)
+
+
 def use_for_job_config_trigger(trigger_type: JobConfigTriggerType):
     """
     [class decorator]
@@ -290,8 +312,11 @@ class EventData:
         return self._db_project_event
 
     def get_dict(self) -> dict:
-        d = self.__dict__
-        d = copy.deepcopy(d)
+        d = {
+            k: copy_serializable(v)
+            for k, v in self.__dict__.items()
+            if k not in ("_project", "_db_project_object", "_db_project_event")
+        }
         task_accepted_time = d.get("task_accepted_time")
         d["task_accepted_time"] = (
             int(task_accepted_time.timestamp()) if task_accepted_time else None
@@ -302,9 +327,6 @@ class EventData:
             d["tests_targets_override"] = list(self.tests_targets_override)
         if self.branches_override:
             d["branches_override"] = list(self.branches_override)
-        d.pop("_project", None)
-        d.pop("_db_project_object", None)
-        d.pop("_db_project_event", None)
         return d
 
     def get_project(self) -> Optional[GitProject]:
@@ -316,10 +338,72 @@ class EventData:
         )
 
 
+# values which don't need to be copied when serializing the events
+IMMUTABLE_TYPES = (str, int, float, bool, type(None), enum.Enum, datetime)
+
+
+def copy_serializable(value: Any) -> Any:
+    """
+    Copy the value of an event attribute, so that the serialized event
+    doesn't share the mutable values with the event.
+
+    The attributes are mostly primitives and containers of them coming from
+    the JSON payloads, so only the containers are copied. Anything else
+    falls back to `copy.deepcopy`.
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {k: copy_serializable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return type(value)(copy_serializable(v) for v in value)
+    return copy.deepcopy(value)
+
+
+def cache_dict(get_dict: Callable) -> Callable:
+    """
+    Cache the result of `get_dict()` until an attribute of the event is set.
+
+    The serialization of the whole event (including all the overrides
+    of the subclasses, which call each other via `super()`) runs only once,
+    further calls return a copy of the cached dictionary.
+    """
+
+    @wraps(get_dict)
+    def wrapper(self: "Event", default_dict: Optional[Dict] = None) -> dict:
+        if default_dict is not None or self.__dict__.get("_serializing"):
+            # called by an override in a subclass
+            return get_dict(self, default_dict)
+
+        serialized = self.__dict__.get("_serialized")
+        if serialized is None:
+            # bypass __setattr__, these don't change the event
+            self.__dict__["_serializing"] = True
+            try:
+                serialized = get_dict(self)
+            finally:
+                self.__dict__.pop("_serializing")
+            self.__dict__["_serialized"] = serialized
+        return copy_serializable(serialized)
+
+    return wrapper
+
+
 class Event:
     task_accepted_time: Optional[datetime] = None
     actor: Optional[str]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "get_dict" in vars(cls):
+            cls.get_dict = cache_dict(vars(cls)["get_dict"])
+
+    def __setattr__(self, name: str, value: Any):
+        # the attributes have to be set, not modified in place,
+        # for the change to get to the serialized event
+        self.__dict__["_serialized"] = None
+        super().__setattr__(name, value)
+
     def __init__(self, created_at: Union[int, float, str] = None):
         self.created_at: datetime
         if created_at:
@@ -346,7 +430,7 @@ class Event:
         This method will copy everything from dict except the specified
         non serializable keys.
         """
-        return {k: copy.deepcopy(v) for k, v in d.items() if k not in skip}
+        return {k: copy_serializable(v) for k, v in d.items() if k not in skip}
 
     def store_packages_config(self):
         """
@@ -368,6 +452,8 @@ class Event:
 
     def get_non_serializable_attributes(self):
         return [
+            "_serialized",
+            "_serializing",
             "_db_project_object",
             "_db_project_event",
             "_project",
@@ -375,6 +461,7 @@ class Event:
             "_package_config",
         ]
 
+    @cache_dict
     def get_dict(self, default_dict: Optional[Dict] = None) -> dict:
         d = default_dict or self.__dict__
         # whole dict has to be JSON serializable because of redis
@@ -631,9 +718,11 @@ class AbstractResultEvent(AbstractForgeIndependentEvent):
     """
 
     def get_packages_config(self) -> Optional[PackageConfig]:
-        if self.db_project_event and (
-            db_config := self.db_project_event.packages_config
+        if (
+            self.db_project_event
+            and (config_hash := self.db_project_event.packages_config_hash)
+            and (packages_config := get_stored_packages_config(config_hash))
         ):
             logger.debug("Getting packages config from DB.")
-            return PackageConfig.get_from_dict_without_setting_defaults(db_config)
+            return packages_config
         return super().get_packages_config()
@@ -9,6 +9,7 @@ import logging
 import shutil
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from os import getenv
 from pathlib import Path
 from typing import Dict, Optional, Set, Type, Tuple
@@ -19,6 +20,7 @@ from celery.canvas import Signature
 from ogr.abstract import GitProject
 from packit.config import JobConfig, JobType, PackageConfig
 from packit.constants import DATETIME_FORMAT
+from packit_service.cache import task_payloads
 from packit_service.config import ServiceConfig
 
 from packit_service.models import (
@@ -50,6 +52,42 @@ MAP_COMMENT_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = defaultdict(set)
 MAP_CHECK_PREFIX_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = defaultdict(set)
 
 
+@lru_cache(maxsize=None)
+def get_handlers_for_job_type(
+    event_kls: Type["Event"], job_type: JobType
+) -> Tuple[Tuple[Type["JobHandler"], ...], Tuple[Type["JobHandler"], ...]]:
+    """
+    Get the handlers reacting to the events of the given class
+    that can run the jobs of the given type.
+
+    This is an index of the mappings filled by the decorators below, computed
+    once for each event class and job type, the decorators clear it.
+
+    Returns:
+        Tuple of the handlers configured as the job type and of the handlers
+        the job type requires, both sorted by the name of the handler.
+    """
+
+    def matching(handlers: Set[Type["JobHandler"]]):
+        return tuple(
+            sorted(
+                (
+                    handler
+                    for handler in handlers
+                    if issubclass(
+                        event_kls, tuple(SUPPORTED_EVENTS_FOR_HANDLER.get(handler, ()))
+                    )
+                ),
+                key=lambda handler: handler.__name__,
+            )
+        )
+
+    return (
+        matching(MAP_JOB_TYPE_TO_HANDLER.get(job_type, set())),
+        matching(MAP_REQUIRED_JOB_TYPE_TO_HANDLER.get(job_type, set())),
+    )
+
+
 def configured_as(job_type: JobType):
     """
     [class decorator]
@@ -78,6 +116,7 @@ def configured_as(job_type: JobType):
 
     def _add_to_mapping(kls: Type["JobHandler"]):
         MAP_JOB_TYPE_TO_HANDLER[job_type].add(kls)
+        get_handlers_for_job_type.cache_clear()
         return kls
 
     return _add_to_mapping
@@ -102,6 +141,7 @@ def reacts_to(event: Type["Event"]):
 
     def _add_to_mapping(kls: Type["JobHandler"]):
         SUPPORTED_EVENTS_FOR_HANDLER[kls].add(event)
+        get_handlers_for_job_type.cache_clear()
         return kls
 
     return _add_to_mapping
@@ -354,16 +394,25 @@ class JobHandler(Handler):
         :param job: job to process
         """
         logger.debug(f"Getting signature of a Celery task {cls.task_name}.")
+        package_config = dump_package_config(
+            event.packages_config.get_package_config_for(job)
+            if event.packages_config
+            else None
+        )
+        event_dict = event.get_dict()
+        if getenv("CELERY_PAYLOADS_BY_REFERENCE", "").lower() in ("1", "true", "yes"):
+            # the tasks of the event share the payloads, pass just the references
+            # which are resolved by the worker, see TaskWithRetry
+            event_dict = task_payloads.put(event_dict)
+            if package_config:
+                package_config = task_payloads.put(package_config)
+
         return signature(
             cls.task_name.value,
             kwargs={
-                "package_config": dump_package_config(
-                    event.packages_config.get_package_config_for(job)
-                    if event.packages_config
-                    else None
-                ),
+                "package_config": package_config,
                 "job_config": dump_job_config(job),
-                "event": event.get_dict(),
+                "event": event_dict,
             },
         )
 
@@ -13,7 +13,7 @@ from functools import partial
 from os import getenv
 from typing import Dict, Optional, Set, Tuple, Type, List, ClassVar
 
-from celery import Task
+from celery import Task, group, signature
 
 from ogr.abstract import PullRequest, AuthMethod
 from ogr.services.github import GithubService
@@ -54,6 +54,8 @@ from packit_service.service.urls import (
     get_pull_from_upstream_info_url,
 )
 from packit_service.utils import (
+    dump_job_config,
+    dump_package_config,
     gather_packit_logs_to_buffer,
     collect_packit_logs,
     get_packit_commands_from_comment,
@@ -99,6 +101,7 @@ from packit_service.worker.helpers.sync_release.pull_from_upstream import (
     PullFromUpstreamHelper,
 )
 from packit_service.worker.helpers.sync_release.sync_release import SyncReleaseHelper
+from packit_service.worker.kerberos import KerberosTicket
 from packit_service.worker.mixin import (
     Config,
     LocalProjectMixin,
@@ -216,6 +219,7 @@ class AbstractSyncReleaseHandler(
         event: dict,
         celery_task: Task,
         sync_release_run_id: Optional[int] = None,
+        branch: Optional[str] = None,
     ):
         super().__init__(
             package_config=package_config,
@@ -225,6 +229,8 @@ class AbstractSyncReleaseHandler(
         )
         self._project_url = self.data.project_url
         self._sync_release_run_id = sync_release_run_id
+        # run only for this branch of the sync release run (in parallel mode)
+        self._branch = branch
         self.helper: Optional[SyncReleaseHelper] = None
 
     @property
@@ -449,19 +455,54 @@ class AbstractSyncReleaseHandler(
         # no error occurred
         return None
 
+    def run_in_parallel(self, sync_release_run_model: SyncReleaseModel) -> TaskResults:
+        """
+        Run sync-release for each target in a separate task, the task processing
+        the last target reports the errors of the whole run.
+        """
+        branches = [
+            target.branch for target in sync_release_run_model.sync_release_targets
+        ]
+        logger.debug(
+            f"Running {self.job_config.type} for branches {branches} in parallel."
+        )
+        group(
+            [
+                signature(
+                    self.task_name.value,
+                    kwargs={
+                        "package_config": dump_package_config(self.package_config),
+                        "job_config": dump_job_config(self.job_config),
+                        "event": self.data.event_dict,
+                        "sync_release_run_id": sync_release_run_model.id,
+                        "branch": branch,
+                    },
+                )
+                for branch in branches
+            ]
+        ).apply_async()
+        return TaskResults(
+            success=True,
+            details={"msg": f"{self.sync_release_job_type} split to {branches}."},
+        )
+
     def run(self) -> TaskResults:
         """
         Sync the upstream release to dist-git as a pull request.
         """
         errors = {}
         sync_release_run_model = self._get_or_create_sync_release_run()
-        branches_to_run = [
-            target.branch for target in sync_release_run_model.sync_release_targets
-        ]
+        targets = sync_release_run_model.sync_release_targets
+        if self._branch:
+            targets = [target for target in targets if target.branch == self._branch]
+        elif self.service_config.parallel_sync_release and len(targets) > 1:
+            return self.run_in_parallel(sync_release_run_model)
+
+        branches_to_run = [target.branch for target in targets]
         logger.debug(f"Branches to run {self.job_config.type}: {branches_to_run}")
 
         try:
-            for model in sync_release_run_model.sync_release_targets:
+            for model in targets:
                 if error := self.run_for_target(sync_release_run_model, model):
                     errors[model.branch] = error
         except AbortSyncRelease:
@@ -470,16 +511,27 @@ class AbstractSyncReleaseHandler(
                 "we were not able yet to download the archive. "
             )
 
-            for model in sync_release_run_model.sync_release_targets:
+            for model in targets:
                 model.set_status(status=SyncReleaseTargetStatus.retry)
 
-            self.sync_release_helper.report_status_to_all(
-                description=f"{self.job_name_for_reporting.capitalize()} is "
+            description = (
+                f"{self.job_name_for_reporting.capitalize()} is "
                 f"being retried because "
-                "we were not able yet to download the archive. ",
-                state=BaseCommitStatus.pending,
-                url="",
+                "we were not able yet to download the archive. "
             )
+            if self._branch:
+                self.sync_release_helper.report_status_for_branch(
+                    branch=self._branch,
+                    description=description,
+                    state=BaseCommitStatus.pending,
+                    url="",
+                )
+            else:
+                self.sync_release_helper.report_status_to_all(
+                    description=description,
+                    state=BaseCommitStatus.pending,
+                    url="",
+                )
 
             return TaskResults(
                 success=True,  # do not create a Sentry issue
@@ -492,39 +544,45 @@ class AbstractSyncReleaseHandler(
             # 3. it's not being cleaned up and it wastes pod's filesystem space
             shutil.rmtree(self.packit_api.dg.local_project.working_dir)
 
+        if self._branch:
+            # the other targets are processed by other tasks
+            targets = sync_release_run_model.get_current_targets()
+            if any(
+                target.status
+                in (
+                    SyncReleaseTargetStatus.queued,
+                    SyncReleaseTargetStatus.running,
+                    SyncReleaseTargetStatus.retry,
+                )
+                for target in targets
+            ):
+                logger.debug("Leaving the reporting to the task of the last branch.")
+                return TaskResults(
+                    success=not errors, details={"errors": errors} if errors else {}
+                )
+
         models_with_errors = [
             target
-            for target in sync_release_run_model.sync_release_targets
+            for target in targets
             if target.status == SyncReleaseTargetStatus.error
         ]
+        status = (
+            SyncReleaseStatus.error
+            if models_with_errors
+            else SyncReleaseStatus.finished
+        )
+        if self._branch:
+            # only one of the tasks finishing at the same time reports the errors
+            finished_by_us = sync_release_run_model.set_status_if_running(status)
+        else:
+            sync_release_run_model.set_status(status=status)
+            finished_by_us = True
 
         if models_with_errors:
-            branch_errors = ""
-            for model in sorted(models_with_errors, key=lambda model: model.branch):
-                dashboard_url = self.get_dashboard_url(model.id)
-                branch_errors += (
-                    "<tr>"
-                    f"<td><code>{model.branch}</code></td>"
-                    f'<td>See <a href="{dashboard_url}">{dashboard_url}</a></td>'
-                    "</tr>\n"
+            if finished_by_us:
+                self._report_errors_for_each_branch(
+                    self.get_errors_message(models_with_errors)
                 )
-            branch_errors += "</table>\n"
-
-            body_msg = MSG_DOWNSTREAM_JOB_ERROR_HEADER.format(
-                object="pull-requests",
-                dist_git_url=self.packit_api.dg.local_project.git_url,
-            )
-            body_msg += f"{branch_errors}\n\n"
-
-            if self.task_name == TaskName.pull_from_upstream:
-                body_msg += MSG_RETRIGGER_DISTGIT.format(
-                    job="pull_from_upstream",
-                    packit_comment_command_prefix=self.service_config.comment_command_prefix,
-                    command="pull-from-upstream",
-                )
-
-            self._report_errors_for_each_branch(body_msg)
-            sync_release_run_model.set_status(status=SyncReleaseStatus.error)
             return TaskResults(
                 success=False,
                 details={
@@ -533,9 +591,37 @@ class AbstractSyncReleaseHandler(
                 },
             )
 
-        sync_release_run_model.set_status(status=SyncReleaseStatus.finished)
         return TaskResults(success=True, details={})
 
+    def get_errors_message(
+        self, models_with_errors: List[SyncReleaseTargetModel]
+    ) -> str:
+        """Message listing the branches the sync-release failed for."""
+        branch_errors = ""
+        for model in sorted(models_with_errors, key=lambda model: model.branch):
+            dashboard_url = self.get_dashboard_url(model.id)
+            branch_errors += (
+                "<tr>"
+                f"<td><code>{model.branch}</code></td>"
+                f'<td>See <a href="{dashboard_url}">{dashboard_url}</a></td>'
+                "</tr>\n"
+            )
+        branch_errors += "</table>\n"
+
+        body_msg = MSG_DOWNSTREAM_JOB_ERROR_HEADER.format(
+            object="pull-requests",
+            dist_git_url=self.packit_api.dg.local_project.git_url,
+        )
+        body_msg += f"{branch_errors}\n\n"
+
+        if self.task_name == TaskName.pull_from_upstream:
+            body_msg += MSG_RETRIGGER_DISTGIT.format(
+                job="pull_from_upstream",
+                packit_comment_command_prefix=self.service_config.comment_command_prefix,
+                command="pull-from-upstream",
+            )
+        return body_msg
+
     def _report_errors_for_each_branch(self, message: str):
         raise NotImplementedError("Use subclass.")
 
@@ -585,6 +671,7 @@ class ProposeDownstreamHandler(AbstractSyncReleaseHandler):
         event: dict,
         celery_task: Task,
         sync_release_run_id: Optional[int] = None,
+        branch: Optional[str] = None,
     ):
         super().__init__(
             package_config=package_config,
@@ -592,6 +679,7 @@ class ProposeDownstreamHandler(AbstractSyncReleaseHandler):
             event=event,
             celery_task=celery_task,
             sync_release_run_id=sync_release_run_id,
+            branch=branch,
         )
 
     @staticmethod
@@ -647,6 +735,7 @@ class PullFromUpstreamHandler(AbstractSyncReleaseHandler):
         event: dict,
         celery_task: Task,
         sync_release_run_id: Optional[int] = None,
+        branch: Optional[str] = None,
     ):
         super().__init__(
             package_config=package_config,
@@ -654,6 +743,7 @@ class PullFromUpstreamHandler(AbstractSyncReleaseHandler):
             event=event,
             celery_task=celery_task,
             sync_release_run_id=sync_release_run_id,
+            branch=branch,
         )
         if self.data.event_type in (PullRequestCommentPagureEvent.__name__,):
             # use upstream project URL when retriggering from dist-git PR
@@ -801,43 +891,90 @@ class AbstractDownstreamKojiBuildHandler(
     def get_branches(self) -> List[str]:
         """Get a list of branch (names) to be built in koji"""
 
-    def is_already_triggered(self, branch: str) -> bool:
+    def get_builds_info(self, nvrs: List[str]) -> Dict[str, Optional[dict]]:
         """
-        Check if the build was already triggered
-        (building or completed state).
+        Get information about the builds from Koji in a single multicall.
+
+        Args:
+            nvrs: NVRs of the builds.
+
+        Returns:
+            Dictionary with the build information (or None if there is no such
+            build or the lookup failed) for each NVR.
+        """
+        if not nvrs:
+            return {}
+        try:
+            with self.koji_helper.session.multicall() as multicall:
+                calls = {nvr: multicall.getBuild(nvr) for nvr in nvrs}
+        except Exception as ex:
+            logger.debug(f"Failed to get info of builds {nvrs} from Koji: {ex}")
+            return {nvr: None for nvr in nvrs}
+
+        builds = {}
+        for nvr, call in calls.items():
+            try:
+                builds[nvr] = call.result
+            except Exception as ex:
+                logger.debug(f"Failed to get build info of {nvr} from Koji: {ex}")
+                builds[nvr] = None
+        return builds
+
+    def get_already_triggered_branches(self, branches: List[str]) -> Set[str]:
         """
-        nvr = self.packit_api.dg.get_nvr(branch)
-        existing_build = self.koji_helper.get_build_info(nvr)
+        Get the branches the build was already triggered for
+        (building or completed state).
 
-        if existing_build:
-            raw_state = existing_build["state"]
-            if (state := KojiBuildState.from_number(raw_state)) in (
+        The NVRs of all the branches are computed first, then their builds
+        are looked up in Koji at once.
+        """
+        if not branches:
+            return set()
+        nvrs = {branch: self.packit_api.dg.get_nvr(branch) for branch in branches}
+        builds = self.get_builds_info(sorted(set(nvrs.values())))
+
+        triggered = set()
+        for branch, nvr in nvrs.items():
+            if not (existing_build := builds.get(nvr)):
+                continue
+            if (state := KojiBuildState.from_number(existing_build["state"])) in (
                 KojiBuildState.building,
                 KojiBuildState.complete,
             ):
                 logger.debug(
                     f"Koji build with matching NVR ({nvr}) found with state {state}"
                 )
-                return True
+                triggered.add(branch)
 
-        return False
+        return triggered
 
     def run(self) -> TaskResults:
         errors = {}
 
         group = self._get_or_create_koji_group_model()
+        # skip submitting build for a branch if we already did that (even if it failed)
+        koji_build_models = []
         for koji_build_model in group.grouped_targets:
-            branch = koji_build_model.target
-
-            # skip submitting build for a branch if we already did that (even if it failed)
             if koji_build_model.status not in ["queued", "pending", "retry"]:
                 logger.debug(
-                    f"Skipping downstream Koji build for branch {branch} "
-                    f"that was already processed."
+                    f"Skipping downstream Koji build for branch "
+                    f"{koji_build_model.target} that was already processed."
                 )
                 continue
+            koji_build_models.append(koji_build_model)
 
-            if not self.job_config.scratch and self.is_already_triggered(branch):
+        already_triggered = (
+            set()
+            if self.job_config.scratch
+            else self.get_already_triggered_branches(
+                [model.target for model in koji_build_models]
+            )
+        )
+
+        for koji_build_model in koji_build_models:
+            branch = koji_build_model.target
+
+            if branch in already_triggered:
                 logger.info(
                     f"Skipping downstream Koji build for branch {branch} "
                     f"that was already triggered."
@@ -852,7 +989,7 @@ class AbstractDownstreamKojiBuildHandler(
                 sidetag = None
                 if self.job_config.sidetag_group:
                     # we need Kerberos ticket to create a new sidetag
-                    self.packit_api.init_kerberos_ticket()
+                    KerberosTicket.init(self.packit_api.init_kerberos_ticket)
                     sidetag = SidetagHelper.get_or_create_sidetag(
                         self.job_config.sidetag_group, branch
                     )
@@ -881,6 +1018,8 @@ class AbstractDownstreamKojiBuildHandler(
                     koji_build_model.set_task_id(str(task_id))
                     koji_build_model.set_web_url(web_url)
             except PackitException as ex:
+                # the retry needs a new ticket
+                KerberosTicket.invalidate_on_auth_error(ex)
                 if self.celery_task and not self.celery_task.is_last_try():
                     kargs = self.celery_task.task.request.kwargs.copy()
                     kargs["koji_group_model_id"] = group.id
@@ -1089,9 +1228,14 @@ class TagIntoSidetagHandler(
     def run_for_branch(self, package: str, sidetag_group: str, branch: str) -> None:
         # we need Kerberos ticket to tag a build into sidetag
         # and to create a new sidetag (if needed)
-        self.packit_api.init_kerberos_ticket()
-        sidetag = SidetagHelper.get_or_create_sidetag(sidetag_group, branch)
-        sidetag.tag_latest_stable_build(package)
+        KerberosTicket.init(self.packit_api.init_kerberos_ticket)
+        try:
+            sidetag = SidetagHelper.get_or_create_sidetag(sidetag_group, branch)
+            sidetag.tag_latest_stable_build(package)
+        except PackitException as ex:
+            # the retry needs a new ticket
+            KerberosTicket.invalidate_on_auth_error(ex)
+            raise
 
     def run(self) -> TaskResults:
         comment = self.data.event_dict.get("comment")
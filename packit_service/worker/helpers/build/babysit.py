@@ -3,22 +3,32 @@
 
 import collections
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from requests import HTTPError
 from datetime import datetime, timezone
-from typing import Iterable, Type, Any
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Any
+from urllib.parse import urlparse
 
 import copr.v3
 import requests
 from copr.v3 import Client as CoprClient
+from packit.constants import HTTP_REQUEST_TIMEOUT
 
+from packit_service.config import ServiceConfig
 from packit_service.constants import (
     COPR_API_FAIL_STATE,
     COPR_API_SUCC_STATE,
     COPR_SUCC_STATE,
     COPR_FAIL_STATE,
     COPR_SRPM_CHROOT,
+    COPR_BABYSIT_BACKOFF_FACTOR,
+    COPR_BABYSIT_CONCURRENCY,
+    COPR_BABYSIT_MAX_CHECK_INTERVAL,
     TESTING_FARM_API_URL,
+    TESTING_FARM_BABYSIT_BATCH_SIZE,
     DEFAULT_JOB_TIMEOUT,
 )
 from packit_service.models import (
@@ -49,23 +59,171 @@ from packit_service.worker.handlers import (
 )
 from packit_service.worker.handlers.copr import AbstractCoprBuildReportHandler
 from packit_service.worker.jobs import SteveJobs
+from packit_service.worker.monitoring import Pushgateway
 from packit_service.worker.parser import Parser
 
 logger = logging.getLogger(__name__)
 
+TESTING_FARM_NOT_COMPLETED = (
+    TestingFarmResult.new,
+    TestingFarmResult.queued,
+    TestingFarmResult.running,
+)
+
+
+class RateLimiter:
+    """
+    Limits the number of requests per second sent to a single host.
+
+    Thread-safe, so it can be shared by the workers of a thread pool.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        """
+        Block until a request to the host of the given URL can be sent.
+
+        Args:
+            url: URL the request is going to be sent to.
+        """
+        if not self.interval:
+            return
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TestingFarmRunsPoller:
+    """
+    Obtains the state of Testing Farm pipelines concurrently.
+
+    Requests are sent from a thread pool sharing one pooled HTTP session
+    and are rate-limited per host. Validators (ETag/Last-Modified) of
+    the responses are remembered across sweeps, so a pipeline that did not
+    change since the last check costs only a 304 response.
+
+    The database is not touched from the worker threads, only the pipeline IDs
+    are passed to them.
+    """
+
+    __test__ = False
+
+    # pipeline ID -> (ETag, Last-Modified, details)
+    _cache: Dict[str, Tuple[Optional[str], Optional[str], dict]] = {}
+
+    def __init__(self, concurrency: int, rate_limit: float) -> None:
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.session = requests.session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.concurrency, max_retries=3
+        )
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def forget_other_pipelines(cls, pipeline_ids: Iterable[str]) -> None:
+        """
+        Drop the cached responses of pipelines which are not pending anymore.
+
+        Args:
+            pipeline_ids: IDs of the pipelines still being checked.
+        """
+        pending = set(pipeline_ids)
+        for pipeline_id in list(cls._cache):
+            if pipeline_id not in pending:
+                del cls._cache[pipeline_id]
+
+    def get_details(self, pipeline_id: str) -> Optional[dict]:
+        """
+        Get the details of the pipeline from the TF API.
+
+        Args:
+            pipeline_id: ID of the TF pipeline.
+
+        Returns:
+            Details of the pipeline or None if they could not be obtained.
+        """
+        url = f"{TESTING_FARM_API_URL}requests/{pipeline_id}"
+        headers = {}
+        cached = self._cache.get(pipeline_id)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        self.rate_limiter.wait(url)
+        try:
+            response = self.session.get(
+                url, headers=headers, timeout=HTTP_REQUEST_TIMEOUT
+            )
+        except requests.exceptions.RequestException as ex:
+            logger.info(
+                f"Failed to obtain state of TF pipeline {pipeline_id}: {ex}. "
+                "Let's try again later."
+            )
+            return None
+
+        if cached and response.status_code == 304:
+            logger.debug(f"TF pipeline {pipeline_id} has not changed.")
+            return cached[2]
+
+        if not response.ok:
+            logger.info(
+                f"Failed to obtain state of TF pipeline {pipeline_id}. "
+                f"Status code {response.status_code}. Reason: {response.reason}. "
+                "Let's try again later."
+            )
+            return None
+
+        details = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._cache[pipeline_id] = (etag, last_modified, details)
+        return details
+
+    def get_details_for(self, pipeline_ids: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Get the details of the given pipelines concurrently.
+
+        Args:
+            pipeline_ids: IDs of the TF pipelines.
+
+        Returns:
+            Mapping of pipeline IDs to their details (None for failures).
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return dict(zip(pipeline_ids, executor.map(self.get_details, pipeline_ids)))
+
 
 def check_pending_testing_farm_runs() -> None:
-    """Checks the status of pending TFT runs and updates it if needed."""
+    """
+    Checks the status of pending TFT runs and updates it if needed.
+
+    The runs are polled in batches, the TF API is queried concurrently within
+    a batch and the runs which have finished are updated before moving
+    to the next batch.
+    """
     logger.info("Getting pending TFT runs from DB")
+    sweep_start = time.monotonic()
     current_time = datetime.now(timezone.utc)
-    not_completed = (
-        TestingFarmResult.new,
-        TestingFarmResult.queued,
-        TestingFarmResult.running,
+    pending_test_runs = TFTTestRunTargetModel.get_all_by_status(
+        *TESTING_FARM_NOT_COMPLETED
     )
-    pending_test_runs = TFTTestRunTargetModel.get_all_by_status(*not_completed)
+
+    runs_to_check = []
     for run in pending_test_runs:
-        logger.debug(f"Checking status of TF pipeline {run.pipeline_id}")
         # .submitted_time can be None, we'll set it later
         if run.submitted_time:
             elapsed = elapsed_seconds(begin=run.submitted_time, end=current_time)
@@ -77,54 +235,85 @@ def check_pending_testing_farm_runs() -> None:
                 )
                 run.set_status(TestingFarmResult.error)
                 continue
-        run_url = f"{TESTING_FARM_API_URL}requests/{run.pipeline_id}"
-        response = requests.get(run_url)
-        if not response.ok:
-            logger.info(
-                f"Failed to obtain state of TF pipeline {run.pipeline_id}. "
-                f"Status code {response.status_code}. Reason: {response.reason}. "
-                "Let's try again later."
-            )
-            continue
+        runs_to_check.append(run)
 
-        details = response.json()
-        (
-            project_url,
-            ref,
-            result,
-            summary,
-            copr_build_id,
-            copr_chroot,
-            compose,
-            log_url,
-            created,
-            identifier,
-        ) = Parser.parse_data_from_testing_farm(run, details)
-
-        logger.debug(f"Result for the TF pipeline {run.pipeline_id} is {result}.")
-        if result in not_completed:
-            logger.debug("Skip updating a pipeline which is not yet completed.")
-            continue
-        event = TestingFarmResultsEvent(
-            pipeline_id=details["id"],
-            result=result,
-            compose=compose,
-            summary=summary,
-            log_url=log_url,
-            copr_build_id=copr_build_id,
-            copr_chroot=copr_chroot,
-            commit_sha=ref,
-            project_url=project_url,
-            created=created,
-            identifier=identifier,
+    if not runs_to_check:
+        return
+
+    service_config = ServiceConfig.get_service_config()
+    poller = TestingFarmRunsPoller(
+        concurrency=service_config.testing_farm_babysit_concurrency,
+        rate_limit=service_config.testing_farm_babysit_rate_limit,
+    )
+    TestingFarmRunsPoller.forget_other_pipelines(
+        run.pipeline_id for run in runs_to_check
+    )
+
+    for start in range(0, len(runs_to_check), TESTING_FARM_BABYSIT_BATCH_SIZE):
+        end = start + TESTING_FARM_BABYSIT_BATCH_SIZE
+        batch = runs_to_check[start:end]
+        logger.debug(f"Checking status of {len(batch)} TF pipelines.")
+        details = poller.get_details_for([run.pipeline_id for run in batch])
+        for run in batch:
+            if run_details := details[run.pipeline_id]:
+                process_testing_farm_run_details(run, run_details)
+    poller.session.close()
+
+    duration = time.monotonic() - sweep_start
+    logger.info(f"Checked {len(runs_to_check)} TF pipelines in {duration:.1f}s.")
+    pushgateway = Pushgateway()
+    pushgateway.tft_babysit_sweep_duration.observe(duration)
+    pushgateway.tft_babysit_pipelines_checked.inc(len(runs_to_check))
+    if duration:
+        pushgateway.tft_babysit_pipelines_per_second.set(len(runs_to_check) / duration)
+    pushgateway.push()
+
+
+def process_testing_farm_run_details(run: TFTTestRunTargetModel, details: dict):
+    """
+    Updates the TF run if the details obtained from the TF API say it has finished.
+
+    Args:
+        run: Model of the TF run.
+        details: Details of the pipeline from the TF API.
+    """
+    (
+        project_url,
+        ref,
+        result,
+        summary,
+        copr_build_id,
+        copr_chroot,
+        compose,
+        log_url,
+        created,
+        identifier,
+    ) = Parser.parse_data_from_testing_farm(run, details)
+
+    logger.debug(f"Result for the TF pipeline {run.pipeline_id} is {result}.")
+    if result in TESTING_FARM_NOT_COMPLETED:
+        logger.debug("Skip updating a pipeline which is not yet completed.")
+        return
+    event = TestingFarmResultsEvent(
+        pipeline_id=details["id"],
+        result=result,
+        compose=compose,
+        summary=summary,
+        log_url=log_url,
+        copr_build_id=copr_build_id,
+        copr_chroot=copr_chroot,
+        commit_sha=ref,
+        project_url=project_url,
+        created=created,
+        identifier=identifier,
+    )
+    try:
+        update_testing_farm_run(event, run)
+    except Exception as ex:
+        logger.debug(
+            f"There was an exception when updating the Testing farm run "
+            f"with pipeline ID {run.pipeline_id}: {ex}"
         )
-        try:
-            update_testing_farm_run(event, run)
-        except Exception as ex:
-            logger.debug(
-                f"There was an exception when updating the Testing farm run "
-                f"with pipeline ID {run.pipeline_id}: {ex}"
-            )
 
 
 def update_testing_farm_run(event: TestingFarmResultsEvent, run: TFTTestRunTargetModel):
@@ -157,16 +346,208 @@ def update_testing_farm_run(event: TestingFarmResultsEvent, run: TFTTestRunTarge
             handler.run_job()
 
 
+class CoprBuildsBackend:
+    """
+    Access to the Copr API used when babysitting Copr builds.
+
+    All the requests go through a single Copr client (and its HTTP session).
+    Tests can replace it with a fake implementation.
+    """
+
+    def __init__(self, client: Optional[CoprClient] = None) -> None:
+        self._client = client
+
+    @property
+    def client(self) -> CoprClient:
+        if not self._client:
+            self._client = CoprClient.create_from_config_file()
+        return self._client
+
+    def get_build(self, build_id: int) -> Any:
+        return self.client.build_proxy.get(build_id)
+
+    def get_build_chroot(self, build_id: int, chroot: str) -> Any:
+        return self.client.build_chroot_proxy.get(build_id, chroot)
+
+    def get_build_chroots(self, build_id: int) -> Dict[str, Any]:
+        return {
+            chroot.name: chroot
+            for chroot in self.client.build_chroot_proxy.get_list(build_id)
+        }
+
+    def get_source_chroot(self, build_id: int) -> Any:
+        return self.client.build_proxy.get_source_chroot(build_id)
+
+
+class CoprBuildState(NamedTuple):
+    """
+    State of a Copr build obtained from the Copr API.
+
+    `build` is None if the build is no longer available in Copr.
+    """
+
+    build: Any
+    chroots: Dict[str, Any]
+
+    @property
+    def fingerprint(self) -> str:
+        """State of the whole build and of all its chroots as a single string."""
+        chroot_states = ",".join(
+            f"{name}={chroot.state}" for name, chroot in sorted(self.chroots.items())
+        )
+        return f"{self.build.state};{chroot_states}"
+
+
+class CoprBuildsUpdate(NamedTuple):
+    # whether all the updates went through
+    succeeded: bool
+    # whether the build has ended, i.e. doesn't need to be checked anymore
+    ended: bool
+
+
+class CoprBuildsSweep:
+    """
+    Checks the state of pending Copr builds.
+
+    The state of the builds is fetched from Copr concurrently, only the Copr build
+    IDs are passed to the worker threads, the database is used from the caller's
+    thread. Builds which have not changed since the last check are skipped and
+    older builds are checked less often than the fresh ones.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CoprBuildsBackend] = None,
+        concurrency: int = COPR_BABYSIT_CONCURRENCY,
+    ) -> None:
+        self.backend = backend or CoprBuildsBackend()
+        self.concurrency = max(concurrency, 1)
+
+    @staticmethod
+    def is_check_due(builds: List[CoprBuildTargetModel], now: datetime) -> bool:
+        """
+        Decide whether the Copr build should be checked in this sweep.
+
+        The interval between the checks grows with the age of the build
+        (a fraction of the time since submission), up to a maximum.
+        """
+        checked_times = [build.status_checked_time for build in builds]
+        if None in checked_times:
+            return True
+
+        age = elapsed_seconds(begin=builds[0].build_submitted_time, end=now)
+        interval = min(
+            age / COPR_BABYSIT_BACKOFF_FACTOR, COPR_BABYSIT_MAX_CHECK_INTERVAL
+        )
+        since_check = elapsed_seconds(begin=min(checked_times), end=now)
+        # the sweeps do not run exactly an hour apart, leave some margin
+        return since_check >= 0.9 * interval
+
+    @staticmethod
+    def is_timed_out(builds: List[CoprBuildTargetModel], now: datetime) -> bool:
+        return any(
+            elapsed_seconds(begin=build.build_submitted_time, end=now)
+            > DEFAULT_JOB_TIMEOUT
+            for build in builds
+        )
+
+    def fetch(self, build_id: int) -> Optional[CoprBuildState]:
+        """
+        Fetch the state of the build and all its chroots.
+
+        Returns:
+            State of the build or None if it could not be obtained.
+        """
+        try:
+            build_copr = self.backend.get_build(build_id)
+        except copr.v3.CoprNoResultException:
+            return CoprBuildState(build=None, chroots={})
+        except Exception as ex:
+            logger.info(f"Failed to obtain state of Copr build {build_id}: {ex}")
+            return None
+
+        if not build_copr.ended_on and not build_copr.started_on:
+            return CoprBuildState(build=build_copr, chroots={})
+
+        try:
+            chroots = self.backend.get_build_chroots(build_id)
+        except Exception as ex:
+            logger.info(
+                f"Failed to obtain state of chroots of Copr build {build_id}: {ex}"
+            )
+            return None
+        return CoprBuildState(build=build_copr, chroots=chroots)
+
+    def run(self, pending_builds: Iterable[CoprBuildTargetModel]) -> None:
+        current_time = datetime.now(timezone.utc)
+        builds_grouped_by_id: Dict[int, List[CoprBuildTargetModel]] = (
+            collections.defaultdict(list)
+        )
+        for build in pending_builds:
+            # our DB uses str(build_id) but our code expects int(build_id)
+            builds_grouped_by_id[int(build.build_id)].append(build)
+
+        due = {
+            build_id: builds
+            for build_id, builds in builds_grouped_by_id.items()
+            if self.is_check_due(builds, current_time)
+        }
+        logger.info(
+            f"Checking {len(due)} out of {len(builds_grouped_by_id)} "
+            "pending Copr builds."
+        )
+        if not due:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            states = dict(zip(due, executor.map(self.fetch, due)))
+
+        for build_id, builds in due.items():
+            state = states[build_id]
+            if state is None:
+                continue
+
+            # builds running for too long are not skipped so that they time out
+            if (
+                state.build
+                and state.chroots
+                and not state.build.ended_on
+                and not self.is_timed_out(builds, current_time)
+            ):
+                fingerprint = state.fingerprint
+                if all(
+                    build.status_checked_copr_state == fingerprint for build in builds
+                ):
+                    logger.debug(f"Copr build {build_id} has not changed, skipping.")
+                    CoprBuildTargetModel.set_status_checked(
+                        build_id, fingerprint, current_time
+                    )
+                    continue
+
+            result = try_update_copr_builds(
+                build_id,
+                builds,
+                backend=self.backend,
+                build_copr=state.build,
+                chroot_builds=state.chroots,
+            )
+            if state.build and state.chroots:
+                # a failed update needs to be retried even if the state doesn't change
+                CoprBuildTargetModel.set_status_checked(
+                    build_id,
+                    state.fingerprint if result.succeeded else None,
+                    current_time,
+                )
+
+
 def check_pending_copr_builds() -> None:
     """Checks the status of pending copr builds and updates it if needed."""
+    start = time.monotonic()
     pending_copr_builds = CoprBuildTargetModel.get_all_by_status(BuildStatus.pending)
-    builds_grouped_by_id = collections.defaultdict(list)
-    for build in pending_copr_builds:
-        # our DB uses str(build_id) but our code expects int(build_id)
-        builds_grouped_by_id[int(build.build_id)].append(build)
-
-    for build_id, builds in builds_grouped_by_id.items():
-        update_copr_builds(build_id, builds)
+    CoprBuildsSweep().run(pending_copr_builds)
+    logger.info(
+        f"Checking of pending Copr builds took {time.monotonic() - start:.1f}s."
+    )
 
 
 def check_copr_build(build_id: int) -> bool:
@@ -189,7 +570,37 @@ def check_copr_build(build_id: int) -> bool:
     return update_copr_builds(build_id, builds)
 
 
-def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"]) -> bool:
+def update_copr_builds(
+    build_id: int,
+    builds: Iterable["CoprBuildTargetModel"],
+    backend: Optional[CoprBuildsBackend] = None,
+    build_copr: Any = None,
+    chroot_builds: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Updates the state of copr builds, see `try_update_copr_builds`.
+
+    Returns:
+        Whether the run was successful and the build has ended,
+        False signals the need to retry again.
+    """
+    result = try_update_copr_builds(
+        build_id,
+        builds,
+        backend=backend,
+        build_copr=build_copr,
+        chroot_builds=chroot_builds,
+    )
+    return result.succeeded and result.ended
+
+
+def try_update_copr_builds(
+    build_id: int,
+    builds: Iterable["CoprBuildTargetModel"],
+    backend: Optional[CoprBuildsBackend] = None,
+    build_copr: Any = None,
+    chroot_builds: Optional[Dict[str, Any]] = None,
+) -> CoprBuildsUpdate:
     """
     Updates the state of copr builds.
 
@@ -202,14 +613,19 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
     Args:
         build_id: ID of the copr build to update.
         builds: List of builds corresponding to the given ``build_id``.
+        backend: Access to the Copr API, a new one is created if not given.
+        build_copr: Data of the whole copr build if already obtained
+            from the copr API.
+        chroot_builds: Data of the build chroots (by chroot name) if already
+            obtained from the copr API.
 
     Returns:
-        Whether the run was successful and the build has ended,
-        False signals the need to retry again.
+        Whether the updates went through and whether the build has ended.
     """
-    copr_client = CoprClient.create_from_config_file()
+    backend = backend or CoprBuildsBackend()
     try:
-        build_copr = copr_client.build_proxy.get(build_id)
+        if build_copr is None:
+            build_copr = backend.get_build(build_id)
     except copr.v3.CoprNoResultException:
         logger.info(
             f"Copr build {build_id} no longer available. Setting it to error status and "
@@ -217,11 +633,11 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
         )
         for build in builds:
             build.set_status(BuildStatus.error)
-        return True
+        return CoprBuildsUpdate(succeeded=True, ended=True)
 
     if not build_copr.ended_on and not build_copr.started_on:
         logger.info(f"The copr build {build_id} has not started yet.")
-        return False
+        return CoprBuildsUpdate(succeeded=True, ended=False)
 
     logger.info(f"The status of {build_id} is {build_copr.state!r}.")
 
@@ -229,7 +645,7 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
         srpm_build := SRPMBuildModel.get_by_copr_build_id(build_id)
     ) and srpm_build.status == BuildStatus.pending:
         try:
-            build_copr_srpm = copr_client.build_proxy.get_source_chroot(build_id)
+            build_copr_srpm = backend.get_source_chroot(build_id)
         except copr.v3.CoprNoResultException:
             logger.info(
                 f"SRPM build of Copr build {build_id} no longer available. "
@@ -244,7 +660,7 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
                     f"There was an exception when updating the SRPM build of"
                     f" Copr build {build_id}: {ex}"
                 )
-                return False
+                return CoprBuildsUpdate(succeeded=False, ended=False)
 
     current_time = datetime.now(timezone.utc)
     for build in builds:
@@ -264,7 +680,14 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
             )
             continue
         try:
-            chroot_build = copr_client.build_chroot_proxy.get(build_id, build.target)
+            if chroot_builds:
+                chroot_build = chroot_builds.get(build.target)
+                if not chroot_build:
+                    raise copr.v3.CoprNoResultException(
+                        f"Chroot {build.target} not found."
+                    )
+            else:
+                chroot_build = backend.get_build_chroot(build_id, build.target)
         except copr.v3.CoprNoResultException:
             logger.info(
                 f"Copr build {build_id} for {build.target} no longer available. "
@@ -279,9 +702,9 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
                 f"There was an exception when updating the Copr build {build_id} for"
                 f" {build.target}: {ex}"
             )
-            return False
+            return CoprBuildsUpdate(succeeded=False, ended=False)
     # Builds which we ran CoprBuildStartHandler for still need to be monitored.
-    return bool(build_copr.ended_on)
+    return CoprBuildsUpdate(succeeded=True, ended=bool(build_copr.ended_on))
 
 
 def update_srpm_build_state(
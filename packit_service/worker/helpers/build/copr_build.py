@@ -4,7 +4,7 @@
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Set, Tuple
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from copr.v3 import CoprAuthException, CoprRequestException
 from copr.v3.exceptions import CoprTimeoutException
@@ -25,6 +25,7 @@ from packit.exceptions import (
 )
 from packit.utils.source_script import create_source_script
 from packit_service import sentry_integration
+from packit_service.cache import catalogs
 from packit_service.celerizer import celery_app
 from packit_service.config import ServiceConfig
 from packit_service.constants import (
@@ -359,18 +360,23 @@ class CoprBuildJobHelper(BaseBuildJobHelper):
         return test_target
 
     @property
-    def available_chroots(self) -> Set[str]:
+    def available_chroots(self) -> FrozenSet[str]:
         """
         Returns set of available COPR targets.
         """
-        return {
-            *filter(
-                lambda chroot: not chroot.startswith("_"),
-                self.api.copr_helper.get_copr_client()
-                .mock_chroot_proxy.get_list()
-                .keys(),
-            )
-        }
+
+        def fetch() -> Set[str]:
+            return {
+                *filter(
+                    lambda chroot: not chroot.startswith("_"),
+                    self.api.copr_helper.get_copr_client()
+                    .mock_chroot_proxy.get_list()
+                    .keys(),
+                )
+            }
+
+        # the exceptions of the fetch are raised, so there is always a catalog
+        return catalogs.get("copr-chroots", fetch) or frozenset()
 
     def is_custom_copr_project_defined(self) -> bool:
         return (
@@ -25,6 +25,7 @@ from packit_service.service.urls import (
 from packit_service.utils import get_koji_task_id_and_url_from_stdout
 from packit_service.worker.events import EventData
 from packit_service.worker.helpers.build.build_helper import BaseBuildJobHelper
+from packit_service.worker.kerberos import KerberosTicket
 from packit_service.worker.reporting import BaseCommitStatus
 from packit_service.worker.result import TaskResults
 
@@ -108,7 +109,7 @@ class KojiBuildJobHelper(BaseBuildJobHelper):
         try:
             # We need to do it manually
             # because we don't use PackitAPI.build, but PackitAPI.up.koji_build
-            self.api.init_kerberos_ticket()
+            KerberosTicket.init(self.api.init_kerberos_ticket)
         except PackitCommandFailedError as ex:
             msg = f"Kerberos authentication error: {ex.stderr_output}"
             logger.error(msg)
@@ -216,6 +217,7 @@ class KojiBuildJobHelper(BaseBuildJobHelper):
                 f"\t stdout: {ex.stdout_output}\n"
                 f"\t stderr: {ex.stderr_output}\n"
             )
+            KerberosTicket.invalidate_on_auth_error(ex)
             raise
 
         if not out:
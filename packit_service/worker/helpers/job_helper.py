@@ -18,7 +18,6 @@ from packit.local_project import (
     CALCULATE,
     NOT_TO_CALCULATE,
 )
-from packit.utils.repo import RepositoryCache
 from packit_service.config import Deployment, ServiceConfig
 from packit_service.models import (
     PipelineModel,
@@ -28,6 +27,7 @@ from packit_service.models import (
 from packit_service.worker.events import EventData
 from packit_service.worker.monitoring import Pushgateway
 from packit_service.worker.reporting import StatusReporter, BaseCommitStatus
+from packit_service.worker.repository_cache import get_repository_cache
 
 logger = logging.getLogger(__name__)
 
@@ -86,14 +86,7 @@ class BaseJobHelper:
     def local_project(self) -> LocalProject:
         if self._local_project is None:
             builder = LocalProjectBuilder(
-                cache=(
-                    RepositoryCache(
-                        cache_path=self.service_config.repository_cache,
-                        add_new=self.service_config.add_repositories_to_repository_cache,
-                    )
-                    if self.service_config.repository_cache
-                    else None
-                ),
+                cache=get_repository_cache(self.service_config),
             )
             self._local_project = builder.build(
                 git_project=self.project,
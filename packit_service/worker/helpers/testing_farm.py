@@ -3,8 +3,9 @@
 
 import logging
 import re
+from functools import lru_cache
 from re import Pattern
-from typing import Dict, Any, Optional, Set, List, Union, Tuple, Callable
+from typing import Dict, Any, Optional, Set, List, Union, Tuple, Callable, FrozenSet
 
 import requests
 
@@ -14,6 +15,7 @@ from packit.config import JobConfig, PackageConfig
 from packit.exceptions import PackitConfigException, PackitException
 from packit.utils import nested_get
 from packit.constants import HTTP_REQUEST_TIMEOUT
+from packit_service.cache import catalogs
 from packit_service.config import ServiceConfig
 from packit_service.constants import (
     CONTACTS_URL,
@@ -55,6 +57,15 @@ from packit_service.worker.result import TaskResults
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def compile_composes(composes: FrozenSet[str]) -> FrozenSet[Pattern]:
+    """
+    Compile the composes, which can be regular expressions, once per catalog
+    instead of once per target.
+    """
+    return frozenset(re.compile(compose) for compose in composes)
+
+
 class CommentArguments:
     """
     Parse arguments from trigger comment and provide the attributes to Testing Farm helper.
@@ -326,7 +337,7 @@ class TestingFarmJobHelper(CoprBuildJobHelper):
         return self._copr_builds_from_other_pr
 
     @property
-    def available_composes(self) -> Optional[Set[str]]:
+    def available_composes(self) -> Optional[FrozenSet[str]]:
         """
         Fetches available composes from the Testing Farm endpoint.
 
@@ -337,12 +348,15 @@ class TestingFarmJobHelper(CoprBuildJobHelper):
             f"composes/{'redhat' if self.job_config.use_internal_tf else 'public'}"
         )
 
-        response = self.send_testing_farm_request(endpoint=endpoint)
-        if response.status_code != 200:
-            return None
+        def fetch() -> Optional[Set[str]]:
+            response = self.send_testing_farm_request(endpoint=endpoint)
+            if response.status_code != 200:
+                return None
+
+            # {'composes': [{'name': 'CentOS-Stream-8'}, {'name': 'Fedora-Rawhide'}]}
+            return {c["name"] for c in response.json()["composes"]}
 
-        # {'composes': [{'name': 'CentOS-Stream-8'}, {'name': 'Fedora-Rawhide'}]}
-        return {c["name"] for c in response.json()["composes"]}
+        return catalogs.get(f"testing-farm:{self.tft_api_url}{endpoint}", fetch)
 
     @staticmethod
     def _artifact(
@@ -646,7 +660,9 @@ class TestingFarmJobHelper(CoprBuildJobHelper):
             return False
 
     @staticmethod
-    def is_compose_matching(compose_to_check: str, composes: Set[Pattern]) -> bool:
+    def is_compose_matching(
+        compose_to_check: str, composes: FrozenSet[Pattern]
+    ) -> bool:
         """
         Check whether the compose matches any compose in the list of re-compiled
         composes.
@@ -677,7 +693,7 @@ class TestingFarmJobHelper(CoprBuildJobHelper):
             )
             return None
 
-        compiled_composes = {re.compile(compose) for compose in composes}
+        compiled_composes = compile_composes(frozenset(composes))
         distro, arch = target.rsplit("-", 1)
 
         # if the user precisely specified the compose via target
@@ -729,7 +745,7 @@ class TestingFarmJobHelper(CoprBuildJobHelper):
         if not self.is_compose_matching(compose, compiled_composes):
             msg = (
                 f"The compose {compose} (from target {distro}) does not match any compose"
-                f" in the list of available composes:\n{composes}. "
+                f" in the list of available composes:\n{set(composes)}. "
             )
             logger.debug(msg)
             msg += (
@@ -5,10 +5,11 @@
 We love you, Steve Jobs.
 """
 import logging
+from collections import defaultdict
 from datetime import datetime
 from functools import cached_property
 from re import match
-from typing import List, Set, Type, Tuple
+from typing import Dict, List, Set, Type, Tuple
 from typing import Optional, Union, Callable
 
 import celery
@@ -16,7 +17,9 @@ import celery
 from ogr.exceptions import GithubAppNotInstalledError
 from packit.config import JobConfig, JobConfigView, JobType, JobConfigTriggerType
 from packit.config.job_config import DEPRECATED_JOB_TYPES
+from packit.schema import JobConfigSchema
 from packit.utils import nested_get
+from packit_service.cache import task_payloads
 from packit_service.config import PackageConfig, PackageConfigGetter, ServiceConfig
 from packit_service.constants import (
     DOCS_CONFIGURATION_URL,
@@ -24,6 +27,7 @@ from packit_service.constants import (
     COMMENT_REACTION,
     PACKIT_VERIFY_FAS_COMMAND,
 )
+from packit_service.deduplication import EventDeduplicator
 from packit_service.utils import (
     get_packit_commands_from_comment,
     elapsed_seconds,
@@ -37,6 +41,8 @@ from packit_service.worker.events import (
     InstallationEvent,
     CheckRerunEvent,
     IssueCommentEvent,
+    MergeRequestGitlabEvent,
+    PullRequestGithubEvent,
 )
 from packit_service.worker.events.comment import (
     AbstractCommentEvent,
@@ -58,6 +64,7 @@ from packit_service.worker.handlers import (
 )
 from packit_service.worker.handlers.abstract import (
     JobHandler,
+    get_handlers_for_job_type,
     MAP_COMMENT_TO_HANDLER,
     MAP_JOB_TYPE_TO_HANDLER,
     MAP_REQUIRED_JOB_TYPE_TO_HANDLER,
@@ -178,13 +185,43 @@ class SteveJobs:
             cls.pushgateway.events_not_handled.inc()
         elif pre_check_failed := not event_object.pre_check():
             cls.pushgateway.events_pre_check_failed.inc()
+        elif superseded := cls(event_object).is_superseded():
+            cls.pushgateway.events_superseded.inc()
         cls.pushgateway.push()
 
-        if event_not_handled or pre_check_failed:
+        if event_not_handled or pre_check_failed or superseded:
             return []
 
         return cls(event_object).process()
 
+    def is_superseded(self) -> bool:
+        """
+        Check whether the event is for a pull request commit which was already
+        superseded by a newer push, the handlers then don't need to run for it
+        since the results would be outdated immediately.
+
+        Returns:
+            True if a newer commit was pushed to the pull request recently.
+        """
+        if not isinstance(
+            self.event, (PullRequestGithubEvent, MergeRequestGitlabEvent)
+        ):
+            return False
+
+        deduplicator = EventDeduplicator(
+            self.service_config.webhook_deduplication_window
+        )
+        if not deduplicator.is_superseded(
+            self.event.project_url, self.event.pr_id, self.event.commit_sha
+        ):
+            return False
+
+        logger.info(
+            f"Commit {self.event.commit_sha} of {self.event.project_url} "
+            f"PR#{self.event.pr_id} was superseded by a newer push, skipping."
+        )
+        return True
+
     def process(self) -> List[TaskResults]:
         """
         Processes the event object attribute of SteveJobs - runs the checks for
@@ -448,9 +485,9 @@ class SteveJobs:
                 )
             ]
 
-        handler_classes = self.get_handlers_for_event()
+        handlers_and_configs = self.get_handlers_and_configs()
 
-        if not handler_classes:
+        if not handlers_and_configs:
             logger.debug(
                 f"There is no handler for {self.event} event suitable for the configuration."
             )
@@ -460,13 +497,7 @@ class SteveJobs:
         processing_results: List[TaskResults] = []
 
         statuses_check_feedback: List[datetime] = []
-        for handler_kls in handler_classes:
-            # TODO: merge to to get_handlers_for_event so
-            # so we don't need to go through the similar process twice.
-            job_configs = self.get_config_for_handler_kls(
-                handler_kls=handler_kls,
-            )
-
+        for handler_kls, job_configs in handlers_and_configs.items():
             # check allowlist approval for every job to be able to track down which jobs
             # failed because of missing allowlist approval
             if not allowlist.check_and_report(
@@ -484,9 +515,11 @@ class SteveJobs:
                     for job_config in job_configs
                 ]
 
-            processing_results.extend(
-                self.create_tasks(job_configs, handler_kls, statuses_check_feedback)
-            )
+            # the tasks share the event and the package config, store them only once
+            with task_payloads.batch():
+                processing_results.extend(
+                    self.create_tasks(job_configs, handler_kls, statuses_check_feedback)
+                )
         self.push_statuses_metrics(statuses_check_feedback)
 
         return processing_results
@@ -696,14 +729,29 @@ class SteveJobs:
             List of all jobs that match the event's trigger.
         """
         jobs_matching_trigger = []
+        # comparing the jobs serializes them, so each job is serialized only once
+        # and compared only with the jobs of the same type, trigger and package
+        jobs_by_key: Dict[tuple, List[JobConfig]] = defaultdict(list)
+        schema = JobConfigSchema()
+        serialized: Dict[int, dict] = {}
+
+        def serialize(job: JobConfig) -> dict:
+            if id(job) not in serialized:
+                serialized[id(job)] = schema.dump(job)
+            return serialized[id(job)]
+
+        def is_duplicate(job: JobConfig, key: tuple) -> bool:
+            return any(serialize(job) == serialize(other) for other in jobs_by_key[key])
+
         for job in self.event.packages_config.get_job_views():
+            key = (type(job), job.type, job.trigger, job.package)
             if (
                 job.trigger == self.event.job_config_trigger_type
                 and (
                     not isinstance(self.event, CheckRerunEvent)
                     or self.event.job_identifier == job.identifier
                 )
-                and job not in jobs_matching_trigger
+                and not is_duplicate(job, key)
                 # Manual trigger condition
                 and (
                     not job.manual_trigger
@@ -724,6 +772,7 @@ class SteveJobs:
                 )
             ):
                 jobs_matching_trigger.append(job)
+                jobs_by_key[key].append(job)
 
         jobs_matching_trigger.extend(self.check_explicit_matching())
 
@@ -774,30 +823,64 @@ class SteveJobs:
             Set of handler instances that we need to run for given event and user configuration.
         """
 
+        matching_handlers = set(self.get_handlers_and_configs())
+        logger.debug(f"Matching handlers: {matching_handlers}")
+        return matching_handlers
+
+    def get_handlers_and_configs(self) -> Dict[Type[JobHandler], List[JobConfig]]:
+        """
+        Get all handlers that we need to run for the given event
+        together with the job configs relevant to each of them.
+
+        The handlers are found in a single pass over the jobs matching the event
+        using the index of the handlers (see `get_handlers_for_job_type`).
+        The job configs of a handler are the jobs it's configured as or,
+        if there are none, the jobs that require it. The same as
+        `get_config_for_handler_kls` returns.
+
+        Returns:
+            Dictionary of the handlers and the lists of the job configs
+            preserving the order in the config.
+        """
         jobs_matching_trigger = self.get_jobs_matching_event()
 
         handlers_triggered_by_job = self.get_handlers_for_comment_and_rerun_event()
 
-        matching_handlers: Set[Type["JobHandler"]] = set()
+        configured_jobs: Dict[Type[JobHandler], List[JobConfig]] = {}
+        requiring_jobs: Dict[Type[JobHandler], List[JobConfig]] = {}
         for job in jobs_matching_trigger:
-            for handler in (
-                MAP_JOB_TYPE_TO_HANDLER[job.type]
-                | MAP_REQUIRED_JOB_TYPE_TO_HANDLER[job.type]
+            handlers, required_handlers = get_handlers_for_job_type(
+                type(self.event), job.type
+            )
+            for handler_jobs, matching_handlers in (
+                (configured_jobs, handlers),
+                (requiring_jobs, required_handlers),
             ):
-                if self.is_handler_matching_the_event(
-                    handler=handler,
-                    allowed_handlers=handlers_triggered_by_job,
-                ):
-                    matching_handlers.add(handler)
-
-        if not matching_handlers:
+                for handler in matching_handlers:
+                    if (
+                        handlers_triggered_by_job is None
+                        or handler in handlers_triggered_by_job
+                    ):
+                        handler_jobs.setdefault(handler, []).append(job)
+
+        handlers_and_configs = {
+            handler: configured_jobs.get(handler) or requiring_jobs[handler]
+            for handler in {**configured_jobs, **requiring_jobs}
+        }
+        if not handlers_and_configs:
             logger.debug(
                 f"We did not find any handler for a following event:\n{self.event.__class__}"
             )
 
-        logger.debug(f"Matching handlers: {matching_handlers}")
+        logger.debug(
+            "Matching handlers: "
+            + ", ".join(
+                f"{handler.__name__} ({len(jobs)} jobs)"
+                for handler, jobs in handlers_and_configs.items()
+            )
+        )
 
-        return matching_handlers
+        return handlers_and_configs
 
     def is_handler_matching_the_event(
         self,
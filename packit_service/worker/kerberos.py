@@ -0,0 +1,107 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Kerberos ticket shared by all the checks and handlers of a worker.
+
+`PackitAPI.init_kerberos_ticket()` runs `kinit` once per API object, and
+the checks create a new one for every event. The ticket in the credentials
+cache of the worker is valid for hours though, so it's reused until it's
+about to expire.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from packit.exceptions import PackitCommandFailedError
+
+from packit_service.constants import (
+    KERBEROS_AUTH_ERRORS,
+    KERBEROS_TICKET_DEFAULT_LIFETIME,
+    KERBEROS_TICKET_RENEW_BEFORE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class KerberosTicket:
+    # monotonic time until which the ticket is considered valid
+    valid_until: float = 0.0
+    lock = threading.Lock()
+
+    @staticmethod
+    def get_lifetime() -> Optional[int]:
+        """
+        Get the remaining lifetime of the ticket in the credentials cache.
+
+        Returns:
+            Number of seconds or None if there is no ticket or its lifetime
+            can't be read.
+        """
+        try:
+            import gssapi
+
+            return int(gssapi.Credentials(usage="initiate").lifetime)
+        except Exception as ex:
+            logger.debug(f"Unable to get the lifetime of the Kerberos ticket: {ex!r}")
+            return None
+
+    @classmethod
+    def init(cls, kinit: Callable[[], None]) -> None:
+        """
+        Make sure there is a valid ticket, obtain a new one only if the current
+        one expires in less than `KERBEROS_TICKET_RENEW_BEFORE` seconds.
+
+        Args:
+            kinit: Function obtaining the ticket,
+                e.g. `PackitAPI.init_kerberos_ticket`.
+
+        Raises:
+            PackitCommandFailedError: When the ticket can't be obtained.
+        """
+        with cls.lock:
+            if time.monotonic() < cls.valid_until:
+                return
+
+            lifetime = cls.get_lifetime()
+            if lifetime is None or lifetime <= KERBEROS_TICKET_RENEW_BEFORE:
+                logger.debug("Initialising Kerberos ticket.")
+                kinit()
+                lifetime = cls.get_lifetime() or KERBEROS_TICKET_DEFAULT_LIFETIME
+            else:
+                logger.debug(f"Reusing Kerberos ticket valid for {lifetime}s.")
+
+            cls.valid_until = time.monotonic() + lifetime - KERBEROS_TICKET_RENEW_BEFORE
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Obtain a new ticket the next time one is needed."""
+        with cls.lock:
+            cls.valid_until = 0.0
+
+    @classmethod
+    def invalidate_on_auth_error(cls, ex: Exception) -> bool:
+        """
+        Invalidate the ticket if the failure of a command using it looks like
+        an authentication error, e.g. the ticket was destroyed or has expired
+        before the expected time.
+
+        Args:
+            ex: Exception raised by the command.
+
+        Returns:
+            Whether the ticket was invalidated.
+        """
+        message = str(ex)
+        if isinstance(ex, PackitCommandFailedError):
+            message += f"\n{ex.stderr_output}"
+        if getattr(ex, "code", None) != 401 and not any(
+            error in message.lower() for error in KERBEROS_AUTH_ERRORS
+        ):
+            return False
+
+        logger.info("Authentication failed, invalidating the Kerberos ticket.")
+        cls.invalidate()
+        return True
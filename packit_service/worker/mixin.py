@@ -14,14 +14,16 @@ from ogr.abstract import Issue
 
 from packit.api import PackitAPI
 from packit.local_project import LocalProject, LocalProjectBuilder, CALCULATE
-from packit.utils.repo import RepositoryCache
 
 from ogr.abstract import GitProject, PullRequest
 
+from packit_service.cache import fas_groups
 from packit_service.config import ServiceConfig
 from packit_service.worker.reporting import BaseCommitStatus
 from packit_service.worker.events import EventData
 from packit_service.worker.helpers.job_helper import BaseJobHelper
+from packit_service.worker.kerberos import KerberosTicket
+from packit_service.worker.repository_cache import get_repository_cache
 
 from packit_service.constants import (
     FASJSON_URL,
@@ -160,14 +162,27 @@ class PackitAPIWithDownstreamMixin(PackitAPIWithDownstreamProtocol):
         return self._packit_api
 
     def is_packager(self, user):
-        self.packit_api.init_kerberos_ticket()
+        groups = fas_groups.get(user, self.get_fas_groups)
+        if groups is None:
+            return False
+        if "packager" not in groups:
+            # the user may have just been added to the group,
+            # look it up again when they retry
+            fas_groups.invalidate(user)
+            return False
+        return True
+
+    def get_fas_groups(self, user: str) -> Optional[List[str]]:
+        """Look the groups of the FAS user up, None if it's not possible."""
+        KerberosTicket.init(self.packit_api.init_kerberos_ticket)
         client = Client(FASJSON_URL)
         try:
             groups = client.list_user_groups(username=user)
-        except APIError:
-            logger.debug(f"Unable to get groups for user {user}.")
-            return False
-        return "packager" in [group["groupname"] for group in groups.result]
+        except APIError as ex:
+            logger.debug(f"Unable to get groups for user {user}: {ex}")
+            KerberosTicket.invalidate_on_auth_error(ex)
+            return None
+        return [group["groupname"] for group in groups.result]
 
     def clean_api(self) -> None:
         """TODO: probably we should clean something even here
@@ -225,14 +240,7 @@ class LocalProjectMixin(Config):
 
         if not self._local_project:
             builder = LocalProjectBuilder(
-                cache=(
-                    RepositoryCache(
-                        cache_path=self.service_config.repository_cache,
-                        add_new=self.service_config.add_repositories_to_repository_cache,
-                    )
-                    if self.service_config.repository_cache
-                    else None
-                )
+                cache=get_repository_cache(self.service_config)
             )
             working_dir = Path(
                 Path(self.service_config.command_handler_work_dir)
@@ -3,20 +3,64 @@
 
 import logging
 import os
+import threading
+import time
+from typing import Optional
 
-from prometheus_client import CollectorRegistry, Counter, push_to_gateway, Histogram
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    push_to_gateway,
+    Histogram,
+)
+
+from packit_service.constants import (
+    METRICS_PUSH_INTERVAL,
+    METRICS_PUSH_MAX_BACKOFF,
+    METRICS_PUSH_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class Pushgateway:
+    """
+    Metrics of the worker process.
+
+    There is a single instance (and registry) per process, the metrics are only
+    updated in memory and `push()` just asks a background thread to push them.
+    The thread pushes at most once per `METRICS_PUSH_INTERVAL` seconds, so that
+    the pushes of many tasks are coalesced, and backs off when the Pushgateway
+    is not available. The handling of the events never waits for the Pushgateway.
+    """
+
+    _instance: Optional["Pushgateway"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self):
+        if hasattr(self, "registry"):
+            # the instance of this process has already been set up
+            return
+
         self.pushgateway_address = os.getenv(
             "PUSHGATEWAY_ADDRESS", "http://pushgateway"
         )
         # so that workers don't overwrite each other's metrics,
         # the job name corresponds to worker name (e.g. packit-worker-0)
         self.worker_name = os.getenv("HOSTNAME")
+        self.push_interval = METRICS_PUSH_INTERVAL
+        self.max_backoff = METRICS_PUSH_MAX_BACKOFF
+        self.push_requested = threading.Event()
+        # the process the flusher thread runs in, it needs to be started
+        # again in the children of a forking worker
+        self.flusher_pid: Optional[int] = None
         self.registry = CollectorRegistry()
 
         # metrics
@@ -159,12 +203,173 @@ class Pushgateway:
             registry=self.registry,
         )
 
+        self.package_config_cache_hits = Counter(
+            "package_config_cache_hits",
+            "The number of package configs found in the cache",
+            registry=self.registry,
+        )
+
+        self.package_config_cache_misses = Counter(
+            "package_config_cache_misses",
+            "The number of package configs fetched from the forge "
+            "since they were not cached",
+            registry=self.registry,
+        )
+
+        self.fas_groups_cache_hits = Counter(
+            "fas_groups_cache_hits",
+            "The number of FAS group lookups answered from the cache",
+            registry=self.registry,
+        )
+
+        self.fas_groups_cache_misses = Counter(
+            "fas_groups_cache_misses",
+            "The number of FAS group lookups sent to FASJSON",
+            registry=self.registry,
+        )
+
+        self.catalog_cache_hits = Counter(
+            "catalog_cache_hits",
+            "The number of catalog lookups answered from the cache",
+            ["catalog", "stale"],
+            registry=self.registry,
+        )
+
+        self.catalog_cache_misses = Counter(
+            "catalog_cache_misses",
+            "The number of catalogs fetched before being served",
+            ["catalog"],
+            registry=self.registry,
+        )
+
+        self.events_superseded = Counter(
+            "events_superseded",
+            "The number of pull request events dropped because a newer commit "
+            "was pushed to the pull request in the meantime",
+            registry=self.registry,
+        )
+
+        self.check_runs_sent = Counter(
+            "check_runs_sent",
+            "Number of GitHub check runs sent",
+            registry=self.registry,
+        )
+
+        self.check_runs_coalesced = Counter(
+            "check_runs_coalesced",
+            "Number of GitHub check runs not sent since they were superseded "
+            "by a newer state of the check or didn't change the state",
+            registry=self.registry,
+        )
+
+        self.repository_cache_hits = Counter(
+            "repository_cache_hits",
+            "Number of clones using a mirror from the repository cache",
+            registry=self.registry,
+        )
+
+        self.repository_cache_misses = Counter(
+            "repository_cache_misses",
+            "Number of clones of repositories not present in the repository cache",
+            registry=self.registry,
+        )
+
+        self.repository_cache_bytes_saved = Counter(
+            "repository_cache_bytes_saved",
+            "Approximate number of bytes not downloaded thanks to the repository cache",
+            registry=self.registry,
+        )
+
+        self.repository_clone_time = Histogram(
+            "repository_clone_time",
+            "Time it takes to clone a repository",
+            ["cached"],
+            registry=self.registry,
+            buckets=(1, 5, 15, 30, 60, 120, 300, float("inf")),
+        )
+
+        self.tft_babysit_sweep_duration = Histogram(
+            "tft_babysit_sweep_duration",
+            "Time it takes to check the state of all pending Testing Farm runs",
+            registry=self.registry,
+            buckets=(10, 30, 60, 120, 300, 600, float("inf")),
+        )
+
+        self.tft_babysit_pipelines_checked = Counter(
+            "tft_babysit_pipelines_checked",
+            "Number of Testing Farm pipelines checked by the babysit task",
+            registry=self.registry,
+        )
+
+        self.tft_babysit_pipelines_per_second = Gauge(
+            "tft_babysit_pipelines_per_second",
+            "Number of Testing Farm pipelines checked per second in the last sweep",
+            registry=self.registry,
+        )
+
     def push(self):
+        """Ask the background thread to push the metrics."""
         if not (self.pushgateway_address and self.worker_name):
             logger.debug("Pushgateway address or worker name not defined.")
             return
 
-        logger.info("Pushing the metrics to pushgateway.")
-        push_to_gateway(
-            self.pushgateway_address, job=self.worker_name, registry=self.registry
-        )
+        self.start_flusher()
+        self.push_requested.set()
+
+    def start_flusher(self):
+        with self._lock:
+            if self.flusher_pid == os.getpid():
+                return
+            self.flusher_pid = os.getpid()
+        threading.Thread(
+            target=self.run_flusher, name="metrics-flusher", daemon=True
+        ).start()
+
+    def run_flusher(self):
+        try:
+            self._run_flusher()
+        finally:
+            # let the next push start a new thread
+            with self._lock:
+                self.flusher_pid = None
+
+    def _run_flusher(self):
+        backoff = self.push_interval
+        while True:
+            self.push_requested.wait()
+            # collect the metrics of the other tasks finished in the meantime
+            time.sleep(self.push_interval)
+            self.push_requested.clear()
+
+            if self.flush():
+                backoff = self.push_interval
+                continue
+
+            # try again later, the metrics are kept in the registry until then
+            self.push_requested.set()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def flush(self) -> bool:
+        """
+        Push the metrics right away.
+
+        Returns:
+            Whether the metrics were pushed.
+        """
+        if not (self.pushgateway_address and self.worker_name):
+            return False
+
+        logger.debug("Pushing the metrics to pushgateway.")
+        try:
+            push_to_gateway(
+                self.pushgateway_address,
+                job=self.worker_name,
+                registry=self.registry,
+                timeout=METRICS_PUSH_TIMEOUT,
+            )
+        except Exception as ex:
+            # e.g. invalid address or failed collection of a metric
+            logger.warning(f"Failed to push the metrics to pushgateway: {ex!r}")
+            return False
+        return True
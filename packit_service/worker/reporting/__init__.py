@@ -1,6 +1,7 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+from packit_service.worker.reporting.buffer import CheckRunBuffer
 from packit_service.worker.reporting.enums import BaseCommitStatus, DuplicateCheckMode
 from packit_service.worker.reporting.reporters.base import StatusReporter
 from packit_service.worker.reporting.reporters.github import (
@@ -15,6 +16,7 @@ from packit_service.worker.reporting.utils import (
 
 __all__ = [
     BaseCommitStatus.__name__,
+    CheckRunBuffer.__name__,
     StatusReporter.__name__,
     DuplicateCheckMode.__name__,
     report_in_issue_repository.__name__,
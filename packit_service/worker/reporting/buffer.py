@@ -0,0 +1,232 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Coalescing of the GitHub check runs set for a commit.
+
+Jobs usually move their checks through several states in a quick succession
+(e.g. from "SRPM build has been submitted" to "Starting RPM build..."),
+so the check runs are buffered for a short window and only the last state
+of each check is sent. The last state sent for each check is shared with
+the other tasks and workers through Redis so that identical states
+are not sent again. The check runs are sent through a token bucket
+to stay below the secondary rate limits of GitHub.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import redis
+
+from packit_service.cache import RedisStore
+from packit_service.constants import (
+    CHECK_RUN_BURST,
+    CHECK_RUN_COALESCING_WINDOW,
+    CHECK_RUN_RATE,
+    CHECK_RUN_RATE_LIMIT_PAUSE,
+    CHECK_RUN_SENT_TTL,
+)
+from packit_service.worker.monitoring import Pushgateway
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Limits the rate of the requests while allowing short bursts."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Number of tokens added per second.
+            capacity: Maximum number of tokens, i.e. the size of a burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Don't hand out any tokens for the given number of seconds."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class CheckRunBuffer:
+    """
+    Buffer of the check runs to be set for a single commit.
+
+    Only the last state of each check is kept, it's sent once no newer state
+    arrives for `window` seconds or when the buffer is flushed at the end
+    of the task. A state identical to the last one sent (by any task within
+    `CHECK_RUN_SENT_TTL` seconds) is not sent again. States that fail
+    to be sent are kept for the next flush.
+
+    Errors of the store are logged and the check runs are sent as usual.
+    """
+
+    # (project, commit SHA): buffer
+    buffers: Dict[Tuple[str, str], "CheckRunBuffer"] = {}
+    buffers_lock = threading.Lock()
+    bucket = TokenBucket(rate=CHECK_RUN_RATE, capacity=CHECK_RUN_BURST)
+
+    _store = None
+
+    def __init__(
+        self,
+        project: str,
+        commit_sha: str,
+        window: float = CHECK_RUN_COALESCING_WINDOW,
+    ):
+        self.project = project
+        self.commit_sha = commit_sha
+        self.window = window
+        # check name: (fingerprint of the state, function sending it)
+        self.pending: Dict[str, Tuple[str, Callable[[], None]]] = {}
+        self.lock = threading.RLock()
+        self.timer: Optional[threading.Timer] = None
+        self.pushgateway = Pushgateway()
+
+    @property
+    def store(self):
+        if CheckRunBuffer._store is None:
+            CheckRunBuffer._store = RedisStore()
+        return CheckRunBuffer._store
+
+    @classmethod
+    def get(cls, project: str, commit_sha: str) -> "CheckRunBuffer":
+        with cls.buffers_lock:
+            if (project, commit_sha) not in cls.buffers:
+                cls.buffers[(project, commit_sha)] = cls(project, commit_sha)
+            return cls.buffers[(project, commit_sha)]
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """
+        Send the pending check runs of all the commits and forget the buffers,
+        the last states sent are kept in the store. Buffers with states
+        that failed to be sent are kept.
+
+        Raises:
+            The first error raised while sending the check runs.
+        """
+        with cls.buffers_lock:
+            buffers = list(cls.buffers.items())
+        error = None
+        for _, buffer in buffers:
+            try:
+                buffer.flush()
+            except Exception as ex:
+                error = error or ex
+        with cls.buffers_lock:
+            for key, buffer in buffers:
+                if not buffer.pending and cls.buffers.get(key) is buffer:
+                    del cls.buffers[key]
+        if error:
+            raise error
+
+    def add(self, check_name: str, fingerprint: str, send: Callable[[], None]):
+        """
+        Buffer the state of the check.
+
+        Args:
+            check_name: Name of the check.
+            fingerprint: Identification of the state, states with the same
+                fingerprint are considered identical.
+            send: Function sending the state.
+        """
+        if not self.window:
+            self._send(check_name, fingerprint, send)
+            return
+
+        with self.lock:
+            if check_name in self.pending:
+                logger.debug(f"Replacing pending state of check '{check_name}'.")
+                self.pushgateway.check_runs_coalesced.inc()
+            self.pending[check_name] = (fingerprint, send)
+            if self.timer is None:
+                self.timer = threading.Timer(self.window, self._flush_in_background)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self) -> None:
+        """Send all the pending check runs."""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            pending, self.pending = list(self.pending.items()), {}
+            for i, (check_name, (fingerprint, send)) in enumerate(pending):
+                try:
+                    self._send(check_name, fingerprint, send)
+                except Exception:
+                    # retry the unsent states on the next flush
+                    for unsent_check_name, state in pending[i:]:
+                        self.pending.setdefault(unsent_check_name, state)
+                    raise
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception as ex:
+            logger.warning(
+                f"Failed to set the check runs, will retry at the end of the task: {ex!r}"
+            )
+
+    def _get_sent_key(self, check_name: str) -> str:
+        return f"packit:check-run:{self.project}:{self.commit_sha}:{check_name}"
+
+    def get_sent(self, check_name: str) -> Optional[str]:
+        """Get the fingerprint of the last state of the check sent to GitHub."""
+        try:
+            return self.store.get(self._get_sent_key(check_name))
+        except redis.RedisError as ex:
+            logger.warning(
+                f"Failed to get the last state of check '{check_name}': {ex}"
+            )
+            return None
+
+    def _send(self, check_name: str, fingerprint: str, send: Callable[[], None]):
+        if self.get_sent(check_name) == fingerprint:
+            logger.debug(f"State of check '{check_name}' has not changed.")
+            self.pushgateway.check_runs_coalesced.inc()
+            return
+
+        self.bucket.acquire()
+        send()
+        self.pushgateway.check_runs_sent.inc()
+        try:
+            self.store.set(
+                self._get_sent_key(check_name), fingerprint, CHECK_RUN_SENT_TTL
+            )
+        except redis.RedisError as ex:
+            logger.warning(f"Failed to store the state of check '{check_name}': {ex}")
+
+    @classmethod
+    def rate_limited(cls) -> None:
+        """Stop sending the check runs for a while after hitting a rate limit."""
+        logger.warning(
+            f"Rate limit hit, pausing the check runs for {CHECK_RUN_RATE_LIMIT_PAUSE}s."
+        )
+        cls.bucket.pause(CHECK_RUN_RATE_LIMIT_PAUSE)
@@ -5,9 +5,11 @@ import logging
 from typing import Optional, Dict
 
 from .base import StatusReporter
+from packit_service.worker.reporting.buffer import CheckRunBuffer
 from packit_service.worker.reporting.news import News
 from packit_service.worker.reporting.enums import BaseCommitStatus
 
+from github import RateLimitExceededException
 from ogr.abstract import CommitStatus
 from ogr.exceptions import GithubAPIException
 from ogr.services.github import GithubProject
@@ -104,36 +106,47 @@ class StatusReporterGithubChecks(StatusReporterGithubStatuses):
             f" {description}"
         )
 
-        summary = (
-            self._create_table(url, links_to_external_services)
-            + markdown_content
-            + "\n\n"
-            + f"---\n*{News.get_sentence()}*"
-        )
+        details = self._create_table(url, links_to_external_services) + markdown_content
+        summary = details + "\n\n" + f"---\n*{News.get_sentence()}*"
 
-        try:
-            status = (
-                state_to_set
-                if isinstance(state_to_set, GithubCheckRunStatus)
-                else GithubCheckRunStatus.completed
-            )
-            conclusion = (
-                state_to_set if isinstance(state_to_set, GithubCheckRunResult) else None
-            )
-
-            external_id = str(self.project_event_id) if self.project_event_id else None
-
-            self.project_with_commit.create_check_run(
-                name=check_name,
-                commit_sha=self.commit_sha,
-                url=url or None,  # must use the http or https scheme, cannot be ""
-                external_id=external_id,
-                status=status,
-                conclusion=conclusion,
-                output=create_github_check_run_output(description, summary),
-            )
-        except GithubAPIException as e:
-            logger.debug(
-                f"Failed to set status check, setting status as a fallback: {str(e)}"
-            )
-            super().set_status(state, description, check_name, url)
+        status = (
+            state_to_set
+            if isinstance(state_to_set, GithubCheckRunStatus)
+            else GithubCheckRunStatus.completed
+        )
+        conclusion = (
+            state_to_set if isinstance(state_to_set, GithubCheckRunResult) else None
+        )
+        external_id = str(self.project_event_id) if self.project_event_id else None
+
+        def send():
+            try:
+                self.project_with_commit.create_check_run(
+                    name=check_name,
+                    commit_sha=self.commit_sha,
+                    url=url or None,  # must use the http or https scheme, cannot be ""
+                    external_id=external_id,
+                    status=status,
+                    conclusion=conclusion,
+                    output=create_github_check_run_output(description, summary),
+                )
+            except GithubAPIException as e:
+                if e.response_code == 429 or isinstance(
+                    e.__cause__, RateLimitExceededException
+                ):
+                    CheckRunBuffer.rate_limited()
+                logger.debug(
+                    f"Failed to set status check, setting status as a fallback: {str(e)}"
+                )
+                super(StatusReporterGithubChecks, self).set_status(
+                    state, description, check_name, url
+                )
+
+        # the news sentence is random, don't let it make the states different
+        fingerprint = "|".join(
+            str(part)
+            for part in (status, conclusion, url, external_id, description, details)
+        )
+        CheckRunBuffer.get(
+            self.project_with_commit.full_repo_name, self.commit_sha
+        ).add(check_name, fingerprint, send)
@@ -0,0 +1,345 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Repository cache managed by the service.
+
+The cache keeps a bare mirror of each repository cloned by the workers,
+the mirrors are used as a reference when cloning so that only the objects
+missing in the mirror are downloaded from the forge. The mirrors are
+refreshed by `git fetch` in the background, and the least recently used ones
+are evicted once the cache exceeds its size budget.
+
+The cache directory can be shared by several workers, each mirror is guarded
+by a file lock (shared while cloning from the mirror, exclusive while it's
+created, refreshed or evicted).
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+import git
+from packit.utils.repo import RepositoryCache, RepoUrl, is_git_repo
+
+from packit_service.config import ServiceConfig
+from packit_service.constants import REPOSITORY_CACHE_FETCH_INTERVAL
+from packit_service.worker.monitoring import Pushgateway
+
+logger = logging.getLogger(__name__)
+
+GiB = 1024**3
+
+
+class Mirror(NamedTuple):
+    name: str
+    size: int
+    last_used: float
+
+
+def get_directory_size(path: Path) -> int:
+    """Number of bytes occupied by the files in the directory."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.lstat(os.path.join(root, file)).st_size
+            except FileNotFoundError:
+                continue
+    return size
+
+
+class ManagedRepositoryCache(RepositoryCache):
+    """
+    Repository cache with a size budget.
+
+    The layout of the cache directory:
+        <name>.git   bare mirror of the repository
+        <name>.json  metadata of the mirror, its mtime is the time of the last use
+        <name>.lock  lock guarding the mirror
+    """
+
+    def __init__(
+        self,
+        cache_path: Union[str, Path],
+        max_size: int,
+        add_new: bool = True,
+        fetch_interval: int = REPOSITORY_CACHE_FETCH_INTERVAL,
+        background_fetch: bool = True,
+    ) -> None:
+        """
+        Args:
+            cache_path: Directory of the cache.
+            max_size: Size budget of the cache in bytes.
+            add_new: Whether to add mirrors of the repositories not yet cached.
+            fetch_interval: Number of seconds after which a used mirror is refreshed.
+            background_fetch: Whether to refresh the mirrors in a background
+                thread instead of right after the clone.
+        """
+        super().__init__(cache_path=cache_path, add_new=add_new)
+        self.max_size = max_size
+        self.fetch_interval = fetch_interval
+        self.background_fetch = background_fetch
+        self.pushgateway = Pushgateway()
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def cached_projects(self) -> List[str]:
+        """Names of the mirrors we have in the cache."""
+        return [mirror.name for mirror in self.mirrors]
+
+    @property
+    def mirrors(self) -> List[Mirror]:
+        """Mirrors in the cache, the least recently used first."""
+        mirrors = []
+        for metadata_path in self.cache_path.glob("*.json"):
+            name = metadata_path.stem
+            if not self.get_mirror_path(name).is_dir():
+                continue
+            try:
+                size = json.loads(metadata_path.read_text())["size"]
+                last_used = metadata_path.stat().st_mtime
+            except (OSError, ValueError, KeyError):
+                continue
+            mirrors.append(Mirror(name=name, size=size, last_used=last_used))
+        return sorted(mirrors, key=lambda mirror: mirror.last_used)
+
+    @property
+    def size(self) -> int:
+        return sum(mirror.size for mirror in self.mirrors)
+
+    @staticmethod
+    def get_mirror_name(url: str) -> str:
+        """
+        Name of the mirror of the repository, forks and repositories of the same
+        name on different forges get different mirrors.
+        """
+        try:
+            repo = RepoUrl.parse(url).repo
+        except Exception:
+            repo = None
+        repo = repo or Path(url.rstrip("/")).name.removesuffix(".git") or "repo"
+        digest = hashlib.sha256(url.rstrip("/").removesuffix(".git").encode())
+        return f"{repo}-{digest.hexdigest()[:12]}"
+
+    def get_mirror_path(self, name: str) -> Path:
+        return self.cache_path / f"{name}.git"
+
+    def get_metadata_path(self, name: str) -> Path:
+        return self.cache_path / f"{name}.json"
+
+    @contextmanager
+    def lock(
+        self, name: str, exclusive: bool = False, blocking: bool = True
+    ) -> Iterator[bool]:
+        """
+        Lock the mirror for all the processes sharing the cache.
+
+        Yields:
+            Whether the lock was acquired, always true if blocking.
+        """
+        with open(self.cache_path / f"{name}.lock", "a") as lock_file:
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                operation |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, operation)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_metadata(self, name: str, url: str, fetched_at: float) -> None:
+        self.get_metadata_path(name).write_text(
+            json.dumps(
+                {
+                    "url": url,
+                    "size": get_directory_size(self.get_mirror_path(name)),
+                    "fetched_at": fetched_at,
+                }
+            )
+        )
+
+    def _read_metadata(self, name: str) -> dict:
+        try:
+            return json.loads(self.get_metadata_path(name).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _create_mirror(self, name: str, url: str) -> None:
+        """Clone the bare mirror, must be called with the exclusive lock held."""
+        mirror_path = self.get_mirror_path(name)
+        logger.debug(f"Adding mirror of {url} to the repository cache: {mirror_path}")
+        # clone next to the final location so that a failed clone
+        # doesn't leave a broken mirror behind
+        tmp_path = Path(tempfile.mkdtemp(dir=self.cache_path, prefix=f".{name}-"))
+        try:
+            self._clone(url=url, to_path=str(tmp_path), bare=True)
+            tmp_path.rename(mirror_path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self._write_metadata(name, url, fetched_at=time.time())
+        self.projects_added.append(name)
+
+    def refresh(self, name: str, url: str) -> None:
+        """Fetch the new objects to the mirror unless someone else is already doing it."""
+        with self.lock(name, exclusive=True, blocking=False) as locked:
+            if not locked or not self.get_mirror_path(name).is_dir():
+                return
+            logger.debug(f"Refreshing mirror {name} in the repository cache.")
+            try:
+                git.Repo(self.get_mirror_path(name)).git.fetch(
+                    "--prune", "--tags", url, "+refs/heads/*:refs/heads/*"
+                )
+            except git.GitCommandError as ex:
+                logger.warning(f"Failed to refresh mirror {name}: {ex}")
+                return
+            self._write_metadata(name, url, fetched_at=time.time())
+
+    def _refresh_if_stale(self, name: str, url: str) -> None:
+        fetched_at = self._read_metadata(name).get("fetched_at", 0)
+        if time.time() - fetched_at < self.fetch_interval:
+            return
+        if self.background_fetch:
+            threading.Thread(
+                target=self.refresh,
+                args=(name, url),
+                name=f"repository-cache-refresh-{name}",
+                daemon=True,
+            ).start()
+        else:
+            self.refresh(name, url)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        Remove the least recently used mirrors until the cache fits its budget.
+
+        Args:
+            keep: Name of the mirror not to be removed.
+        """
+        mirrors = self.mirrors
+        size = sum(mirror.size for mirror in mirrors)
+        for mirror in mirrors:
+            if size <= self.max_size:
+                return
+            if mirror.name == keep:
+                continue
+            # skip the mirrors being used by other clones
+            with self.lock(mirror.name, exclusive=True, blocking=False) as locked:
+                if not locked:
+                    continue
+                logger.info(
+                    f"Evicting mirror {mirror.name} ({mirror.size} B) "
+                    "from the repository cache."
+                )
+                self.get_metadata_path(mirror.name).unlink(missing_ok=True)
+                shutil.rmtree(self.get_mirror_path(mirror.name), ignore_errors=True)
+            size -= mirror.size
+
+    def get_repo(
+        self,
+        url: str,
+        directory: Union[Path, str, None] = None,
+    ) -> git.Repo:
+        """
+        Clone the repository using the mirror from the cache as a reference,
+        the mirror is created first if it's not cached yet and `add_new` is set.
+
+        The clone is dissociated from the mirror so that the mirror can be evicted
+        (and the clone used in the sandbox, which doesn't see the cache).
+
+        Args:
+            url: URL of the repository.
+            directory: Target path of the clone.
+
+        Returns:
+            Cloned repository.
+        """
+        directory = str(directory) if directory else tempfile.mkdtemp()
+
+        if is_git_repo(directory=directory):
+            logger.debug(f"Repo already exists in {directory}.")
+            return git.Repo(directory)
+
+        name = self.get_mirror_name(url)
+        mirror_path = self.get_mirror_path(name)
+
+        added = False
+        if not mirror_path.is_dir() and self.add_new:
+            with self.lock(name, exclusive=True):
+                # someone else could have added it while we were waiting
+                if not mirror_path.is_dir():
+                    try:
+                        self._create_mirror(name, url)
+                        added = True
+                    except git.GitCommandError as ex:
+                        logger.warning(f"Failed to add mirror of {url}: {ex}")
+
+        start = time.monotonic()
+        with self.lock(name):
+            cached = mirror_path.is_dir()
+            if cached:
+                logger.debug(f"Cloning {url} -> {directory} using mirror {name}.")
+                repo = self._clone(
+                    url=url,
+                    to_path=directory,
+                    tags=True,
+                    reference=str(mirror_path),
+                    dissociate=True,
+                )
+                # mtime of the metadata marks the last use
+                self.get_metadata_path(name).touch()
+                self.projects_cloned_using_cache.append(name)
+
+        if not cached:
+            logger.debug(f"Cloning {url} -> {directory} without the repository cache.")
+            repo = self._clone(url=url, to_path=directory, tags=True)
+
+        self.pushgateway.repository_clone_time.labels(
+            cached="yes" if cached else "no"
+        ).observe(time.monotonic() - start)
+        if cached and not added:
+            self.pushgateway.repository_cache_hits.inc()
+            self.pushgateway.repository_cache_bytes_saved.inc(
+                self._read_metadata(name).get("size", 0)
+            )
+            self._refresh_if_stale(name, url)
+        else:
+            self.pushgateway.repository_cache_misses.inc()
+
+        self.evict(keep=name)
+        return repo
+
+
+def get_repository_cache(service_config: ServiceConfig) -> Optional[RepositoryCache]:
+    """
+    Repository cache to be used for cloning the repositories:
+    managed one if the size budget is configured, otherwise the static one
+    or none at all if the cache is not configured.
+    """
+    if not service_config.repository_cache:
+        return None
+
+    if service_config.repository_cache_max_size:
+        return ManagedRepositoryCache(
+            cache_path=service_config.repository_cache,
+            max_size=int(service_config.repository_cache_max_size * GiB),
+            add_new=service_config.add_repositories_to_repository_cache,
+        )
+
+    return RepositoryCache(
+        cache_path=service_config.repository_cache,
+        add_new=service_config.add_repositories_to_repository_cache,
+    )
@@ -3,13 +3,17 @@
 
 import logging
 import socket
-from datetime import timedelta
 from os import getenv
 from typing import List, Optional
 
 from celery import Task
 from celery._state import get_current_task
-from celery.signals import after_setup_logger
+from celery.signals import (
+    after_setup_logger,
+    task_postrun,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from ogr import __version__ as ogr_version
 from sqlalchemy import __version__ as sqlal_version
 from syslog_rfc5424_formatter import RFC5424Formatter
@@ -17,24 +21,20 @@ from syslog_rfc5424_formatter import RFC5424Formatter
 from packit import __version__ as packit_version
 from packit.exceptions import PackitException
 from packit_service import __version__ as ps_version
+from packit_service.cache import task_payloads
 from packit_service.celerizer import celery_app
 from packit_service.constants import (
     DEFAULT_RETRY_LIMIT,
     DEFAULT_RETRY_BACKOFF,
     CELERY_DEFAULT_MAIN_TASK_NAME,
-    USAGE_CURRENT_DATE,
-    USAGE_DATE_IN_THE_PAST,
-    USAGE_DATE_IN_THE_PAST_STR,
-    USAGE_PAST_DAY_DATE_STR,
-    USAGE_PAST_MONTH_DATE_STR,
-    USAGE_PAST_WEEK_DATE_STR,
-    USAGE_PAST_YEAR_DATE_STR,
+    USAGE_ROLLUP_BATCH_SIZE,
 )
 from packit_service.models import (
+    Session,
     VMImageBuildTargetModel,
     GitProjectModel,
     SyncReleaseTargetModel,
-    get_usage_data,
+    UsageRollupModel,
 )
 from packit_service.utils import (
     load_job_config,
@@ -87,6 +87,8 @@ from packit_service.worker.helpers.build.babysit import (
 )
 from packit_service.worker.handlers.usage import check_onboarded_projects
 from packit_service.worker.jobs import SteveJobs
+from packit_service.worker.monitoring import Pushgateway
+from packit_service.worker.reporting import CheckRunBuffer
 from packit_service.worker.result import TaskResults
 
 
@@ -154,6 +156,30 @@ def setup_loggers(logger, *args, **kwargs):
     log_package_versions(package_versions)
 
 
+@task_postrun.connect
+def flush_check_runs(*args, **kwargs):
+    """Send the check runs the finished task has left in the buffers."""
+    CheckRunBuffer.flush_all()
+
+
+@task_postrun.connect
+def remove_db_session(*args, **kwargs):
+    """
+    Close the database session of the finished task so that its connection
+    returns to the pool and the next task starts with a fresh session.
+    """
+    Session.remove()
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def push_remaining_metrics(*args, **kwargs):
+    """Push the metrics the background thread hasn't pushed yet."""
+    pushgateway = Pushgateway()
+    if pushgateway.push_requested.is_set():
+        pushgateway.flush()
+
+
 class TaskWithRetry(Task):
     autoretry_for = (Exception,)
     max_retries = int(getenv("CELERY_RETRY_LIMIT", DEFAULT_RETRY_LIMIT))
@@ -163,6 +189,11 @@ class TaskWithRetry(Task):
     # retry if worker gets obliterated during execution
     acks_late = True
 
+    def __call__(self, *args, **kwargs):
+        # the event and the package config can be passed by reference,
+        # see JobHandler.get_signature
+        return super().__call__(*args, **task_payloads.resolve(kwargs))
+
 
 class BodhiTaskWithRetry(TaskWithRetry):
     # hardcode for creating bodhi updates to account for the tagging race condition
@@ -319,12 +350,14 @@ def run_propose_downstream_handler(
     package_config: dict,
     job_config: dict,
     sync_release_run_id: Optional[int] = None,
+    branch: Optional[str] = None,
 ):
     handler = ProposeDownstreamHandler(
         package_config=load_package_config(package_config),
         job_config=load_job_config(job_config),
         event=event,
         sync_release_run_id=sync_release_run_id,
+        branch=branch,
         celery_task=self,
     )
     return get_handlers_task_results(handler.run_job(), event)
@@ -342,12 +375,14 @@ def run_pull_from_upstream_handler(
     package_config: dict,
     job_config: dict,
     sync_release_run_id: Optional[int] = None,
+    branch: Optional[str] = None,
 ):
     handler = PullFromUpstreamHandler(
         package_config=load_package_config(package_config),
         job_config=load_job_config(job_config),
         event=event,
         sync_release_run_id=sync_release_run_id,
+        branch=branch,
         celery_task=self,
     )
     return get_handlers_task_results(handler.run_job(), event)
@@ -651,65 +686,16 @@ def run_check_onboarded_projects() -> None:
     check_onboarded_projects(almost_onboarded_projects)
 
 
-def _get_usage_interval_data(days, hours, count) -> None:
-    """Call functions collecting usage statistics and **cache** results
-    to be used quicker later.
-
-    :param days: number of days for the interval length
-    :param hours: number of days for the interval length
-    :param count: number of intervals
-    """
-    logger.debug(
-        f"Starting collecting statistics for days={days}, hours={hours}, count={count}"
-    )
-
-    delta = timedelta(days=days, hours=hours)
-    current_date = USAGE_CURRENT_DATE
-    days_legend = []
-    for _ in range(count):
-        days_legend.append(current_date)
-        current_date -= delta
-
-    logger.debug(
-        f"Getting usage data datetime_from {USAGE_DATE_IN_THE_PAST} datetime_to {days_legend[-1]}"
-    )
-    get_usage_data(
-        datetime_from=USAGE_DATE_IN_THE_PAST, datetime_to=days_legend[-1], top=100000
-    )
-    logger.debug("Got usage data.")
-
-    for day in reversed(days_legend):
-        day_from = (day - delta).isoformat()
-        day_to = day.isoformat()
-
-        logger.warn(f"Getting usage data datetime_from {day_from} datetime_to {day_to}")
-        get_usage_data(datetime_from=day_from, datetime_to=day_to, top=100000)
-        logger.warn("Got usage data.")
-
-    logger.debug(
-        f"Done collecting statistics for days={days}, hours={hours}, count={count}"
-    )
-
-
 @celery_app.task
 def get_usage_statistics() -> None:
-    """Call functions collecting usage statistics and **cache** results
-    to be used later.
+    """Fold the jobs and pipelines created since the last run into the usage rollups
+    the usage statistics are computed from.
 
-    We need to do the very same calls made by the dashboard! Keep it in sync.
+    The very first run processes the whole history in batches.
     """
-    _get_usage_interval_data(days=0, hours=1, count=24)  # past day hourly statistics
-    _get_usage_interval_data(days=1, hours=0, count=7)  # past week daily statistics
-    _get_usage_interval_data(days=1, hours=0, count=30)  # past month daily statistics
-    _get_usage_interval_data(days=7, hours=0, count=52)  # past year weekly statistics
-
-    for day in (
-        USAGE_PAST_DAY_DATE_STR,
-        USAGE_PAST_WEEK_DATE_STR,
-        USAGE_PAST_MONTH_DATE_STR,
-        USAGE_PAST_YEAR_DATE_STR,
-        USAGE_DATE_IN_THE_PAST_STR,
-    ):
-        logger.debug(f"Getting usage data from datetime_from {day}.")
-        get_usage_data(datetime_from=day)
-        logger.debug("Got usage data.")
+    processed = USAGE_ROLLUP_BATCH_SIZE
+    while processed == USAGE_ROLLUP_BATCH_SIZE:
+        processed = UsageRollupModel.fold_new_usage(batch_size=USAGE_ROLLUP_BATCH_SIZE)
+        logger.debug(
+            f"Folded up to {processed} rows of each kind into the usage rollups."
+        )
@@ -0,0 +1,67 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Micro-benchmark of the serialization of the events (`Event.get_dict()`).
+
+Parses every event in tests/data and measures the first (uncached)
+serialization and the repeated (cached) ones:
+
+    PACKIT_SERVICE_CONFIG=files/packit-service.yaml \\
+        python -m tests.benchmark_event_serialization [number]
+
+Events that can't be parsed or serialized without the database
+or the forges are skipped.
+"""
+
+import json
+import logging
+import sys
+import timeit
+
+from packit_service.worker.parser import Parser
+from tests.spellbook import DATA_DIR, squash_the_message_structure_like_listener
+
+
+def load_events():
+    for path in sorted(DATA_DIR.glob("*/**/*.json")):
+        if path.is_relative_to(DATA_DIR / "http-requests"):
+            continue
+        message = json.loads(path.read_text())
+        if isinstance(message, dict) and message.get("body") and "topic" in message:
+            message = squash_the_message_structure_like_listener(message)
+        try:
+            event = Parser.parse_event(message)
+            if event:
+                event.get_dict()
+        except Exception as ex:
+            print(f"Skipping {path.relative_to(DATA_DIR)}: {ex!r:.60}")
+            continue
+        if event:
+            yield path.relative_to(DATA_DIR), event
+
+
+def uncached(event):
+    def serialize():
+        # what any change of the event does
+        event.__dict__["_serialized"] = None
+        event.get_dict()
+
+    return serialize
+
+
+def main(number: int = 1000):
+    logging.disable(logging.CRITICAL)
+    total_uncached = total_cached = 0.0
+    print(f"{'event':<70} {'uncached µs':>12} {'cached µs':>10}")
+    for path, event in load_events():
+        first = timeit.timeit(uncached(event), number=number) / number
+        cached = timeit.timeit(event.get_dict, number=number) / number
+        total_uncached += first
+        total_cached += cached
+        print(f"{str(path):<70} {first * 1e6:>12.1f} {cached * 1e6:>10.1f}")
+    print(f"{'total':<70} {total_uncached * 1e6:>12.1f} {total_cached * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
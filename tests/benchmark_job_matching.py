@@ -0,0 +1,106 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Micro-benchmark of matching the handlers and job configs to an event
+(`SteveJobs.get_handlers_and_configs()`) for large monorepo configs,
+compared to the former two passes (matching the handlers first and then
+scanning the jobs again for each of them):
+
+    PACKIT_SERVICE_CONFIG=files/packit-service.yaml \\
+        python -m tests.benchmark_job_matching [number]
+"""
+
+import logging
+import sys
+import timeit
+
+from flexmock import flexmock
+from packit.config import (
+    CommonPackageConfig,
+    JobConfig,
+    JobConfigTriggerType,
+    JobType,
+    PackageConfig,
+)
+
+from packit_service.worker.events import ReleaseEvent
+from packit_service.worker.handlers.abstract import (
+    MAP_JOB_TYPE_TO_HANDLER,
+    MAP_REQUIRED_JOB_TYPE_TO_HANDLER,
+)
+from packit_service.worker.jobs import SteveJobs
+
+JOB_TYPES = [
+    JobType.copr_build,
+    JobType.tests,
+    JobType.propose_downstream,
+    JobType.upstream_koji_build,
+    JobType.vm_image_build,
+]
+
+
+def get_event(packages: int, jobs_per_type: int) -> ReleaseEvent:
+    def package_configs(identifier=None):
+        return {
+            f"package-{i}": CommonPackageConfig(
+                downstream_package_name=f"package-{i}",
+                specfile_path=f"package-{i}.spec",
+                paths=[f"package-{i}"],
+                identifier=identifier,
+            )
+            for i in range(packages)
+        }
+
+    jobs = [
+        JobConfig(
+            type=job_type,
+            trigger=JobConfigTriggerType.release,
+            packages=package_configs(identifier=f"{job_type.value}-{i}"),
+        )
+        for job_type in JOB_TYPES
+        for i in range(jobs_per_type)
+    ]
+    packages_config = PackageConfig(packages=package_configs(), jobs=jobs)
+
+    class Event(ReleaseEvent):
+        def __init__(self):
+            self._package_config_searched = True
+            self._package_config = packages_config
+            self._project = flexmock()
+            self._base_project = flexmock()
+            self.fail_when_config_file_missing = False
+
+        @property
+        def job_config_trigger_type(self):
+            return JobConfigTriggerType.release
+
+    return Event()
+
+
+def two_passes(steve: SteveJobs):
+    jobs = steve.get_jobs_matching_event()
+    handlers = {
+        handler
+        for job in jobs
+        for handler in MAP_JOB_TYPE_TO_HANDLER[job.type]
+        | MAP_REQUIRED_JOB_TYPE_TO_HANDLER[job.type]
+        if steve.is_handler_matching_the_event(handler, None)
+    }
+    return {handler: steve.get_config_for_handler_kls(handler) for handler in handlers}
+
+
+def main(number: int = 20):
+    logging.disable(logging.CRITICAL)
+    print(f"{'packages':>8} {'jobs':>6} {'two passes ms':>14} {'single pass ms':>15}")
+    for packages, jobs_per_type in ((1, 1), (10, 2), (50, 4), (100, 10)):
+        steve = SteveJobs(get_event(packages, jobs_per_type))
+        assert two_passes(steve) == steve.get_handlers_and_configs()
+        before = timeit.timeit(lambda: two_passes(steve), number=number) / number
+        after = timeit.timeit(steve.get_handlers_and_configs, number=number) / number
+        jobs = packages * jobs_per_type * len(JOB_TYPES)
+        print(f"{packages:>8} {jobs:>6} {before * 1e3:>14.2f} {after * 1e3:>15.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -12,11 +12,25 @@ from flexmock import flexmock
 from ogr import GithubService, GitlabService, PagureService
 from packit.config import JobConfigTriggerType, JobConfig, PackageConfig
 from packit.config.common_package_config import Deployment
-from packit_service.config import ServiceConfig
+from packit_service.cache import (
+    AllowlistIndex,
+    CatalogCache,
+    FasGroupsCache,
+    InMemoryStore,
+    PackageConfigCache,
+    TaskPayloadStore,
+    catalogs,
+    fas_groups,
+    task_payloads,
+)
+from packit_service.constants import CHECK_RUN_RATE
+from packit_service.config import PackageConfigGetter, ServiceConfig
+from packit_service.deduplication import EventDeduplicator
 from packit_service.models import (
     ProjectEventModelType,
     ProjectEventModel,
     BuildStatus,
+    GitProjectModel,
     PullRequestModel,
 )
 from packit_service.worker.events import (
@@ -26,8 +40,12 @@ from packit_service.worker.events import (
     MergeRequestGitlabEvent,
     PushPagureEvent,
 )
+from packit_service.worker.events.event import get_stored_packages_config
 from packit_service.worker.events.koji import KojiBuildEvent
+from packit_service.worker.kerberos import KerberosTicket
+from packit_service.worker.allowlist import Allowlist
 from packit_service.worker.parser import Parser
+from packit_service.worker.reporting.buffer import CheckRunBuffer, TokenBucket
 from tests.spellbook import SAVED_HTTPD_REQS, DATA_DIR, load_the_message_from_file
 from deepdiff import DeepDiff
 
@@ -59,6 +77,37 @@ def global_service_config():
     ServiceConfig.service_config = service_config
 
 
+@pytest.fixture(autouse=True)
+def shared_store(monkeypatch):
+    """Keep the state shared by the workers in memory and fresh for each test."""
+    monkeypatch.setattr(EventDeduplicator, "_store", InMemoryStore())
+    monkeypatch.setattr(PackageConfigCache, "_store", InMemoryStore())
+    monkeypatch.setattr(AllowlistIndex, "_store", InMemoryStore())
+    monkeypatch.setattr(TaskPayloadStore, "_store", InMemoryStore())
+    monkeypatch.setattr(FasGroupsCache, "_store", InMemoryStore())
+    monkeypatch.setattr(CatalogCache, "_store", InMemoryStore())
+    task_payloads.payloads.clear()
+    fas_groups.groups.clear()
+    fas_groups.failed.clear()
+    catalogs.catalogs.clear()
+    KerberosTicket.invalidate()
+    PackageConfigGetter.package_config_cache.configs.clear()
+    PackageConfigGetter.package_config_cache.missing.clear()
+    Allowlist.index.loaded_at = None
+    GitProjectModel.get_or_create_id.cache_clear()
+    get_stored_packages_config.cache_clear()
+    monkeypatch.setattr(CheckRunBuffer, "buffers", {})
+    monkeypatch.setattr(CheckRunBuffer, "_store", InMemoryStore())
+    monkeypatch.setattr(
+        CheckRunBuffer, "bucket", TokenBucket(rate=CHECK_RUN_RATE, capacity=1000)
+    )
+    yield
+    # don't let the check runs left in the buffers be sent after the test
+    for buffer in CheckRunBuffer.buffers.values():
+        if buffer.timer:
+            buffer.timer.cancel()
+
+
 @pytest.fixture()
 def dump_http_com():
     """
@@ -195,7 +244,7 @@ def copr_build_model(
         type=project_event_model_type,
         event_id=1,
         get_project_event_object=lambda: trigger_object_model,
-        packages_config=None,
+        packages_config_hash=None,
     )
 
     runs = []
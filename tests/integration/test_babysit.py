@@ -16,7 +16,9 @@ from packit.config import (
     JobType,
     PackageConfig,
 )
+from packit.constants import HTTP_REQUEST_TIMEOUT
 from packit.copr_helper import CoprHelper
+from packit_service.constants import DEFAULT_JOB_TIMEOUT
 from packit_service.models import (
     CoprBuildTargetModel,
     SRPMBuildModel,
@@ -31,7 +33,14 @@ from packit_service.worker.helpers.build.babysit import (
     update_copr_builds,
     check_pending_copr_builds,
     check_pending_testing_farm_runs,
+    CoprBuildsBackend,
+    CoprBuildState,
+    CoprBuildsSweep,
+    CoprBuildsUpdate,
+    RateLimiter,
+    TestingFarmRunsPoller,
 )
+from packit_service.worker.monitoring import Pushgateway
 from packit_service.worker.handlers import (
     CoprBuildEndHandler,
     CoprBuildStartHandler,
@@ -449,7 +458,9 @@ def test_check_copr_build_not_exists():
     )
     builds = []
     for i in range(2):
-        builds.append(flexmock(status=BuildStatus.pending, build_id=1))
+        builds.append(
+            flexmock(status=BuildStatus.pending, build_id=1, status_checked_time=None)
+        )
         builds[i].should_receive("set_status").with_args(BuildStatus.error).once()
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
         BuildStatus.pending
@@ -497,12 +508,49 @@ def test_check_update_copr_builds_timeout():
     update_copr_builds(1, [build])
 
 
+class FakeCoprBackend(CoprBuildsBackend):
+    """Copr backend serving the builds from memory."""
+
+    def __init__(self, builds: dict, chroots: dict):
+        super().__init__()
+        self.builds = builds
+        self.chroots = chroots
+        self.requested = []
+
+    def get_build(self, build_id):
+        self.requested.append(build_id)
+        if build_id not in self.builds:
+            raise CoprNoResultException(f"Build {build_id} does not exist")
+        return self.builds[build_id]
+
+    def get_build_chroot(self, build_id, chroot):
+        return self.get_build_chroots(build_id)[chroot]
+
+    def get_build_chroots(self, build_id):
+        return self.chroots.get(build_id, {})
+
+    def get_source_chroot(self, build_id):
+        raise CoprNoResultException(f"Build {build_id} does not exist")
+
+
+def pending_build(build_id, target, submitted_ago, checked_ago=None, state=None):
+    now = datetime.datetime.utcnow()
+    return flexmock(
+        status=BuildStatus.pending,
+        build_id=build_id,
+        target=target,
+        build_submitted_time=now - submitted_ago,
+        status_checked_time=(now - checked_ago) if checked_ago else None,
+        status_checked_copr_state=state,
+    )
+
+
 def test_check_pending_copr_builds_no_builds():
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
         BuildStatus.pending
     ).and_return([])
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
-        "update_copr_builds"
+        "try_update_copr_builds"
     ).never()
     check_pending_copr_builds()
 
@@ -514,21 +562,113 @@ def test_check_pending_copr_builds():
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
         BuildStatus.pending
     ).and_return([build1, build2, build3])
+    flexmock(CoprBuildsSweep).should_receive("is_check_due").and_return(True)
+    flexmock(CoprBuildsSweep).should_receive("fetch").and_return(
+        CoprBuildState(build=None, chroots={})
+    )
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
-        "update_copr_builds"
-    ).with_args(1, [build1, build3]).once()
+        "try_update_copr_builds"
+    ).with_args(
+        1,
+        [build1, build3],
+        backend=CoprBuildsBackend,
+        build_copr=None,
+        chroot_builds={},
+    ).and_return(
+        CoprBuildsUpdate(succeeded=True, ended=True)
+    ).once()
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
-        "update_copr_builds"
-    ).with_args(2, [build2]).once()
+        "try_update_copr_builds"
+    ).with_args(
+        2, [build2], backend=CoprBuildsBackend, build_copr=None, chroot_builds={}
+    ).and_return(
+        CoprBuildsUpdate(succeeded=True, ended=True)
+    ).once()
     check_pending_copr_builds()
 
 
+def test_copr_builds_sweep():
+    started = flexmock(state="running", started_on=1, ended_on=None)
+    chroots = {
+        "fedora-rawhide-x86_64": flexmock(state="running"),
+        "fedora-40-x86_64": flexmock(state="succeeded"),
+    }
+    fingerprint = "running;fedora-40-x86_64=succeeded,fedora-rawhide-x86_64=running"
+    backend = FakeCoprBackend(
+        builds={1: started, 2: started, 3: started},
+        chroots={1: chroots, 2: chroots, 3: chroots},
+    )
+    hour = datetime.timedelta(hours=1)
+    # state changed since the last check
+    build1 = pending_build("1", "fedora-rawhide-x86_64", 2 * hour, hour, "old")
+    # state not changed since the last check
+    build2 = pending_build("2", "fedora-rawhide-x86_64", 2 * hour, hour, fingerprint)
+    # old build checked recently
+    build3 = pending_build("3", "fedora-rawhide-x86_64", 48 * hour, hour, "old")
+
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "try_update_copr_builds"
+    ).with_args(
+        1, [build1], backend=backend, build_copr=started, chroot_builds=chroots
+    ).and_return(
+        CoprBuildsUpdate(succeeded=True, ended=False)
+    ).once()
+    flexmock(CoprBuildTargetModel).should_receive("set_status_checked").with_args(
+        1, fingerprint, datetime.datetime
+    ).once()
+    flexmock(CoprBuildTargetModel).should_receive("set_status_checked").with_args(
+        2, fingerprint, datetime.datetime
+    ).once()
+
+    CoprBuildsSweep(backend=backend).run([build1, build2, build3])
+    assert sorted(backend.requested) == [1, 2]
+
+
+def test_copr_builds_sweep_unchanged_timed_out():
+    started = flexmock(state="running", started_on=1, ended_on=None)
+    chroots = {"fedora-rawhide-x86_64": flexmock(state="running")}
+    fingerprint = "running;fedora-rawhide-x86_64=running"
+    backend = FakeCoprBackend(builds={1: started}, chroots={1: chroots})
+    # stuck in Copr, its state doesn't change anymore
+    build = pending_build(
+        "1",
+        "fedora-rawhide-x86_64",
+        datetime.timedelta(seconds=DEFAULT_JOB_TIMEOUT + 3600),
+        datetime.timedelta(days=1),
+        fingerprint,
+    )
+    build.should_receive("set_status").with_args(BuildStatus.error).once()
+    flexmock(SRPMBuildModel).should_receive("get_by_copr_build_id").and_return(None)
+    flexmock(CoprBuildTargetModel).should_receive("set_status_checked").with_args(
+        1, fingerprint, datetime.datetime
+    ).once()
+
+    CoprBuildsSweep(backend=backend).run([build])
+
+
+def test_copr_builds_sweep_failed_update():
+    started = flexmock(state="running", started_on=1, ended_on=None)
+    chroots = {"fedora-rawhide-x86_64": flexmock(state="running")}
+    backend = FakeCoprBackend(builds={1: started}, chroots={1: chroots})
+    hour = datetime.timedelta(hours=1)
+    build = pending_build("1", "fedora-rawhide-x86_64", 2 * hour, hour, "old")
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "try_update_copr_builds"
+    ).and_return(CoprBuildsUpdate(succeeded=False, ended=False)).once()
+    # the state is not recorded so that the update is retried
+    flexmock(CoprBuildTargetModel).should_receive("set_status_checked").with_args(
+        1, None, datetime.datetime
+    ).once()
+
+    CoprBuildsSweep(backend=backend).run([build])
+
+
 def test_check_pending_testing_farm_runs_no_runs():
     flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
         TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running
     ).and_return([])
     # No request should be performed
-    flexmock(requests).should_receive("get").never()
+    flexmock(requests.Session).should_receive("get").never()
     check_pending_testing_farm_runs()
 
 
@@ -575,14 +715,18 @@ def test_check_pending_testing_farm_runs(created):
         pipeline_id=pipeline_id
     ).and_return(run)
     url = "https://api.dev.testing-farm.io/v0.1/requests/1"
-    flexmock(requests).should_receive("get").with_args(url).and_return(
+    flexmock(requests.Session).should_receive("get").with_args(
+        url, headers={}, timeout=HTTP_REQUEST_TIMEOUT
+    ).and_return(
         flexmock(
             json=lambda: {
                 "id": pipeline_id,
                 "state": TestingFarmResult.passed,
                 "created": "2021-11-01 17:22:36.061250",
             },
-            ok=lambda: True,
+            ok=True,
+            status_code=200,
+            headers={},
         )
     ).once()
     flexmock(TestingFarmResultsEvent).should_receive("get_packages_config").and_return(
@@ -598,6 +742,7 @@ def test_check_pending_testing_farm_runs(created):
         )
     )
     flexmock(TestingFarmResultsHandler).should_receive("run_job").and_return().once()
+    flexmock(Pushgateway).should_receive("push").once()
     check_pending_testing_farm_runs()
 
 
@@ -657,14 +802,18 @@ def test_check_pending_testing_farm_runs_identifiers(identifier):
         pipeline_id=pipeline_id
     ).and_return(run)
     url = "https://api.dev.testing-farm.io/v0.1/requests/1"
-    flexmock(requests).should_receive("get").with_args(url).and_return(
+    flexmock(requests.Session).should_receive("get").with_args(
+        url, headers={}, timeout=HTTP_REQUEST_TIMEOUT
+    ).and_return(
         flexmock(
             json=lambda: {
                 "id": pipeline_id,
                 "state": TestingFarmResult.passed,
                 "created": "2021-11-01 17:22:36.061250",
             },
-            ok=lambda: True,
+            ok=True,
+            status_code=200,
+            headers={},
         )
     ).once()
     flexmock(TestingFarmResultsEvent).should_receive("get_packages_config").and_return(
@@ -698,4 +847,49 @@ def test_check_pending_testing_farm_runs_identifiers(identifier):
         )
     )
     flexmock(TestingFarmResultsHandler).should_receive("run_job").and_return().once()
+    flexmock(Pushgateway).should_receive("push").once()
     check_pending_testing_farm_runs()
+
+
+def test_testing_farm_runs_poller_not_modified():
+    pipeline_id = "1"
+    url = "https://api.dev.testing-farm.io/v0.1/requests/1"
+    details = {"id": pipeline_id, "state": TestingFarmResult.running}
+    flexmock(requests.Session).should_receive("get").with_args(
+        url, headers={}, timeout=HTTP_REQUEST_TIMEOUT
+    ).and_return(
+        flexmock(
+            json=lambda: details,
+            ok=True,
+            status_code=200,
+            headers={"ETag": '"abc"'},
+        )
+    ).once()
+    flexmock(requests.Session).should_receive("get").with_args(
+        url, headers={"If-None-Match": '"abc"'}, timeout=HTTP_REQUEST_TIMEOUT
+    ).and_return(flexmock(ok=False, status_code=304, headers={})).once()
+
+    poller = TestingFarmRunsPoller(concurrency=2, rate_limit=0)
+    assert poller.get_details_for([pipeline_id]) == {pipeline_id: details}
+    assert poller.get_details_for([pipeline_id]) == {pipeline_id: details}
+
+    TestingFarmRunsPoller.forget_other_pipelines([])
+    assert not TestingFarmRunsPoller._cache
+
+
+def test_rate_limiter():
+    sleeps = []
+    flexmock(packit_service.worker.helpers.build.babysit.time).should_receive(
+        "monotonic"
+    ).and_return(100.0)
+    flexmock(packit_service.worker.helpers.build.babysit.time).should_receive(
+        "sleep"
+    ).replace_with(sleeps.append)
+
+    rate_limiter = RateLimiter(rate=10)
+    for _ in range(3):
+        rate_limiter.wait("https://api.dev.testing-farm.io/v0.1/requests/1")
+    # a different host has its own limit
+    rate_limiter.wait("https://api.testing-farm.io/v0.1/requests/1")
+
+    assert sleeps == [pytest.approx(0.1), pytest.approx(0.2)]
@@ -1,39 +1,228 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from datetime import datetime, timezone
+import gzip
+import io
+import tarfile
+from base64 import b64encode
+from hashlib import md5
+from contextlib import nullcontext
 from pathlib import Path
 
+import pytest
+from boto3 import client as boto3_client
 from boto3.s3.transfer import S3Transfer
+from botocore.stub import Stubber
 from flexmock import flexmock
+from packit.exceptions import PackitCommandFailedError
 
-from packit_service.models import SRPMBuildModel, ProjectEventModel
+from packit_service.models import (
+    PackageConfigModel,
+    SRPMBuildModel,
+    ProjectEventModel,
+)
 from packit_service.worker import database
 
 
 def test_cleanup_old_srpm_build_logs():
-    srpm_build = flexmock(id=1, build_submitted_time=datetime.now(timezone.utc))
-    flexmock(srpm_build).should_receive("set_logs").with_args(None).once()
-    flexmock(srpm_build).should_receive("set_url").with_args(None).once()
-    flexmock(SRPMBuildModel).should_receive("get_older_than").and_return(
-        [srpm_build]
-    ).once()
+    query = flexmock()
+    flexmock(SRPMBuildModel).should_receive("get_older_than").and_return(query).times(2)
+    flexmock(database).should_receive("update_batch").with_args(
+        query, {"logs": None, "url": None}, 1000
+    ).and_return(1000).and_return(10).times(2)
+    flexmock(database).should_receive("sleep").with_args(0.5).once()
     database.discard_old_srpm_build_logs()
 
 
 def test_discard_old_package_configs():
-    event_model = flexmock(id=1)
-    flexmock(event_model).should_receive("set_packages_config").with_args(None).once()
+    events_query = flexmock()
+    configs_query = flexmock()
     flexmock(ProjectEventModel).should_receive(
         "get_older_than_with_packages_config"
-    ).and_return([event_model]).once()
+    ).and_return(events_query).once()
+    flexmock(PackageConfigModel).should_receive("get_unreferenced").and_return(
+        configs_query
+    ).once()
+    flexmock(database).should_receive("update_batch").with_args(
+        events_query, {"packages_config_hash": None}, 1000
+    ).and_return(1).once()
+    flexmock(database).should_receive("update_batch").with_args(
+        configs_query, None, 1000
+    ).and_return(1).once()
     database.discard_old_package_configs()
 
 
-def test_backup():
+def test_retention_settings(monkeypatch):
+    monkeypatch.setenv("RETENTION_BATCH_SIZE", "10")
+    monkeypatch.setenv("RETENTION_BATCH_PAUSE", "2.5")
+    query = flexmock()
+    flexmock(database).should_receive("update_batch").with_args(
+        query, {"logs": None}, 10
+    ).and_return(10).and_return(10).and_return(0).times(3)
+    flexmock(database).should_receive("sleep").with_args(2.5).times(2)
+
+    job = database.RetentionJob(name="job", query=lambda: query, values={"logs": None})
+    assert database.run_retention_jobs([job]) == {"job": 20}
+
+
+def test_retention_dry_run(monkeypatch):
+    monkeypatch.setenv("RETENTION_DRY_RUN", "true")
+    flexmock(database).should_receive("update_batch").never()
+
+    job = database.RetentionJob(
+        name="job",
+        query=lambda: flexmock().should_receive("count").and_return(42).mock(),
+        values=None,
+    )
+    assert database.run_retention_jobs([job]) == {"job": 42}
+
+
+def test_backup(monkeypatch):
+    monkeypatch.setenv("DATABASE_BACKUP_STREAMING", "false")
     flexmock(database).should_receive("is_aws_configured").once().and_return(True)
     flexmock(database).should_receive("dump_to").once()
     flexmock(database).should_receive("gzip_file").once().and_return(Path("xyz"))
     flexmock(S3Transfer).should_receive("upload_file").once()
     flexmock(Path).should_receive("unlink").twice()
     database.backup()
+
+
+@pytest.mark.parametrize(
+    "jobs, key",
+    [
+        pytest.param(None, "packit_database_packit.sql.gz", id="plain"),
+        pytest.param("4", "packit_database_packit.tar.gz", id="parallel"),
+    ],
+)
+def test_backup_streaming(monkeypatch, jobs, key):
+    if jobs:
+        monkeypatch.setenv("DATABASE_BACKUP_JOBS", jobs)
+    flexmock(database, DB_NAME="packit")
+    flexmock(database).should_receive("is_aws_configured").and_return(True)
+    flexmock(database).should_receive("dump_to").never()
+    flexmock(database).should_receive("stream_backup_to_s3").with_args(
+        key, jobs=int(jobs or 1)
+    ).once()
+    database.backup()
+
+
+def etag(*parts: bytes) -> str:
+    return f'"{md5(b"".join(md5(part).digest() for part in parts)).hexdigest()}-{len(parts)}"'
+
+
+@pytest.fixture()
+def s3():
+    s3 = boto3_client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="key",
+        aws_secret_access_key="secret",
+    )
+    with Stubber(s3) as stubber:
+        stubber.add_response(
+            "create_multipart_upload",
+            {"UploadId": "upload"},
+            {"Bucket": "bucket", "Key": "key"},
+        )
+        yield s3, stubber
+        stubber.assert_no_pending_responses()
+
+
+def expect_part(stubber, number: int, data: bytes):
+    stubber.add_response(
+        "upload_part",
+        {"ETag": f'"{md5(data).hexdigest()}"'},
+        {
+            "Bucket": "bucket",
+            "Key": "key",
+            "UploadId": "upload",
+            "PartNumber": number,
+            "Body": data,
+            "ContentMD5": b64encode(md5(data).digest()).decode(),
+        },
+    )
+
+
+def test_s3_multipart_upload(s3):
+    s3, stubber = s3
+    expect_part(stubber, 1, b"abcd")
+    expect_part(stubber, 2, b"efgh")
+    expect_part(stubber, 3, b"ij")
+    stubber.add_response(
+        "complete_multipart_upload",
+        {"ETag": etag(b"abcd", b"efgh", b"ij")},
+        {
+            "Bucket": "bucket",
+            "Key": "key",
+            "UploadId": "upload",
+            "MultipartUpload": {
+                "Parts": [
+                    {"ETag": f'"{md5(data).hexdigest()}"', "PartNumber": number}
+                    for number, data in enumerate((b"abcd", b"efgh", b"ij"), start=1)
+                ]
+            },
+        },
+    )
+
+    with database.S3MultipartUpload(s3, "bucket", "key", part_size=4) as upload:
+        upload.write(b"abc")
+        # at most a single part is buffered
+        assert len(upload.buffer) == 3
+        upload.write(b"defghij")
+        assert len(upload.buffer) == 2
+
+
+def test_s3_multipart_upload_etag_mismatch(s3):
+    s3, stubber = s3
+    expect_part(stubber, 1, b"abcd")
+    stubber.add_response("complete_multipart_upload", {"ETag": etag(b"abce")})
+
+    with pytest.raises(database.PackitBackupException):
+        with database.S3MultipartUpload(s3, "bucket", "key", part_size=4) as upload:
+            upload.write(b"abcd")
+
+
+def test_s3_multipart_upload_aborted(s3):
+    s3, stubber = s3
+    expect_part(stubber, 1, b"abcd")
+    stubber.add_response(
+        "abort_multipart_upload",
+        {},
+        {"Bucket": "bucket", "Key": "key", "UploadId": "upload"},
+    )
+
+    with pytest.raises(PackitCommandFailedError):
+        with database.S3MultipartUpload(s3, "bucket", "key", part_size=4) as upload:
+            upload.write(b"abcdef")
+            database.stream_gzipped_output(["false"], upload)
+
+
+def test_stream_gzipped_output(tmp_path):
+    dump = tmp_path / "dump.sql"
+    dump.write_bytes(b"SELECT 1;\n" * 10000)
+    upload = database.S3MultipartUpload(None, "bucket", "key")
+    flexmock(upload).should_receive("_upload_part").never()
+
+    database.stream_gzipped_output(["cat", str(dump)], upload, read_size=1000)
+
+    assert gzip.decompress(bytes(upload.buffer)) == dump.read_bytes()
+
+
+def test_stream_backup_to_s3_in_parallel():
+    def dump_to(directory, *args):
+        assert args == ("--format=directory", "--jobs=4")
+        directory.mkdir()
+        (directory / "toc.dat").write_bytes(b"toc")
+
+    uploaded = io.BytesIO()
+    flexmock(database).should_receive("boto3_client").and_return(flexmock())
+    flexmock(database).should_receive("S3MultipartUpload").and_return(
+        nullcontext(uploaded)
+    )
+    flexmock(database).should_receive("dump_to").replace_with(dump_to).once()
+
+    database.stream_backup_to_s3("key", jobs=4)
+
+    uploaded.seek(0)
+    with tarfile.open(fileobj=uploaded, mode="r:gz") as tar:
+        assert tar.extractfile("dump/toc.dat").read() == b"toc"
@@ -287,8 +287,8 @@ def test_downstream_koji_build(sidetag_group):
         koji_target=koji_target if sidetag_group else None,
     ).and_return("")
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
     processing_results = SteveJobs().process_message(distgit_commit_event())
     event_dict, job, job_config, package_config = get_parameters_from_results(
         processing_results
@@ -377,8 +377,8 @@ def test_downstream_koji_build_failure_no_issue():
         koji_target=None,
     ).and_raise(PackitException, "Some error")
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     pagure_project_mock.should_receive("get_issue_list").times(0)
     pagure_project_mock.should_receive("create_issue").times(0)
@@ -470,8 +470,8 @@ def test_downstream_koji_build_failure_issue_created():
         koji_target=None,
     ).and_raise(PackitException, "Some error")
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     issue_project_mock = flexmock(GithubProject)
     issue_project_mock.should_receive("get_issue_list").and_return([]).once()
@@ -571,8 +571,8 @@ def test_downstream_koji_build_failure_issue_comment():
         koji_target=None,
     ).and_raise(PackitException, "Some error")
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     issue_project_mock = flexmock(GithubProject)
     issue_project_mock.should_receive("get_issue_list").and_return(
@@ -760,8 +760,8 @@ def test_downstream_koji_build_where_multiple_branches_defined(jobs_config):
         koji_target=None,
     ).once().and_return("")
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     processing_results = SteveJobs().process_message(distgit_commit_event())
     assert len(processing_results) == 1
@@ -543,8 +543,8 @@ def test_issue_comment_retrigger_koji_build_handler(
         "local_project"
     ).and_return(flexmock())
     flexmock(RetriggerDownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     results = run_retrigger_downstream_koji_build(
         package_config=package_config,
@@ -609,8 +609,8 @@ def test_issue_comment_retrigger_koji_build_error_msg(
         comment_to_existing=msg,
     ).once()
     flexmock(RetriggerDownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     run_retrigger_downstream_koji_build(
         package_config=package_config,
@@ -3,6 +3,7 @@
 
 import json
 
+import koji
 import pytest
 from celery.canvas import group
 from flexmock import flexmock
@@ -219,8 +220,8 @@ def test_koji_build_error_msg(distgit_push_packit):
         comment_to_existing=msg,
     ).once()
     flexmock(DownstreamKojiBuildHandler).should_receive(
-        "is_already_triggered"
-    ).and_return(False)
+        "get_already_triggered_branches"
+    ).and_return(set())
 
     run_downstream_koji_build(
         package_config=package_config,
@@ -232,21 +233,54 @@ def test_koji_build_error_msg(distgit_push_packit):
 @pytest.mark.parametrize(
     "build_info, result",
     [
-        (None, False),
-        ({"state": 0}, True),
-        ({"state": 1}, True),
-        ({"state": 2}, False),
+        (None, set()),
+        ({"state": 0}, {"rawhide", "f40"}),
+        ({"state": 1}, {"rawhide", "f40"}),
+        ({"state": 2}, set()),
     ],
 )
-def test_is_already_triggered(build_info, result):
+def test_get_already_triggered_branches(build_info, result):
+    nvrs = {"rawhide": "package-1.0-1.fc41", "f40": "package-1.0-1.fc40"}
     flexmock(PackitAPI).should_receive("dg").and_return(
-        flexmock(get_nvr=lambda branch: "some-nvr")
+        flexmock(get_nvr=lambda branch: nvrs[branch])
     )
-    flexmock(KojiHelper).should_receive("get_build_info").and_return(build_info)
+    session = koji.ClientSession("https://koji.example.com/kojihub")
+    # all the builds are looked up in a single call
+    flexmock(session).should_receive("_callMethod").with_args(
+        "multiCall",
+        (
+            [
+                {"methodName": "getBuild", "params": (nvr,)}
+                for nvr in sorted(nvrs.values())
+            ],
+        ),
+        {},
+    ).and_return([[build_info]] * len(nvrs)).once()
 
-    DownstreamKojiBuildHandler(
+    handler = DownstreamKojiBuildHandler(
         package_config=flexmock(),
         job_config=flexmock(),
         event={},
         celery_task=flexmock(),
-    ).is_already_triggered("rawhide") is result
+    )
+    handler._koji_helper = KojiHelper(session=session)
+    assert handler.get_already_triggered_branches(list(nvrs)) == result
+
+
+def test_get_builds_info_fault():
+    session = koji.ClientSession("https://koji.example.com/kojihub")
+    flexmock(session).should_receive("_callMethod").and_return(
+        [{"faultCode": 1000, "faultString": "error"}, [{"state": 1}]]
+    ).once()
+
+    handler = DownstreamKojiBuildHandler(
+        package_config=flexmock(),
+        job_config=flexmock(),
+        event={},
+        celery_task=flexmock(),
+    )
+    handler._koji_helper = KojiHelper(session=session)
+    assert handler.get_builds_info(["a-1-1", "b-1-1"]) == {
+        "a-1-1": None,
+        "b-1-1": {"state": 1},
+    }
@@ -18,6 +18,7 @@ from packit_service.models import (
     ProjectReleaseModel,
     PullRequestModel,
 )
+from packit_service.worker.events.event import Event
 from packit_service.worker.events.enums import (
     IssueCommentAction,
     PullRequestAction,
@@ -154,6 +155,25 @@ def test_parse_pr(github_pr_webhook):
     assert event_object.packages_config
 
 
+def test_get_dict_cached(github_pr_webhook):
+    event_object = Parser.parse_event(github_pr_webhook)
+
+    event_dict = event_object.get_dict()
+    assert event_dict["event_type"] == "PullRequestGithubEvent"
+    assert "_serialized" not in event_dict
+    flexmock(Event).should_receive("make_serializable").never()
+    # the cached dictionary is not shared
+    event_dict["commit_sha"] = "0" * 40
+    assert (
+        event_object.get_dict()["commit_sha"]
+        == "528b803be6f93e19ca4130bf4976f2800a3004c4"
+    )
+
+    # a change of the event is serialized again
+    event_object.commit_sha = "1" * 40
+    assert event_object.__dict__["_serialized"] is None
+
+
 def test_parse_github_push(github_push_branch):
     event_object = Parser.parse_event(github_push_branch)
 
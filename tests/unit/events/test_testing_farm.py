@@ -10,6 +10,7 @@ from ogr.services.github import GithubProject
 
 from packit_service.models import (
     CoprBuildTargetModel,
+    PackageConfigModel,
     TFTTestRunTargetModel,
     TestingFarmResult,
     get_submitted_time_from_model,
@@ -58,18 +59,20 @@ def test_parse_testing_farm_notification(
         .once()
         .mock()
         .should_receive("get_project_event_model")
-        .and_return(
-            flexmock(
-                pr_id=10,
-                packages_config={
-                    "specfile_path": "path.spec",
-                    "downstream_package_name": "packit",
-                },
-            )
-        )
+        .and_return(flexmock(pr_id=10, packages_config_hash="stored-config-hash"))
         .once()
         .mock()
     )
+    flexmock(PackageConfigModel).should_receive("get_by_hash").with_args(
+        "stored-config-hash"
+    ).and_return(
+        flexmock(
+            config={
+                "specfile_path": "path.spec",
+                "downstream_package_name": "packit",
+            }
+        )
+    )
     event_object = Parser.parse_event(testing_farm_notification)
 
     assert isinstance(event_object, TestingFarmResultsEvent)
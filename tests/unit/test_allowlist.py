@@ -15,6 +15,7 @@ from packit.api import PackitAPI
 from packit.config import CommonPackageConfig, JobType, JobConfig, JobConfigTriggerType
 from packit.copr_helper import CoprHelper
 from packit.local_project import LocalProject
+from packit_service.cache import AllowlistIndex
 from packit_service.config import ServiceConfig
 from packit_service.constants import (
     DOCS_APPROVAL_URL,
@@ -113,14 +114,11 @@ def allowlist_entries():
 
 
 def mock_model(entries, namespaces):
-    for queried_namespace in namespaces:
-        (
-            flexmock(DBAllowlist)
-            .should_receive("get_namespace")
-            .with_args(queried_namespace)
-            .and_return(entries.get(queried_namespace))
-            .ordered()
-        )
+    # only the entries on the checked path are loaded into the index
+    flexmock(DBAllowlist).should_receive("get_all").and_return(
+        [entries[namespace] for namespace in namespaces if entries.get(namespace)]
+    )
+    AllowlistIndex.invalidate()
 
 
 @pytest.fixture()
@@ -228,7 +226,7 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
 
 
 @pytest.mark.parametrize(
-    "event, mocked_model, approved, user_namespace",
+    "event, mocked_model, approved",
     [
         (
             PullRequestCommentGithubEvent(
@@ -246,7 +244,6 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
             ),
             ("github.com/foo/bar.git", "github.com/foo", "github.com"),
             False,
-            "github.com/bar",
         ),
         (
             IssueCommentEvent(
@@ -262,7 +259,6 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
             ),
             ("github.com/foo/bar.git", "github.com/foo", "github.com"),
             False,
-            "github.com/baz",
         ),
         (
             PullRequestCommentGithubEvent(
@@ -280,7 +276,6 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
             ),
             ("github.com/fero/dwm.git", "github.com/fero"),
             True,
-            "github.com/lojzo",
         ),
         (
             IssueCommentEvent(
@@ -299,7 +294,6 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
                 "gitlab.com/packit-service/src",
             ),
             True,
-            "gitlab.com/lojzo",
         ),
         (
             PullRequestCommentGithubEvent(
@@ -317,18 +311,12 @@ def test_is_denied(allowlist, account_name, mocked_model, is_denied):
             ),
             [],
             True,
-            "github.com/admin",
         ),
     ],
     indirect=["mocked_model"],
 )
-def test_check_and_report_calls_method(
-    allowlist, event, mocked_model, approved, user_namespace
-):
+def test_check_and_report_calls_method(allowlist, event, mocked_model, approved):
     gp = GitProject("", GitService(), "")
-    flexmock(DBAllowlist).should_receive("get_namespace").with_args(
-        user_namespace
-    ).and_return()
     flexmock(gp).should_receive("can_merge_pr").with_args(event.actor).and_return(
         approved
     )
@@ -640,13 +628,6 @@ def test_check_and_report(
         flexmock(EventData).should_receive("from_event_dict").and_return(
             flexmock(commit_sha="", pr_id="0")
         )
-        actor_namespace = (
-            f"{'github.com' if isinstance(event.project, GithubProject) else 'gitlab.com'}"
-            f"/{event.actor}"
-        )
-        flexmock(DBAllowlist).should_receive("get_namespace").with_args(
-            actor_namespace
-        ).and_return()
         if isinstance(event, PullRequestGithubEvent) and not is_valid:
             notification_project_mock = flexmock()
             notification_project_mock.should_receive("get_issue_list").with_args(
@@ -757,9 +738,9 @@ def test_check_and_report_actor_denied_issue(allowlist):
     flexmock(EventData).should_receive("from_event_dict").and_return(
         flexmock(commit_sha="0000000", pr_id="0")
     )
-    flexmock(DBAllowlist).should_receive("get_namespace").with_args(
-        "github.com/bar"
-    ).and_return(flexmock(status=AllowlistStatus.denied))
+    flexmock(DBAllowlist).should_receive("get_all").and_return(
+        [flexmock(namespace="github.com/bar", status=AllowlistStatus.denied)]
+    )
     flexmock(CoprHelper).should_receive("get_valid_build_targets").and_return(
         {
             "fedora-rawhide-x86_64",
@@ -824,9 +805,9 @@ def test_check_and_report_actor_pull_request(
     flexmock(EventData).should_receive("from_event_dict").and_return(
         flexmock(commit_sha="", pr_id="0")
     )
-    flexmock(DBAllowlist).should_receive("get_namespace").with_args(
-        "github.com/bar"
-    ).and_return(flexmock(status=AllowlistStatus.denied))
+    flexmock(DBAllowlist).should_receive("get_all").and_return(
+        [flexmock(namespace="github.com/bar", status=AllowlistStatus.denied)]
+    )
     flexmock(LocalProject).should_receive("refresh_the_arguments").and_return(None)
     flexmock(LocalProject).should_receive("checkout_pr").and_return(None)
     flexmock(StatusReporter).should_receive("report").with_args(
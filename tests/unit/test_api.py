@@ -1,11 +1,22 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import gzip
+import json
 from datetime import datetime, timezone
 
 import pytest
+from flask import Flask, Response
+from flexmock import flexmock
+from werkzeug.exceptions import BadRequest
 
-from packit_service.models import optional_time
+from packit_service.models import GitProjectModel, ProjectEventModel, optional_time
+from packit_service.service.api.export import export_lines, gzip_chunks
+from packit_service.service.api.parsers import (
+    cursor,
+    encode_cursor,
+    set_range_headers,
+)
 from packit_service.service.api.system import get_commit_from_version
 from packit_service.service.api.usage import process_timestamps
 
@@ -68,3 +79,78 @@ def test_get_commit_from_version(version, commit):
 )
 def test_process_timestamps(start, end, expected_result):
     assert process_timestamps(start, end) == expected_result
+
+
+@pytest.mark.parametrize(
+    "query, types, expected",
+    [
+        ("", (int,), None),
+        (f"?after={encode_cursor(42)}", (int,), 42),
+        (f"?after={encode_cursor('packit', 7)}", (str, int), ("packit", 7)),
+    ],
+)
+def test_cursor(query, types, expected):
+    with Flask(__name__).test_request_context(f"/{query}"):
+        assert cursor(*types) == expected
+
+
+@pytest.mark.parametrize(
+    "token, types",
+    [
+        ("not-base64!", (int,)),
+        (encode_cursor("42"), (int,)),
+        (encode_cursor(42), (str, int)),
+    ],
+)
+def test_cursor_invalid(token, types):
+    with Flask(__name__).test_request_context(f"/?after={token}"):
+        with pytest.raises(BadRequest):
+            cursor(*types)
+
+
+@pytest.mark.parametrize(
+    "ids, next_range",
+    [
+        ([5, 4, 3], f"builds after={encode_cursor(3)}"),
+        ([5, 4], None),
+    ],
+)
+def test_set_range_headers(ids, next_range):
+    resp = Response()
+    entries = [type("Entry", (), {"id": id_})() for id_ in ids]
+    set_range_headers(resp, "builds", 0, 3, entries)
+    assert resp.headers["Content-Range"] == "builds 1-3/*"
+    assert resp.headers.get("Next-Range") == next_range
+
+
+def test_export_lines():
+    project_event = flexmock(id=1, commit_sha="abcdef")
+    group = flexmock(runs=[flexmock(project_event=project_event)])
+    entries = [flexmock(id=id_, group_of_targets=group) for id_ in (1, 2)]
+    project = GitProjectModel(
+        namespace="packit", repo_name="ogr", project_url="https://github.com/packit/ogr"
+    )
+    # the project event objects are loaded once per batch
+    flexmock(ProjectEventModel).should_receive("get_project_event_objects").and_return(
+        {1: flexmock(project=project)}
+    ).times(2)
+
+    chunks = list(
+        export_lines(
+            [entries, [flexmock(id=3, group_of_targets=None)]],
+            lambda entry: {"packit_id": entry.id},
+        )
+    )
+
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [line["packit_id"] for line in lines] == [1, 2, 3]
+    assert lines[0]["commit_sha"] == "abcdef"
+    assert lines[0]["repo_name"] == "ogr"
+    assert lines[2]["commit_sha"] is None
+    assert "repo_name" not in lines[2]
+
+
+def test_gzip_chunks():
+    chunks = ['{"packit_id": 1}\n', '{"packit_id": 2}\n']
+    assert gzip.decompress(b"".join(gzip_chunks(chunks))).decode() == "".join(chunks)
@@ -11,6 +11,7 @@ import packit_service
 from packit.config.job_config import JobConfigTriggerType
 from packit_service.config import ServiceConfig
 from packit_service.models import (
+    PackageConfigModel,
     VMImageBuildTargetModel,
     VMImageBuildStatus,
     ProjectEventModelType,
@@ -147,15 +148,7 @@ def test_update_vm_image_build(stop_babysitting, build_status, vm_image_builder_
             status=None,
             runs=[
                 flexmock(
-                    project_event=flexmock(
-                        packages_config={
-                            "downstream_package_name": "package",
-                            "specfile_path": "path",
-                            "jobs": [
-                                {"job": "vm_image_build", "trigger": "pull_request"}
-                            ],
-                        }
-                    )
+                    project_event=flexmock(packages_config_hash="stored-config-hash")
                 )
                 .should_receive("get_project_event_object")
                 .and_return(db_project_object)
@@ -166,6 +159,17 @@ def test_update_vm_image_build(stop_babysitting, build_status, vm_image_builder_
         .with_args(build_status)
         .mock()
     )
+    flexmock(PackageConfigModel).should_receive("get_by_hash").with_args(
+        "stored-config-hash"
+    ).and_return(
+        flexmock(
+            config={
+                "downstream_package_name": "package",
+                "specfile_path": "path",
+                "jobs": [{"job": "vm_image_build", "trigger": "pull_request"}],
+            }
+        )
+    )
     flexmock(VMImageBuildTargetModel).should_receive("get_by_build_id").with_args(
         1
     ).and_return(vm_image_model)
@@ -0,0 +1,431 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+import redis
+from flexmock import flexmock
+
+from packit.config import PackageConfig
+from packit_service.cache import (
+    AllowlistIndex,
+    CatalogCache,
+    FasGroupsCache,
+    InMemoryStore,
+    PackageConfigCache,
+    PackitTaskPayloadNotFoundException,
+    TaskPayloadStore,
+)
+from packit_service.worker.mixin import PackitAPIWithDownstreamMixin
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+PROJECT = flexmock(
+    service=flexmock(instance_url="https://github.com"),
+    namespace="packit",
+    repo="ogr",
+)
+
+PACKAGE_CONFIG = PackageConfig.get_from_dict(
+    {
+        "specfile_path": "ogr.spec",
+        "downstream_package_name": "python-ogr",
+        "jobs": [
+            {
+                "job": "copr_build",
+                "trigger": "pull_request",
+                "targets": ["fedora-all"],
+            },
+            {"job": "tests", "trigger": "pull_request", "targets": ["fedora-all"]},
+        ],
+    },
+    repo_name="ogr",
+)
+
+
+@pytest.mark.parametrize(
+    "reference,path,key",
+    [
+        (None, None, None),
+        ("main", None, None),
+        ("0.1.0", None, None),
+        (SHA[:7], None, None),
+        (SHA, None, f"packit:package-config:https://github.com/packit/ogr:{SHA}:"),
+        (
+            SHA,
+            ".distro/source-git.yaml",
+            "packit:package-config:https://github.com/packit/ogr:"
+            f"{SHA}:.distro/source-git.yaml",
+        ),
+    ],
+)
+def test_get_key(reference, path, key):
+    assert PackageConfigCache.get_key(PROJECT, reference, path) == key
+
+
+def test_cache_in_process():
+    cache = PackageConfigCache()
+    hits = cache.pushgateway.package_config_cache_hits._value.get()
+    misses = cache.pushgateway.package_config_cache_misses._value.get()
+    key = cache.get_key(PROJECT, SHA)
+    assert cache.get(key) == (False, None)
+
+    cache.set(key, PACKAGE_CONFIG)
+    assert cache.get(key) == (True, PACKAGE_CONFIG)
+    assert cache.pushgateway.package_config_cache_hits._value.get() == hits + 1
+    assert cache.pushgateway.package_config_cache_misses._value.get() == misses + 1
+
+
+def test_cache_shared_with_other_workers():
+    key = PackageConfigCache.get_key(PROJECT, SHA)
+    PackageConfigCache().set(key, PACKAGE_CONFIG)
+
+    cached, package_config = PackageConfigCache().get(key)
+    assert cached
+    assert (
+        package_config.get_raw_dict_with_defaults()
+        == PACKAGE_CONFIG.get_raw_dict_with_defaults()
+    )
+    assert package_config.get_package_config_views().keys() == {"python-ogr"}
+
+
+def test_cache_missing_config():
+    key = PackageConfigCache.get_key(PROJECT, SHA)
+    PackageConfigCache().set(key, None)
+
+    assert PackageConfigCache().get(key) == (True, None)
+
+
+def test_cache_missing_config_negative_ttl():
+    key = PackageConfigCache.get_key(PROJECT, SHA)
+    cache = PackageConfigCache(negative_ttl=0)
+    cache.set(key, None)
+
+    # e.g. the app has been installed in the meantime
+    assert cache.get(key) == (False, None)
+    assert PackageConfigCache().get(key) == (False, None)
+
+
+def test_cache_size_and_expiration():
+    cache = PackageConfigCache(maxsize=2, ttl=0)
+    keys = [cache.get_key(PROJECT, f"{i}" * 40) for i in range(3)]
+    for key in keys:
+        cache.set(key, PACKAGE_CONFIG)
+
+    assert len(cache.configs) <= 2
+    # expired in the shared store too
+    assert all(cache.get(key) == (False, None) for key in keys)
+
+
+def test_cache_store_errors_are_ignored():
+    flexmock(InMemoryStore).should_receive("set").and_raise(redis.ConnectionError)
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+    key = PackageConfigCache.get_key(PROJECT, SHA)
+
+    PackageConfigCache().set(key, PACKAGE_CONFIG)
+    assert PackageConfigCache().get(key) == (False, None)
+
+
+ALLOWLIST = [
+    ("github.com/packit", "approved_manually"),
+    ("github.com/packit/ogr.git", "denied"),
+    ("gitlab.com/packit-service/src", "waiting"),
+]
+
+
+@pytest.mark.parametrize(
+    "namespace,statuses",
+    [
+        ("github.com", []),
+        ("github.com/packit", [("github.com/packit", "approved_manually")]),
+        (
+            "github.com/packit/ogr.git",
+            [
+                ("github.com/packit/ogr.git", "denied"),
+                ("github.com/packit", "approved_manually"),
+            ],
+        ),
+        ("github.com/packit/packit.git", [("github.com/packit", "approved_manually")]),
+        ("github.com/packit-service/ogr.git", []),
+        (
+            "gitlab.com/packit-service/src/glibc.git",
+            [("gitlab.com/packit-service/src", "waiting")],
+        ),
+    ],
+)
+def test_allowlist_index_get_statuses(namespace, statuses):
+    assert AllowlistIndex(load=lambda: ALLOWLIST).get_statuses(namespace) == statuses
+
+
+def test_allowlist_index_reloaded_on_change():
+    allowlist = list(ALLOWLIST)
+    load = flexmock(call=lambda: allowlist)
+    load.should_call("call").twice()
+    index = AllowlistIndex(load=load.call)
+
+    assert index.get_statuses("github.com/foo") == []
+    allowlist.append(("github.com/foo", "approved_manually"))
+    # nothing announced, the loaded index is used
+    assert index.get_statuses("github.com/foo") == []
+
+    AllowlistIndex.invalidate()
+    assert index.get_statuses("github.com/foo") == [
+        ("github.com/foo", "approved_manually")
+    ]
+    assert index.get_statuses("github.com/foo") == [
+        ("github.com/foo", "approved_manually")
+    ]
+
+
+def test_allowlist_index_max_age():
+    load = flexmock(call=lambda: ALLOWLIST)
+    load.should_call("call").twice()
+    index = AllowlistIndex(load=load.call, max_age=0)
+
+    index.get_statuses("github.com/packit")
+    index.get_statuses("github.com/packit")
+
+
+def test_allowlist_index_store_errors():
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+    flexmock(InMemoryStore).should_receive("incr").and_raise(redis.ConnectionError)
+    load = flexmock(call=lambda: ALLOWLIST)
+    # without the version the loaded index is used until it gets too old
+    load.should_call("call").once()
+    index = AllowlistIndex(load=load.call)
+
+    AllowlistIndex.invalidate()
+    index.get_statuses("github.com/packit")
+    index.get_statuses("github.com/packit")
+
+
+def test_allowlist_index_store_errors_max_age():
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+    load = flexmock(call=lambda: ALLOWLIST)
+    load.should_call("call").twice()
+    index = AllowlistIndex(load=load.call, max_age=0)
+
+    index.get_statuses("github.com/packit")
+    index.get_statuses("github.com/packit")
+
+
+def test_task_payloads_passed_by_reference():
+    event = {"event_type": "PullRequestGithubEvent", "pr_id": 1}
+    key = TaskPayloadStore().put(event)
+    assert TaskPayloadStore.is_reference(key)
+    # the same payload is stored under the same key
+    assert TaskPayloadStore().put(dict(event)) == key
+
+    # other workers get it from the shared store
+    store = TaskPayloadStore()
+    resolved = store.resolve({"event": key, "job_config": {"job": "tests"}})
+    assert resolved == {"event": event, "job_config": {"job": "tests"}}
+    assert key in store.payloads
+
+    # the payload is not shared between the tasks
+    resolved["event"]["pr_id"] = 2
+    assert store.get(key) == event
+
+
+def test_task_payload_expired():
+    store = TaskPayloadStore(ttl=0)
+    key = store.put({"pr_id": 1})
+
+    with pytest.raises(PackitTaskPayloadNotFoundException):
+        TaskPayloadStore().get(key)
+
+
+def test_task_payload_stored_again():
+    producer = TaskPayloadStore()
+    key = producer.put({"pr_id": 1})
+    # expired or evicted from Redis
+    producer.store.delete(key)
+
+    assert producer.put({"pr_id": 1}) == key
+    assert TaskPayloadStore().get(key) == {"pr_id": 1}
+
+
+def test_task_payloads_stored_once_in_batch():
+    flexmock(InMemoryStore).should_call("set").once()
+    flexmock(json).should_call("dumps").once()
+    store = TaskPayloadStore()
+
+    with store.batch():
+        keys = {store.put({"pr_id": 1, "commit_sha": SHA}) for _ in range(3)}
+    assert len(keys) == 1
+
+
+def test_task_payload_ttl_refreshed():
+    store = TaskPayloadStore()
+    key = store.put({"pr_id": 1})
+    flexmock(InMemoryStore).should_call("expire").with_args(key, store.ttl).once()
+    flexmock(InMemoryStore).should_call("set").never()
+
+    # the value is not sent again
+    assert store.put({"pr_id": 1}) == key
+
+
+def test_task_payload_store_errors():
+    flexmock(InMemoryStore).should_receive("set").and_raise(redis.ConnectionError)
+    event = {"pr_id": 1}
+
+    assert TaskPayloadStore().put(event) == event
+
+
+def test_fas_groups_cached():
+    lookup = flexmock(call=lambda username: ["packager", "fedora-contributor"])
+    lookup.should_call("call").with_args("packager").once()
+    cache = FasGroupsCache()
+    hits = cache.pushgateway.fas_groups_cache_hits._value.get()
+
+    assert cache.get("packager", lookup.call) == ["packager", "fedora-contributor"]
+    assert cache.get("packager", lookup.call) == ["packager", "fedora-contributor"]
+    # other workers get them from the shared store
+    assert FasGroupsCache().get("packager", lookup.call) == [
+        "packager",
+        "fedora-contributor",
+    ]
+    assert cache.pushgateway.fas_groups_cache_hits._value.get() == hits + 2
+
+
+def test_fas_groups_negative_ttl():
+    lookup = flexmock(call=lambda username: None)
+    lookup.should_call("call").twice()
+    cache = FasGroupsCache(negative_ttl=0)
+
+    # failed lookups are not remembered for longer than the negative TTL
+    assert cache.get("unknown", lookup.call) is None
+    assert cache.get("unknown", lookup.call) is None
+
+
+def test_fas_groups_negative_cached():
+    lookup = flexmock(call=lambda username: None)
+    lookup.should_call("call").once()
+
+    assert FasGroupsCache().get("nobody", lookup.call) is None
+    assert FasGroupsCache().get("nobody", lookup.call) is None
+
+
+def test_fas_groups_invalidate():
+    lookup = flexmock(call=lambda username: ["fedora-contributor"])
+    lookup.should_call("call").twice()
+    cache = FasGroupsCache()
+
+    assert cache.get("new-packager", lookup.call) == ["fedora-contributor"]
+    cache.invalidate("new-packager")
+    assert FasGroupsCache().get("new-packager", lookup.call) == ["fedora-contributor"]
+
+
+@pytest.mark.parametrize(
+    "groups, is_packager, invalidated",
+    [
+        pytest.param(["packager"], True, False, id="packager"),
+        pytest.param(["fedora-contributor"], False, True, id="not-packager"),
+        pytest.param(None, False, False, id="failed-lookup"),
+    ],
+)
+def test_is_packager_invalidates_denial(groups, is_packager, invalidated):
+    flexmock(FasGroupsCache).should_receive("invalidate").with_args("user").times(
+        1 if invalidated else 0
+    )
+    checker = flexmock(get_fas_groups=lambda user: groups)
+
+    assert PackitAPIWithDownstreamMixin.is_packager(checker, "user") == is_packager
+
+
+def test_fas_groups_store_errors():
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+    flexmock(InMemoryStore).should_receive("set").and_raise(redis.ConnectionError)
+    lookup = flexmock(call=lambda username: ["packager"])
+    lookup.should_call("call").once()
+    cache = FasGroupsCache()
+
+    assert cache.get("packager", lookup.call) == ["packager"]
+    # still cached in the process
+    assert cache.get("packager", lookup.call) == ["packager"]
+
+
+def test_catalog_cached():
+    fetch = flexmock(call=lambda: ["fedora-rawhide-x86_64", "epel-9-x86_64"])
+    fetch.should_call("call").once()
+    cache = CatalogCache()
+
+    assert cache.get("copr-chroots", fetch.call) == {
+        "fedora-rawhide-x86_64",
+        "epel-9-x86_64",
+    }
+    assert cache.get("copr-chroots", fetch.call) == {
+        "fedora-rawhide-x86_64",
+        "epel-9-x86_64",
+    }
+    # other workers get it from the shared store
+    assert CatalogCache().get("copr-chroots", fetch.call) == {
+        "fedora-rawhide-x86_64",
+        "epel-9-x86_64",
+    }
+
+
+def test_catalog_stale_while_revalidate():
+    fetch = flexmock(call=lambda: None)
+    fetch.should_receive("call").and_return(
+        ["Fedora-38"], ["Fedora-38", "Fedora-39"]
+    ).one_by_one()
+    cache = CatalogCache(ttl=0, background_refresh=False)
+
+    assert cache.get("composes", fetch.call) == {"Fedora-38"}
+    # the stale catalog is served and refreshed for the next time
+    assert cache.get("composes", fetch.call) == {"Fedora-38"}
+    cache.ttl = 3600
+    assert cache.get("composes", fetch.call) == {"Fedora-38", "Fedora-39"}
+
+
+def test_catalog_refreshed_by_single_worker():
+    fetch = flexmock(call=lambda: ["Fedora-38"])
+    fetch.should_call("call").twice()
+    cache = CatalogCache(ttl=0, background_refresh=False)
+
+    cache.get("composes", fetch.call)
+    cache.get("composes", fetch.call)
+    # the refresh is locked for a while
+    cache.get("composes", fetch.call)
+    CatalogCache(ttl=0, background_refresh=False).get("composes", fetch.call)
+
+
+def fail():
+    raise RuntimeError("Testing Farm is down")
+
+
+@pytest.mark.parametrize(
+    "fetch",
+    [
+        pytest.param(lambda: None, id="failed"),
+        pytest.param(fail, id="exception"),
+    ],
+)
+def test_catalog_stale_served_on_error(fetch):
+    cache = CatalogCache(ttl=0, max_stale=0)
+    assert cache.get("composes", lambda: ["Fedora-38"]) == {"Fedora-38"}
+
+    assert cache.get("composes", fetch) == {"Fedora-38"}
+
+
+def test_catalog_fetch_failed():
+    cache = CatalogCache()
+
+    assert cache.get("composes", lambda: None) is None
+    with pytest.raises(RuntimeError):
+        cache.get("composes", fail)
+    # failures are not cached
+    assert cache.get("composes", lambda: ["Fedora-38"]) == {"Fedora-38"}
+
+
+def test_catalog_store_errors():
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+    flexmock(InMemoryStore).should_receive("set").and_raise(redis.ConnectionError)
+    fetch = flexmock(call=lambda: ["Fedora-38"])
+    fetch.should_call("call").once()
+    cache = CatalogCache()
+
+    assert cache.get("composes", fetch.call) == {"Fedora-38"}
+    assert cache.get("composes", fetch.call) == {"Fedora-38"}
@@ -347,3 +347,52 @@ def test_create_issue_if_needed(
         project, title, message, comment_to_existing
     )
     assert check(issue_created)
+
+
+@pytest.mark.parametrize(
+    "reference,fetches",
+    [
+        ("0123456789abcdef0123456789abcdef01234567", 1),
+        ("main", 3),
+    ],
+)
+def test_get_package_config_from_repo_cached(reference, fetches):
+    project = flexmock(
+        service=flexmock(instance_url="https://github.com"),
+        namespace="packit",
+        repo="ogr",
+        full_repo_name="packit/ogr",
+    )
+    package_config = flexmock(get_raw_dict_with_defaults=lambda: {"jobs": []})
+    flexmock(config).should_receive("get_package_config_from_repo").with_args(
+        project=project, ref=reference, package_config_path=None
+    ).times(fetches).and_return(package_config)
+
+    for _ in range(3):
+        assert (
+            PackageConfigGetter.get_package_config_from_repo(
+                project=project, reference=reference
+            )
+            is package_config
+        )
+
+
+def test_get_package_config_from_repo_cached_not_found():
+    """Missing config is cached, but still reported."""
+    project = flexmock(
+        service=flexmock(instance_url="https://github.com"),
+        namespace="packit",
+        repo="ogr",
+        full_repo_name="packit/ogr",
+    )
+    flexmock(config).should_receive("get_package_config_from_repo").once().and_return(
+        None
+    )
+    flexmock(PackageConfigGetter).should_receive("create_issue_if_needed").twice()
+
+    for _ in range(2):
+        with pytest.raises(PackitConfigException):
+            PackageConfigGetter.get_package_config_from_repo(
+                project=project,
+                reference="0123456789abcdef0123456789abcdef01234567",
+            )
@@ -66,6 +66,7 @@ from packit_service.worker.monitoring import Pushgateway
 from packit_service.worker.parser import Parser
 from packit_service.worker.reporting import (
     BaseCommitStatus,
+    CheckRunBuffer,
     StatusReporterGithubChecks,
 )
 from tests.spellbook import DATA_DIR
@@ -337,6 +338,7 @@ def test_run_copr_build_from_source_script(github_pr_event, srpm_build_deps):
     )
     handler._copr_build_helper = helper
     assert handler.run()["success"]
+    CheckRunBuffer.flush_all()
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,126 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+import redis
+from flexmock import flexmock
+
+from packit_service.config import ServiceConfig
+from packit_service.cache import InMemoryStore
+from packit_service.deduplication import EventDeduplicator, get_pr_head_from_webhook
+from packit_service.worker.jobs import SteveJobs
+from packit_service.worker.monitoring import Pushgateway
+from packit_service.worker.parser import Parser
+from tests.spellbook import DATA_DIR
+
+GITHUB_PR = json.loads((DATA_DIR / "webhooks" / "github" / "pr.json").read_text())
+GITLAB_MR = json.loads(
+    (DATA_DIR / "webhooks" / "gitlab" / "mr_update_event.json").read_text()
+)
+
+
+def test_in_memory_store_expiration():
+    store = InMemoryStore()
+    assert store.set("key", "value", ttl=10, only_new=True)
+    assert not store.set("key", "other", ttl=10, only_new=True)
+    assert store.get("key") == "value"
+
+    assert store.set("key", "other", ttl=0)
+    assert store.get("key") is None
+    assert store.set("key", "value", ttl=10, only_new=True)
+
+
+def test_register_delivery():
+    deduplicator = EventDeduplicator(window=60)
+    assert deduplicator.register_delivery("uuid-1")
+    assert not deduplicator.register_delivery("uuid-1")
+    assert deduplicator.register_delivery("uuid-2")
+    # deliveries without an ID are never dropped
+    assert deduplicator.register_delivery(None)
+    assert deduplicator.register_delivery(None)
+
+
+def test_unregister_delivery():
+    deduplicator = EventDeduplicator(window=60)
+    assert deduplicator.register_delivery("uuid")
+    deduplicator.unregister_delivery("uuid")
+    assert deduplicator.register_delivery("uuid")
+    deduplicator.unregister_delivery(None)
+
+
+def test_deduplication_turned_off():
+    deduplicator = EventDeduplicator(window=0)
+    assert deduplicator.register_delivery("uuid")
+    assert deduplicator.register_delivery("uuid")
+
+    deduplicator.record_pr_head("https://github.com/a/b", 1, "new")
+    assert not deduplicator.is_superseded("https://github.com/a/b", 1, "old")
+
+
+def test_store_errors_are_ignored():
+    flexmock(InMemoryStore).should_receive("set").and_raise(redis.ConnectionError)
+    flexmock(InMemoryStore).should_receive("get").and_raise(redis.ConnectionError)
+
+    deduplicator = EventDeduplicator(window=60)
+    assert deduplicator.register_delivery("uuid")
+    assert deduplicator.register_delivery("uuid")
+    deduplicator.record_pr_head("https://github.com/a/b", 1, "new")
+    assert not deduplicator.is_superseded("https://github.com/a/b", 1, "old")
+
+
+def test_is_superseded():
+    deduplicator = EventDeduplicator(window=60)
+    # nothing recorded yet
+    assert not deduplicator.is_superseded("https://github.com/a/b", 1, "old")
+
+    deduplicator.record_pr_head("https://github.com/a/b", 1, "old")
+    assert not deduplicator.is_superseded("https://github.com/a/b", 1, "old")
+
+    deduplicator.record_pr_head("https://github.com/a/b", 1, "new")
+    assert deduplicator.is_superseded("https://github.com/a/b", 1, "old")
+    assert not deduplicator.is_superseded("https://github.com/a/b", 1, "new")
+    # other pull requests are not affected
+    assert not deduplicator.is_superseded("https://github.com/a/b", 2, "old")
+
+
+@pytest.mark.parametrize(
+    "event,source,event_type",
+    [
+        (GITHUB_PR, "github", "pull_request"),
+        (GITLAB_MR, "gitlab", "Merge Request Hook"),
+    ],
+)
+def test_get_pr_head_from_webhook(event, source, event_type):
+    event_object = Parser.parse_event(event)
+    assert get_pr_head_from_webhook(event, source, event_type) == (
+        event_object.project_url,
+        event_object.pr_id,
+        event_object.commit_sha,
+    )
+
+
+def test_get_pr_head_from_webhook_not_pr():
+    assert get_pr_head_from_webhook(GITHUB_PR, "github", "push") is None
+    assert get_pr_head_from_webhook({}, "github", "pull_request") is None
+
+
+@pytest.mark.parametrize("superseded", [True, False])
+def test_process_message_superseded(superseded):
+    ServiceConfig.get_service_config().webhook_deduplication_window = 60
+    event_object = Parser.parse_event(GITHUB_PR)
+    EventDeduplicator(window=60).record_pr_head(
+        event_object.project_url,
+        event_object.pr_id,
+        "newer" if superseded else event_object.commit_sha,
+    )
+
+    flexmock(Pushgateway).should_receive("push").once()
+    flexmock(SteveJobs).should_receive("process").times(0 if superseded else 1)
+    counter = SteveJobs.pushgateway.events_superseded
+    before = counter._value.get()
+
+    SteveJobs.process_message(GITHUB_PR, source="github", event_type="pull_request")
+
+    assert counter._value.get() == before + (1 if superseded else 0)
@@ -3,14 +3,19 @@
 import json
 
 import pytest
+from celery import group
 from fasjson_client import Client
 from flexmock import flexmock
 
 from ogr.services.github import GithubService
 from packit.api import PackitAPI
+from packit.config import JobType
 from packit.config.notifications import NotificationsConfig
 from packit_service.config import PackageConfigGetter
+from packit_service.models import SyncReleaseStatus, SyncReleaseTargetStatus
 from packit_service.worker.events.event import EventData
+from packit_service.worker.handlers import distgit
+from packit_service.worker.handlers.abstract import TaskName
 from packit_service.worker.handlers.distgit import (
     ProposeDownstreamHandler,
     DownstreamKojiBuildHandler,
@@ -132,3 +137,122 @@ def test_pull_from_upstream_auth_method():
     flexmock(AbstractSyncReleaseHandler).should_receive("run").once()
     flexmock(GithubService).should_receive("reset_auth_method").once()
     handler.run()
+
+
+def sync_release_targets(**statuses):
+    return [
+        flexmock(id=i, branch=branch, status=status)
+        for i, (branch, status) in enumerate(statuses.items())
+    ]
+
+
+def test_sync_release_run_in_parallel():
+    run_model = flexmock(
+        id=123,
+        sync_release_targets=sync_release_targets(
+            f40=SyncReleaseTargetStatus.queued, f41=SyncReleaseTargetStatus.queued
+        ),
+    )
+    handler = ProposeDownstreamHandler(
+        None, flexmock(type=JobType.propose_downstream), {"event_type": "unknown"}, None
+    )
+    flexmock(handler).should_receive("_get_or_create_sync_release_run").and_return(
+        run_model
+    )
+    flexmock(ProposeDownstreamHandler).should_receive("service_config").and_return(
+        flexmock(parallel_sync_release=True)
+    )
+    flexmock(distgit).should_receive("dump_package_config").and_return({})
+    flexmock(distgit).should_receive("dump_job_config").and_return({})
+    flexmock(handler).should_receive("run_for_target").never()
+    for branch in ("f40", "f41"):
+        flexmock(distgit).should_receive("signature").with_args(
+            TaskName.propose_downstream.value,
+            kwargs={
+                "package_config": {},
+                "job_config": {},
+                "event": {"event_type": "unknown"},
+                "sync_release_run_id": 123,
+                "branch": branch,
+            },
+        ).once()
+    flexmock(group).should_receive("apply_async").once()
+
+    assert handler.run()["success"]
+
+
+@pytest.mark.parametrize(
+    "current_statuses, finished_by_us, reported",
+    [
+        pytest.param(
+            {
+                "f40": SyncReleaseTargetStatus.error,
+                "f41": SyncReleaseTargetStatus.running,
+            },
+            None,
+            False,
+            id="other-branch-running",
+        ),
+        pytest.param(
+            {
+                "f40": SyncReleaseTargetStatus.error,
+                "f41": SyncReleaseTargetStatus.error,
+            },
+            True,
+            True,
+            id="last-branch",
+        ),
+        pytest.param(
+            {
+                "f40": SyncReleaseTargetStatus.error,
+                "f41": SyncReleaseTargetStatus.error,
+            },
+            False,
+            False,
+            id="reported-by-other-task",
+        ),
+    ],
+)
+def test_sync_release_run_for_branch(current_statuses, finished_by_us, reported):
+    run_model = flexmock(
+        id=123,
+        sync_release_targets=sync_release_targets(
+            f40=SyncReleaseTargetStatus.queued, f41=SyncReleaseTargetStatus.running
+        ),
+    )
+    run_model.should_receive("get_current_targets").and_return(
+        sync_release_targets(**current_statuses)
+    )
+    if finished_by_us is None:
+        run_model.should_receive("set_status_if_running").never()
+    else:
+        run_model.should_receive("set_status_if_running").with_args(
+            SyncReleaseStatus.error
+        ).and_return(finished_by_us).once()
+    run_model.should_receive("set_status").never()
+
+    handler = ProposeDownstreamHandler(
+        None,
+        flexmock(type=JobType.propose_downstream),
+        {"event_type": "unknown"},
+        None,
+        branch="f41",
+    )
+    flexmock(handler).should_receive("_get_or_create_sync_release_run").and_return(
+        run_model
+    )
+    flexmock(ProposeDownstreamHandler).should_receive("packit_api").and_return(
+        flexmock(dg=flexmock(local_project=flexmock(working_dir="dg", git_url="url")))
+    )
+    flexmock(distgit.shutil).should_receive("rmtree")
+    # only the target of the branch is run by this task
+    flexmock(handler).should_receive("run_for_target").with_args(
+        run_model, run_model.sync_release_targets[1]
+    ).and_return("failed").once()
+    flexmock(handler).should_receive("_report_errors_for_each_branch").times(
+        1 if reported else 0
+    )
+
+    results = handler.run()
+    assert not results["success"]
+    assert results["details"]["errors"] == {"f41": "failed"}
@@ -62,6 +62,12 @@ from packit_service.worker.handlers import (
     KojiTaskReportHandler,
     ProposeDownstreamHandler,
 )
+from packit_service.worker.handlers.abstract import (
+    MAP_JOB_TYPE_TO_HANDLER,
+    configured_as,
+    get_handlers_for_job_type,
+    reacts_to,
+)
 from packit_service.worker.handlers.bodhi import CreateBodhiUpdateHandler
 from packit_service.worker.handlers.distgit import DownstreamKojiBuildHandler
 from packit_service.worker.handlers.koji import (
@@ -2698,6 +2704,29 @@ def test_handler_doesnt_match_to_job(
     assert not SteveJobs(event).is_handler_matching_the_event(handler, allowed_handlers)
 
 
+def test_get_handlers_for_job_type():
+    handlers, required_handlers = get_handlers_for_job_type(
+        PullRequestGithubEvent, JobType.copr_build
+    )
+    assert handlers == (CoprBuildHandler,)
+    assert not required_handlers
+    assert get_handlers_for_job_type(PushPagureEvent, JobType.copr_build) == ((), ())
+
+    # a newly registered handler is found
+    @configured_as(job_type=JobType.copr_build)
+    @reacts_to(event=PullRequestGithubEvent)
+    class AnotherCoprBuildHandler(JobHandler):
+        pass
+
+    try:
+        assert get_handlers_for_job_type(
+            PullRequestGithubEvent, JobType.copr_build
+        ) == ((AnotherCoprBuildHandler, CoprBuildHandler), ())
+    finally:
+        MAP_JOB_TYPE_TO_HANDLER[JobType.copr_build].remove(AnotherCoprBuildHandler)
+        get_handlers_for_job_type.cache_clear()
+
+
 @pytest.mark.parametrize(
     "event_kls,job_config_trigger_type,jobs,result,kwargs",
     [
@@ -3537,6 +3566,9 @@ def test_monorepo_jobs_matching_event():
 
     assert original_ref == 2
     assert double_ref == 2
+    assert steve.get_handlers_and_configs() == {
+        handler: steve.get_config_for_handler_kls(handler) for handler in handlers
+    }
 
 
 def test_no_handlers_for_rerun():
@@ -3602,9 +3634,8 @@ def test_unapproved_jobs():
     jobs._service_config = flexmock()
 
     flexmock(jobs).should_receive("is_packit_config_present").and_return(True)
-    flexmock(jobs).should_receive("get_handlers_for_event").and_return([None])
-    flexmock(jobs).should_receive("get_config_for_handler_kls").and_return(
-        [None, None, None]
+    flexmock(jobs).should_receive("get_handlers_and_configs").and_return(
+        {None: [None, None, None]}
     )
     # TODO: »do not« mock the ‹Allowlist› directly!!!
     flexmock(Allowlist).should_receive("check_and_report").and_return(False)
@@ -0,0 +1,106 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import pytest
+from fasjson_client.errors import APIError
+from flexmock import flexmock
+from packit.exceptions import PackitCommandFailedError
+
+from packit_service.worker.kerberos import KerberosTicket
+
+
+def test_ticket_reused():
+    kinit = flexmock(call=lambda: None)
+    kinit.should_call("call").once()
+    flexmock(KerberosTicket).should_receive("get_lifetime").and_return(
+        None, 36000
+    ).one_by_one()
+
+    KerberosTicket.init(kinit.call)
+    KerberosTicket.init(kinit.call)
+    KerberosTicket.init(kinit.call)
+
+
+@pytest.mark.parametrize(
+    "lifetime, renewed",
+    [
+        pytest.param(36000, False, id="valid"),
+        pytest.param(60, True, id="about-to-expire"),
+        pytest.param(None, True, id="no-ticket"),
+    ],
+)
+def test_existing_ticket(lifetime, renewed):
+    kinit = flexmock(call=lambda: None)
+    kinit.should_call("call").times(1 if renewed else 0)
+    flexmock(KerberosTicket).should_receive("get_lifetime").and_return(lifetime)
+
+    KerberosTicket.init(kinit.call)
+
+
+def test_ticket_invalidated():
+    kinit = flexmock(call=lambda: None)
+    kinit.should_call("call").twice()
+    flexmock(KerberosTicket).should_receive("get_lifetime").and_return(
+        None, 36000, None, 36000
+    ).one_by_one()
+
+    KerberosTicket.init(kinit.call)
+    KerberosTicket.invalidate()
+    KerberosTicket.init(kinit.call)
+
+
+def test_kinit_failed():
+    kinit = flexmock(call=lambda: None)
+    kinit.should_receive("call").and_raise(
+        PackitCommandFailedError, "Command failed", stdout_output="", stderr_output=""
+    ).twice()
+    flexmock(KerberosTicket).should_receive("get_lifetime").and_return(None)
+
+    # the failure is not remembered
+    for _ in range(2):
+        with pytest.raises(PackitCommandFailedError):
+            KerberosTicket.init(kinit.call)
+
+
+@pytest.mark.parametrize(
+    "ex, invalidated",
+    [
+        pytest.param(
+            PackitCommandFailedError(
+                "Command failed",
+                stdout_output="",
+                stderr_output="Could not execute build: Unable to log in, "
+                "no authentication methods available",
+            ),
+            True,
+            id="koji",
+        ),
+        pytest.param(
+            PackitCommandFailedError(
+                "Command failed",
+                stdout_output="",
+                stderr_output="GSSAPI auth failed: Ticket expired",
+            ),
+            True,
+            id="expired",
+        ),
+        pytest.param(
+            APIError("Unauthorized", 401),
+            True,
+            id="fasjson",
+        ),
+        pytest.param(
+            PackitCommandFailedError(
+                "Command failed",
+                stdout_output="",
+                stderr_output="Build already exists",
+            ),
+            False,
+            id="other",
+        ),
+    ],
+)
+def test_invalidate_on_auth_error(ex, invalidated):
+    flexmock(KerberosTicket).should_receive("invalidate").times(1 if invalidated else 0)
+
+    assert KerberosTicket.invalidate_on_auth_error(ex) == invalidated
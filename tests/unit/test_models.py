@@ -1,15 +1,33 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from flexmock import flexmock
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import scoped_session, sessionmaker
 
+from packit_service import models as models_module
+from packit_service.config import ServiceConfig
 from packit_service.models import (
+    PROJECT_EVENT_UNIQUE_KEY,
+    GitProjectModel,
+    PackageConfigModel,
+    ProjectEventModel,
+    ProjectEventModelType,
+    SRPMBuildModel,
     filter_most_recent_target_models_by_status,
     TestingFarmResult,
     filter_most_recent_target_names_by_status,
+    get_engine_pool_options,
+    get_session_scope,
+    sa_session_transaction,
+    update_batch,
+    upsert,
 )
 
 
@@ -58,3 +76,171 @@ def test_filter_most_recent_target_names_by_status(models):
     assert filter_most_recent_target_names_by_status(
         models, [TestingFarmResult.passed]
     ) == {"target-a"}
+
+
+@pytest.mark.parametrize(
+    "concurrency,pool_size,expected_pool_size",
+    [
+        ("1", None, 5),
+        ("16", None, 16),
+        ("16", 30, 30),
+    ],
+)
+def test_get_engine_pool_options(
+    monkeypatch, concurrency, pool_size, expected_pool_size
+):
+    monkeypatch.setenv("CONCURRENCY", concurrency)
+    ServiceConfig.get_service_config().database_pool_size = pool_size
+
+    assert get_engine_pool_options() == {
+        "pool_size": expected_pool_size,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+    }
+
+
+def test_session_per_task(monkeypatch, tmp_path):
+    monkeypatch.setenv("POOL", "gevent")
+    monkeypatch.setenv("CONCURRENCY", "10")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'packit.db'}", connect_args={"timeout": 30}
+    )
+    GitProjectModel.__table__.create(engine)
+    session_registry = scoped_session(
+        sessionmaker(bind=engine), scopefunc=get_session_scope()
+    )
+    monkeypatch.setattr(models_module, "Session", session_registry)
+
+    sessions = []
+    # make sure the tasks really run at the same time
+    barrier = threading.Barrier(10)
+
+    def task(i: int):
+        try:
+            with sa_session_transaction(commit=True) as session:
+                sessions.append(session)
+                assert session_registry() is session
+                barrier.wait(timeout=5)
+                session.add(
+                    GitProjectModel(
+                        namespace="namespace",
+                        repo_name=f"repo-{i}",
+                        project_url=f"https://github.com/namespace/repo-{i}",
+                    )
+                )
+                session.flush()
+                if i % 5 == 0:
+                    raise ValueError("Task failed.")
+        except ValueError:
+            pass
+        finally:
+            # what the task_postrun signal does
+            session_registry.remove()
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(task, range(50)))
+
+    # every task had its own session
+    assert len({id(session) for session in sessions}) == 50
+    # failures of some tasks did not affect the others
+    with sa_session_transaction() as session:
+        assert session.query(GitProjectModel).count() == 40
+
+
+def test_get_or_create_project_id_is_cached():
+    flexmock(GitProjectModel).should_receive("get_or_create").with_args(
+        namespace="namespace",
+        repo_name="repo",
+        project_url="https://github.com/namespace/repo",
+    ).and_return(flexmock(id=42)).once()
+
+    for _ in range(3):
+        assert (
+            GitProjectModel.get_or_create_id(
+                namespace="namespace",
+                repo_name="repo",
+                project_url="https://github.com/namespace/repo",
+            )
+            == 42
+        )
+
+
+def test_upsert_statement():
+    session = flexmock()
+
+    def execute(statement):
+        sql = " ".join(
+            str(
+                statement.compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+            ).split()
+        )
+        assert sql.startswith(
+            "INSERT INTO project_events (type, event_id, commit_sha) "
+            "VALUES ('release', 12, NULL) "
+            "ON CONFLICT (type, event_id, coalesce(commit_sha, '')) "
+            "DO UPDATE SET type = project_events.type RETURNING project_events.id, "
+        )
+        return flexmock(scalar_one=lambda: "event")
+
+    session.execute = execute
+    assert (
+        upsert(
+            session,
+            ProjectEventModel,
+            list(PROJECT_EVENT_UNIQUE_KEY),
+            type=ProjectEventModelType.release,
+            event_id=12,
+            commit_sha=None,
+        )
+        == "event"
+    )
+
+
+def test_package_config_hash():
+    assert PackageConfigModel.get_hash(
+        {"specfile_path": "package.spec", "jobs": [{"job": "copr_build"}]}
+    ) == PackageConfigModel.get_hash(
+        {"jobs": [{"job": "copr_build"}], "specfile_path": "package.spec"}
+    )
+    assert PackageConfigModel.get_hash(
+        {"specfile_path": "package.spec"}
+    ) != PackageConfigModel.get_hash({"specfile_path": "other.spec"})
+
+
+def test_update_batch(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'packit.db'}")
+    SRPMBuildModel.__table__.create(engine)
+    monkeypatch.setattr(
+        models_module, "Session", scoped_session(sessionmaker(bind=engine))
+    )
+    old = datetime.now(timezone.utc) - timedelta(days=10)
+    with sa_session_transaction(commit=True) as session:
+        session.add_all(
+            SRPMBuildModel(build_submitted_time=old, logs="logs", url="url")
+            for _ in range(5)
+        )
+        session.add(SRPMBuildModel(build_submitted_time=datetime.now(), logs="logs"))
+
+    counts = [
+        update_batch(
+            SRPMBuildModel.get_older_than(timedelta(days=1)),
+            {"logs": None, "url": None},
+            batch_size=2,
+        )
+        for _ in range(4)
+    ]
+
+    assert counts == [2, 2, 1, 0]
+    with sa_session_transaction() as session:
+        assert (
+            session.query(SRPMBuildModel)
+            .filter(SRPMBuildModel.logs.isnot(None))
+            .count()
+            == 1
+        )
+        assert (
+            session.query(SRPMBuildModel).filter(SRPMBuildModel.url.isnot(None)).count()
+            == 0
+        )
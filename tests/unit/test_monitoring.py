@@ -2,15 +2,29 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+import os
+import threading
+from urllib.error import URLError
 
 from flexmock import flexmock
 import pytest
 
+from packit_service.worker import monitoring
 from packit_service.worker.handlers import (
     CoprBuildHandler,
     TestingFarmHandler,
 )
 from packit_service.worker.jobs import SteveJobs
+from packit_service.worker.monitoring import Pushgateway
+
+
+@pytest.fixture()
+def pushgateway(monkeypatch):
+    monkeypatch.setenv("HOSTNAME", "packit-worker-0")
+    monkeypatch.setattr(Pushgateway, "_instance", None)
+    pushgateway = Pushgateway()
+    pushgateway.push_interval = 0.01
+    return pushgateway
 
 
 @pytest.mark.parametrize(
@@ -74,3 +88,57 @@ def test_delayed():
     jobs.pushgateway = pushgateway
 
     jobs.push_statuses_metrics([created_at + datetime.timedelta(seconds=42)])
+
+
+def test_pushgateway_shared_in_process(pushgateway):
+    assert Pushgateway() is pushgateway
+    Pushgateway().events_processed.inc()
+    assert pushgateway.events_processed._value.get() == 1
+
+
+def test_push_in_background(pushgateway):
+    pushed = threading.Event()
+    flexmock(monitoring).should_receive("push_to_gateway").with_args(
+        "http://pushgateway",
+        job="packit-worker-0",
+        registry=pushgateway.registry,
+        timeout=monitoring.METRICS_PUSH_TIMEOUT,
+    ).replace_with(lambda *args, **kwargs: pushed.set()).once()
+
+    # both pushes are coalesced into one
+    pushgateway.push()
+    pushgateway.push()
+
+    assert pushed.wait(timeout=2)
+
+
+def test_flush_failure(pushgateway):
+    flexmock(monitoring).should_receive("push_to_gateway").and_raise(
+        URLError("Connection refused")
+    ).once()
+    assert not pushgateway.flush()
+
+
+def test_flush_unexpected_failure(pushgateway):
+    flexmock(monitoring).should_receive("push_to_gateway").and_raise(
+        ValueError("Invalid address")
+    ).once()
+    assert not pushgateway.flush()
+
+
+def test_flusher_restarted(pushgateway):
+    # the thread dies
+    flexmock(pushgateway).should_receive("_run_flusher").and_raise(RuntimeError).once()
+    pushgateway.flusher_pid = os.getpid()
+
+    with pytest.raises(RuntimeError):
+        pushgateway.run_flusher()
+    # the next push starts a new thread
+    assert pushgateway.flusher_pid is None
+
+
+def test_push_without_worker_name(pushgateway):
+    pushgateway.worker_name = None
+    flexmock(pushgateway).should_receive("start_flusher").never()
+    pushgateway.push()
+    assert not pushgateway.push_requested.is_set()
@@ -1,8 +1,11 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import time
+
 import pytest
 from flexmock import flexmock
+from github import RateLimitExceededException
 from gitlab.exceptions import GitlabError
 from ogr import PagureService
 from ogr.abstract import CommitStatus
@@ -23,12 +26,14 @@ from packit.config.notifications import (
 from packit_service.worker.reporting import (
     StatusReporter,
     BaseCommitStatus,
+    CheckRunBuffer,
     StatusReporterGithubStatuses,
     StatusReporterGitlab,
     StatusReporterGithubChecks,
     DuplicateCheckMode,
     update_message_with_configured_failure_comment_message,
 )
+from packit_service.worker.reporting.buffer import TokenBucket
 from packit_service.worker.reporting.news import News
 
 create_table_content = StatusReporterGithubChecks._create_table
@@ -249,6 +254,7 @@ def test_set_status_github_check(
     ).once()
 
     reporter.set_status(state, title, check_name, url)
+    CheckRunBuffer.flush_all()
 
 
 @pytest.mark.parametrize(
@@ -469,6 +475,7 @@ def test_status_instead_check(
     ).once()
 
     reporter.set_status(state, title, check_name, url)
+    CheckRunBuffer.flush_all()
 
 
 def test_create_table():
@@ -657,3 +664,121 @@ def test_update_message_with_configured_failure_comment_message(
         update_message_with_configured_failure_comment_message(comment, job_config)
         == result
     )
+
+
+def test_check_runs_coalesced():
+    flexmock(News).should_receive("get_sentence").and_return("Interesting news.")
+    project = GithubProject(None, None, None)
+    reporter = StatusReporter.get_instance(
+        project=project,
+        commit_sha="7654321",
+        project_event_id=1,
+        pr_id=1,
+        packit_user="packit",
+    )
+
+    sent = []
+    flexmock(GithubProject).should_receive("create_check_run").replace_with(
+        lambda **kwargs: sent.append((kwargs["name"], kwargs["status"]))
+    )
+
+    for check_name in (
+        "packit/rpm-build-fedora-rawhide-x86_64",
+        "packit/rpm-build-fedora-39-x86_64",
+    ):
+        reporter.set_status(
+            BaseCommitStatus.pending, "SRPM build submitted", check_name
+        )
+        reporter.set_status(BaseCommitStatus.running, "Starting RPM build", check_name)
+    CheckRunBuffer.flush_all()
+    # only the last state of each check is sent
+    assert sent == [
+        ("packit/rpm-build-fedora-rawhide-x86_64", GithubCheckRunStatus.in_progress),
+        ("packit/rpm-build-fedora-39-x86_64", GithubCheckRunStatus.in_progress),
+    ]
+
+    # the same state is not sent again, not even by another task
+    reporter.set_status(
+        BaseCommitStatus.running,
+        "Starting RPM build",
+        "packit/rpm-build-fedora-39-x86_64",
+    )
+    CheckRunBuffer.flush_all()
+    assert len(sent) == 2
+
+    # a changed state is
+    reporter.set_status(
+        BaseCommitStatus.success,
+        "RPMs were built successfully.",
+        "packit/rpm-build-fedora-39-x86_64",
+    )
+    CheckRunBuffer.flush_all()
+    assert sent[2:] == [
+        ("packit/rpm-build-fedora-39-x86_64", GithubCheckRunStatus.completed)
+    ]
+
+
+def test_check_runs_flushed_after_window():
+    buffer = CheckRunBuffer("packit/ogr", "7654321", window=0.01)
+    sent = []
+    buffer.add("check", "pending", lambda: sent.append("pending"))
+    buffer.add("check", "running", lambda: sent.append("running"))
+
+    buffer.timer.join()
+    assert sent == ["running"]
+    assert buffer.get_sent("check") == "running"
+
+
+def test_check_runs_failed():
+    sent = []
+
+    def send():
+        if not sent:
+            sent.append("failed")
+            raise ConnectionError("Connection reset by peer")
+        sent.append("running")
+
+    CheckRunBuffer.get("packit/ogr", "7654321").add("check", "running", send)
+    with pytest.raises(ConnectionError):
+        CheckRunBuffer.flush_all()
+
+    # the state is kept for the next flush
+    CheckRunBuffer.flush_all()
+    assert sent == ["failed", "running"]
+    assert not CheckRunBuffer.buffers
+
+
+def test_check_runs_rate_limited():
+    def create_check_run(*args, **kwargs):
+        raise GithubAPIException("Failed to create check run") from (
+            RateLimitExceededException(403, {}, {})
+        )
+
+    project = GithubProject(None, None, None)
+    reporter = StatusReporterGithubChecks(project, "7654321", "packit", 1, 1)
+    flexmock(GithubProject).should_receive("create_check_run").replace_with(
+        create_check_run
+    ).once()
+    flexmock(GithubProject).should_receive("set_commit_status").once()
+    flexmock(CheckRunBuffer).should_receive("rate_limited").once()
+
+    reporter.set_status(BaseCommitStatus.running, "Starting RPM build", "check")
+    CheckRunBuffer.flush_all()
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=100, capacity=2)
+    flexmock(time).should_receive("sleep").never()
+    bucket.acquire()
+    bucket.acquire()
+    assert bucket.tokens < 1
+
+    bucket.pause(5)
+    assert bucket.tokens < -499
+
+
+def test_token_bucket_waits():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.acquire()
+    flexmock(time).should_call("sleep").at_least().once()
+    bucket.acquire()
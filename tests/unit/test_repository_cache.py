@@ -0,0 +1,157 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from packit.utils.repo import RepositoryCache
+
+from packit_service.config import ServiceConfig
+from packit_service.worker.repository_cache import (
+    ManagedRepositoryCache,
+    get_repository_cache,
+)
+
+
+def run_git(*args, cwd=None):
+    return subprocess.run(
+        ["git", "-c", "user.name=Packit", "-c", "user.email=packit@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def commit(upstream: Path, work_dir: Path, content: str) -> str:
+    """Push a new commit to the bare repository standing in for the forge."""
+    if not work_dir.exists():
+        run_git("clone", str(upstream), str(work_dir))
+    (work_dir / "README").write_text(content)
+    run_git("add", "README", cwd=work_dir)
+    run_git("commit", "-m", content, cwd=work_dir)
+    run_git("push", "origin", "HEAD:main", cwd=work_dir)
+    return run_git("rev-parse", "HEAD", cwd=work_dir)
+
+
+@pytest.fixture()
+def upstreams(tmp_path):
+    """Two bare repositories, each with a single commit."""
+    repos = []
+    for name in ("systemd", "cockpit"):
+        upstream = tmp_path / "forge" / f"{name}.git"
+        run_git("init", "--bare", "--initial-branch=main", str(upstream))
+        commit(upstream, tmp_path / "work" / name, f"{name} 1")
+        repos.append(upstream)
+    return repos
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return ManagedRepositoryCache(
+        cache_path=tmp_path / "cache", max_size=10**9, background_fetch=False
+    )
+
+
+def test_get_repo_miss_and_hit(cache, upstreams, tmp_path):
+    upstream = str(upstreams[0])
+    hits = cache.pushgateway.repository_cache_hits._value.get()
+    misses = cache.pushgateway.repository_cache_misses._value.get()
+
+    repo = cache.get_repo(upstream, directory=tmp_path / "clone-1")
+    assert repo.head.commit.message == "systemd 1\n"
+    name = cache.get_mirror_name(upstream)
+    assert cache.cached_projects == [name]
+    assert cache.projects_added == [name]
+    assert cache.pushgateway.repository_cache_misses._value.get() == misses + 1
+
+    repo = cache.get_repo(upstream, directory=tmp_path / "clone-2")
+    assert repo.head.commit.message == "systemd 1\n"
+    assert cache.projects_added == [name]
+    assert cache.pushgateway.repository_cache_hits._value.get() == hits + 1
+    # the clones don't depend on the mirror
+    assert not (tmp_path / "clone-2/.git/objects/info/alternates").exists()
+
+
+def test_get_repo_without_adding(tmp_path, upstreams):
+    cache = ManagedRepositoryCache(
+        cache_path=tmp_path / "cache", max_size=10**9, add_new=False
+    )
+    repo = cache.get_repo(str(upstreams[0]), directory=tmp_path / "clone")
+    assert repo.head.commit.message == "systemd 1\n"
+    assert cache.cached_projects == []
+
+
+def test_get_mirror_name_forks():
+    assert ManagedRepositoryCache.get_mirror_name(
+        "https://github.com/systemd/systemd.git"
+    ) == ManagedRepositoryCache.get_mirror_name("https://github.com/systemd/systemd")
+    assert ManagedRepositoryCache.get_mirror_name(
+        "https://github.com/systemd/systemd"
+    ) != ManagedRepositoryCache.get_mirror_name("https://github.com/fork/systemd")
+
+
+def test_mirror_refreshed(cache, upstreams, tmp_path):
+    upstream = upstreams[0]
+    cache.get_repo(str(upstream), directory=tmp_path / "clone-1")
+    sha = commit(upstream, tmp_path / "work" / "systemd", "systemd 2")
+
+    # the mirror is fresh
+    cache.get_repo(str(upstream), directory=tmp_path / "clone-2")
+    mirror = cache.get_mirror_path(cache.get_mirror_name(str(upstream)))
+    assert run_git("rev-parse", "main", cwd=mirror) != sha
+
+    cache.fetch_interval = 0
+    repo = cache.get_repo(str(upstream), directory=tmp_path / "clone-3")
+    assert repo.head.commit.hexsha == sha
+    assert run_git("rev-parse", "main", cwd=mirror) == sha
+
+
+def test_least_recently_used_evicted(cache, upstreams, tmp_path):
+    systemd, cockpit = (str(upstream) for upstream in upstreams)
+    cache.get_repo(systemd, directory=tmp_path / "clone-1")
+    cache.max_size = cache.size
+
+    cache.get_repo(cockpit, directory=tmp_path / "clone-2")
+    assert cache.cached_projects == [cache.get_mirror_name(cockpit)]
+    assert not cache.get_mirror_path(cache.get_mirror_name(systemd)).exists()
+
+
+def test_mirror_in_use_not_evicted(cache, upstreams, tmp_path):
+    systemd, cockpit = (str(upstream) for upstream in upstreams)
+    cache.get_repo(systemd, directory=tmp_path / "clone-1")
+    cache.max_size = cache.size
+
+    # another worker is cloning from the mirror
+    with cache.lock(cache.get_mirror_name(systemd)):
+        cache.get_repo(cockpit, directory=tmp_path / "clone-2")
+    assert len(cache.cached_projects) == 2
+
+    cache.evict()
+    assert cache.cached_projects == [cache.get_mirror_name(cockpit)]
+
+
+def test_lock_exclusive(cache):
+    with cache.lock("systemd", exclusive=True):
+        with cache.lock("systemd", blocking=False) as locked:
+            assert not locked
+        with cache.lock("cockpit", blocking=False) as locked:
+            assert locked
+
+
+@pytest.mark.parametrize(
+    "repository_cache,max_size,expected",
+    [
+        (None, None, type(None)),
+        (None, 10, type(None)),
+        ("cache", None, RepositoryCache),
+        ("cache", 10, ManagedRepositoryCache),
+    ],
+)
+def test_get_repository_cache(tmp_path, repository_cache, max_size, expected):
+    service_config = ServiceConfig(
+        repository_cache=str(tmp_path / repository_cache) if repository_cache else None,
+        repository_cache_max_size=max_size,
+    )
+    assert type(get_repository_cache(service_config)) is expected
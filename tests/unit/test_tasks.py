@@ -7,6 +7,8 @@ from celery.app.task import Task
 from copr.v3 import CoprRequestException
 from flexmock import flexmock
 
+from packit_service.cache import task_payloads
+from packit_service.worker import tasks
 from packit_service.worker.tasks import run_copr_build_handler
 from packit_service.worker.handlers import CoprBuildHandler
 
@@ -21,3 +23,21 @@ def test_autoretry():
     flexmock(Task).should_receive("retry").and_raise(CoprRequestException).once()
     with pytest.raises(CoprRequestException):
         run_copr_build_handler({}, {}, {})
+
+
+def test_payloads_resolved():
+    event = {"event_type": "PullRequestGithubEvent", "pr_id": 1}
+    package_config = {"specfile_path": "packit.spec"}
+    flexmock(tasks).should_receive("load_package_config").with_args(
+        package_config
+    ).and_return(None).once()
+    flexmock(CoprBuildHandler).should_receive("run_job").and_return([])
+    flexmock(tasks).should_receive("get_handlers_task_results").with_args(
+        [], event
+    ).once()
+
+    run_copr_build_handler(
+        event=task_payloads.put(event),
+        package_config=task_payloads.put(package_config),
+        job_config=None,
+    )
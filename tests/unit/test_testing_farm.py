@@ -265,6 +265,35 @@ def test_distro2compose(target, compose, use_internal_tf):
     assert job_helper.distro2compose(target) == compose
 
 
+def test_available_composes_cached():
+    def create_helper():
+        return TFJobHelper(
+            service_config=ServiceConfig.get_service_config(),
+            package_config=flexmock(jobs=[]),
+            project=flexmock(),
+            metadata=flexmock(),
+            db_project_event=flexmock()
+            .should_receive("get_project_event_object")
+            .and_return(flexmock())
+            .mock(),
+            job_config=JobConfig(
+                type=JobType.tests,
+                trigger=JobConfigTriggerType.pull_request,
+                packages={"package": CommonPackageConfig()},
+            ),
+        )
+
+    response = flexmock(
+        status_code=200, json=lambda: {"composes": [{"name": "Fedora-Rawhide"}]}
+    )
+    flexmock(TFJobHelper).should_receive("send_testing_farm_request").with_args(
+        endpoint="composes/public"
+    ).and_return(response).once()
+
+    assert create_helper().distro2compose("fedora-rawhide-x86_64") == "Fedora-Rawhide"
+    assert create_helper().distro2compose("fedora-rawhide-aarch64") == "Fedora-Rawhide"
+
+
 @pytest.mark.parametrize(
     ("build_id," "chroot," "built_packages," "packages_to_send"),
     [
@@ -1,13 +1,21 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
+import copy
+import json
+import os
 from json import dumps
 
 import pytest
 from flask import Flask, request
 from flexmock import flexmock
 
+from packit.config import JobConfigTriggerType
+from packit.utils import nested_get
 from packit_service.config import ServiceConfig
+from packit_service.models import ProjectEventModel, PullRequestModel
 from packit_service.service.api.errors import ValidationFailed
+from packit_service.worker.parser import Parser
+from tests.spellbook import DATA_DIR
 
 
 @pytest.fixture()
@@ -244,3 +252,151 @@ def test_interested(mock_config, headers, payload, interested):
         json=payload, content_type="application/json", headers=headers
     ):
         assert webhooks.GithubWebhook.interested() == interested
+
+
+GITLAB_EVENT_TYPES = {
+    "merge_request": "Merge Request Hook",
+    "note": "Note Hook",
+    "push": "Push Hook",
+    "tag_push": "Tag Push Hook",
+    "pipeline": "Pipeline Hook",
+    "release": "Release Hook",
+}
+
+
+def get_github_event_type(payload: dict) -> str:
+    if "pusher" in payload:
+        return "push"
+    if "check_run" in payload:
+        return "check_run"
+    if "comment" in payload:
+        return "issue_comment"
+    if "pull_request" in payload:
+        return "pull_request"
+    if "release" in payload:
+        return "release"
+    return "installation"
+
+
+@pytest.mark.parametrize(
+    "path",
+    sorted(
+        path
+        for directory in ("github", "gitlab", "copr_build")
+        for path in (DATA_DIR / "webhooks" / directory).glob("*.json")
+    ),
+    ids=lambda path: f"{path.parent.name}/{path.name}",
+)
+def test_slim_event_parses_identically(path):
+    from packit_service.service.api import webhooks
+
+    payload = json.loads(path.read_text())
+    if "object_kind" in payload:
+        source, event_type = "gitlab", GITLAB_EVENT_TYPES.get(payload["object_kind"])
+    else:
+        source, event_type = "github", get_github_event_type(payload)
+
+    project_event = (
+        flexmock(ProjectEventModel(type=JobConfigTriggerType.pull_request, id=1))
+        .should_receive("get_project_event_object")
+        .and_return(PullRequestModel(pr_id=123))
+        .mock()
+    )
+    flexmock(ProjectEventModel).should_receive("get_by_id").and_return(project_event)
+
+    slimmed = webhooks.slim_event(copy.deepcopy(payload), source, event_type)
+    assert len(json.dumps(slimmed)) <= len(json.dumps(payload))
+
+    parser = nested_get(Parser.MAPPING, source, event_type, default=Parser.parse_event)
+    original_event, slimmed_event = parser(payload), parser(slimmed)
+    assert type(original_event) is type(slimmed_event)
+    if original_event:
+        assert {
+            key: value
+            for key, value in vars(original_event).items()
+            if key != "created_at"
+        } == {
+            key: value
+            for key, value in vars(slimmed_event).items()
+            if key != "created_at"
+        }
+
+
+def test_register_delivery(monkeypatch):
+    from packit_service.service.api import webhooks
+
+    monkeypatch.setattr(
+        webhooks, "config", ServiceConfig(webhook_deduplication_window=60)
+    )
+    counter = webhooks.webhook_duplicate_deliveries.labels(
+        source="github", process_id=os.getpid()
+    )
+    before = counter._value.get()
+
+    assert webhooks.register_delivery("github", "uuid")
+    assert not webhooks.register_delivery("github", "uuid")
+    assert webhooks.register_delivery("github", "other-uuid")
+    assert webhooks.register_delivery("gitlab", None)
+    assert counter._value.get() == before + 1
+
+
+def test_send_event_to_workers_records_pr_head(monkeypatch):
+    from packit_service.deduplication import EventDeduplicator
+    from packit_service.service.api import webhooks
+
+    monkeypatch.setattr(
+        webhooks, "config", ServiceConfig(webhook_deduplication_window=60)
+    )
+    monkeypatch.setattr(
+        webhooks,
+        "celery_app",
+        flexmock().should_receive("send_task").twice().mock(),
+    )
+    payload = json.loads((DATA_DIR / "webhooks" / "github" / "pr.json").read_text())
+    event = Parser.parse_event(payload)
+
+    webhooks.send_event_to_workers(payload, "github", "pull_request")
+    assert not EventDeduplicator(60).is_superseded(
+        event.project_url, event.pr_id, event.commit_sha
+    )
+
+    newer = copy.deepcopy(payload)
+    newer["pull_request"]["head"]["sha"] = "newer"
+    webhooks.send_event_to_workers(newer, "github", "pull_request")
+    assert EventDeduplicator(60).is_superseded(
+        event.project_url, event.pr_id, event.commit_sha
+    )
+
+
+def test_failed_delivery_accepted_again(monkeypatch):
+    from packit_service.service.api import webhooks
+
+    monkeypatch.setattr(
+        webhooks, "config", ServiceConfig(webhook_deduplication_window=60)
+    )
+    flexmock(webhooks.GithubWebhook).should_receive("validate_signature")
+    flexmock(webhooks.GithubWebhook).should_receive("interested").and_return(True)
+    sent = []
+
+    def send_task(**kwargs):
+        if not sent:
+            sent.append(False)
+            # the broker is not available
+            raise ConnectionError
+        sent.append(True)
+
+    celery_app = flexmock(send_task=send_task)
+    monkeypatch.setattr(webhooks, "celery_app", celery_app)
+    payload = json.loads((DATA_DIR / "webhooks" / "github" / "pr.json").read_text())
+
+    app = Flask(__name__)
+    headers = {"X-GitHub-Delivery": "uuid", "X-GitHub-Event": "pull_request"}
+    with app.test_request_context(json=payload, headers=headers):
+        with pytest.raises(ConnectionError):
+            webhooks.GithubWebhook().post()
+    # the redelivery is not dropped as a duplicate
+    with app.test_request_context(json=payload, headers=headers):
+        assert webhooks.GithubWebhook().post()[0] == (
+            "Webhook accepted. We thank you, Github."
+        )
+    assert sent == [False, True]
@@ -21,6 +21,7 @@ from packit_service.config import ServiceConfig
 from packit_service.models import (
     CoprBuildTargetModel,
     CoprBuildGroupModel,
+    PackageConfigModel,
     ProjectEventModel,
     sa_session_transaction,
     SRPMBuildModel,
@@ -49,6 +50,9 @@ from packit_service.models import (
     BodhiUpdateTargetModel,
     BodhiUpdateGroupModel,
     SyncReleasePullRequestModel,
+    UsageRollupEventModel,
+    UsageRollupModel,
+    UsageRollupWatermarkModel,
 )
 from packit_service.worker.events import InstallationEvent
 
@@ -186,6 +190,7 @@ def clean_db():
 
         session.query(PipelineModel).delete()
         session.query(ProjectEventModel).delete()
+        session.query(PackageConfigModel).delete()
 
         session.query(TFTTestRunTargetModel).delete()
         session.query(TFTTestRunGroupModel).delete()
@@ -203,8 +208,14 @@ def clean_db():
         session.query(IssueModel).delete()
         session.query(ProjectAuthenticationIssueModel).delete()
 
+        session.query(UsageRollupModel).delete()
+        session.query(UsageRollupEventModel).delete()
+        session.query(UsageRollupWatermarkModel).delete()
+
         session.query(GitProjectModel).delete()
 
+    GitProjectModel.get_or_create_id.cache_clear()
+
 
 @pytest.fixture()
 def clean_before_and_after():
@@ -1438,6 +1449,12 @@ def full_database(
     yield
 
 
+@pytest.fixture()
+def full_database_with_usage_rollups(full_database):
+    UsageRollupModel.fold_new_usage()
+    yield
+
+
 @pytest.fixture()
 def release_event_dict():
     """
@@ -5,6 +5,7 @@
 import pytest
 
 from packit_service.models import sa_session_transaction, AllowlistModel
+from packit_service.worker.allowlist import Allowlist
 
 
 @pytest.fixture()
@@ -62,3 +63,17 @@ def test_remove_namespace(clean_before_and_after, multiple_allowlist_entries):
     assert AllowlistModel.get_namespace("Rayquaza").namespace == "Rayquaza"
     AllowlistModel.remove_namespace("Rayquaza")
     assert AllowlistModel.get_namespace("Rayquaza") is None
+
+
+def test_allowlist_index_follows_changes(
+    clean_before_and_after, multiple_allowlist_entries
+):
+    assert Allowlist.is_namespace_or_parent_approved("Rayquaza/ogr.git")
+    assert not Allowlist.is_namespace_or_parent_denied("Rayquaza/ogr.git")
+
+    AllowlistModel.add_namespace(namespace="Rayquaza/ogr.git", status="denied")
+    assert Allowlist.is_namespace_or_parent_denied("Rayquaza/ogr.git")
+
+    AllowlistModel.remove_namespace("Rayquaza/ogr.git")
+    AllowlistModel.remove_namespace("Rayquaza")
+    assert not Allowlist.is_namespace_or_parent_approved("Rayquaza/ogr.git")
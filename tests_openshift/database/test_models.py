@@ -15,6 +15,7 @@ from packit_service.models import (
     ProjectEventModelType,
     KojiBuildTargetModel,
     KojiBuildGroupModel,
+    PackageConfigModel,
     ProjectAuthenticationIssueModel,
     ProjectReleaseModel,
     PullRequestModel,
@@ -33,6 +34,9 @@ from packit_service.models import (
     Session,
     BuildStatus,
     SyncReleaseJobType,
+    UsageRollupModel,
+    get_usage_data,
+    update_batch,
 )
 from tests_openshift.conftest import SampleValues
 
@@ -261,6 +265,62 @@ def test_get_or_create_pr(clean_before_and_after):
         assert expected_pr.project_id == actual_pr.project_id
 
 
+def test_get_or_create_project_id(clean_before_and_after):
+    project = GitProjectModel.get_or_create(
+        namespace="clapton",
+        repo_name="layla",
+        project_url="https://github.com/clapton/layla",
+    )
+    assert project.instance_url == "github.com"
+
+    for _ in range(2):
+        assert (
+            GitProjectModel.get_or_create_id(
+                namespace="clapton",
+                repo_name="layla",
+                project_url="https://github.com/clapton/layla",
+            )
+            == project.id
+        )
+    assert GitProjectModel.get_or_create_id.cache_info().hits == 1
+
+    with sa_session_transaction() as session:
+        assert session.query(GitProjectModel).count() == 1
+
+
+def test_get_or_create_project_event_without_commit(clean_before_and_after):
+    release = ProjectReleaseModel.get_or_create(
+        tag_name="v1.0.0",
+        namespace="clapton",
+        repo_name="layla",
+        project_url="https://github.com/clapton/layla",
+        commit_hash="abc",
+    )
+    # the commit hash of the existing release is kept
+    assert (
+        ProjectReleaseModel.get_or_create(
+            tag_name="v1.0.0",
+            namespace="clapton",
+            repo_name="layla",
+            project_url="https://github.com/clapton/layla",
+            commit_hash="def",
+        ).commit_hash
+        == "abc"
+    )
+
+    first = ProjectEventModel.get_or_create(
+        type=ProjectEventModelType.release, event_id=release.id, commit_sha=None
+    )
+    second = ProjectEventModel.get_or_create(
+        type=ProjectEventModelType.release, event_id=release.id, commit_sha=None
+    )
+    assert first.id == second.id
+
+    with sa_session_transaction() as session:
+        assert session.query(ProjectReleaseModel).count() == 1
+        assert session.query(ProjectEventModel).count() == 1
+
+
 def test_errors_while_doing_db(clean_before_and_after):
     with sa_session_transaction() as session:
         try:
@@ -307,6 +367,15 @@ def test_get_all_build_id(clean_before_and_after, multiple_copr_builds):
     assert builds_list[1].project_name == "the-project-name"
 
 
+def test_copr_build_set_status_checked(clean_before_and_after, multiple_copr_builds):
+    checked_time = datetime(2024, 1, 1, 12, 0)
+    CoprBuildTargetModel.set_status_checked(123456, "running;", checked_time)
+    builds_list = list(CoprBuildTargetModel.get_all_by_build_id(123456))
+    assert len(builds_list) == 2
+    assert all(build.status_checked_time == checked_time for build in builds_list)
+    assert all(build.status_checked_copr_state == "running;" for build in builds_list)
+
+
 # returns the first copr build with given build id and target
 def test_get_by_build_id(clean_before_and_after, multiple_copr_builds):
     # these are not iterable and thus should be accessible directly
@@ -918,6 +987,30 @@ def test_set_propose_downstream_model_status(
     assert propose_downstream_model_release.status == SyncReleaseStatus.finished
 
 
+def test_set_propose_downstream_model_status_if_running(
+    clean_before_and_after, propose_downstream_model_release
+):
+    assert propose_downstream_model_release.set_status_if_running(
+        SyncReleaseStatus.error
+    )
+    assert not propose_downstream_model_release.set_status_if_running(
+        SyncReleaseStatus.finished
+    )
+    model = SyncReleaseModel.get_by_id(id_=propose_downstream_model_release.id)
+    assert model.status == SyncReleaseStatus.error
+
+
+def test_get_propose_downstream_current_targets(
+    clean_before_and_after, propose_downstream_model_release, propose_model
+):
+    propose_downstream_model_release.sync_release_targets.append(propose_model)
+    propose_model.set_status(SyncReleaseTargetStatus.submitted)
+
+    (target,) = propose_downstream_model_release.get_current_targets()
+    assert target.id == propose_model.id
+    assert target.status == SyncReleaseTargetStatus.submitted
+
+
 def test_get_propose_downstream_model_by_id(
     clean_before_and_after, propose_downstream_model_release
 ):
@@ -1065,3 +1158,152 @@ def test_project_event_get_older_than_with_packages_config(
         )
         == 0
     )
+
+
+def test_packages_config_stored_once(
+    clean_before_and_after, branch_project_event_model, pr_project_event_model
+):
+    branch_project_event_model.set_packages_config({"a": 1, "b": 2})
+    pr_project_event_model.set_packages_config({"b": 2, "a": 1})
+
+    assert (
+        branch_project_event_model.packages_config_hash
+        == pr_project_event_model.packages_config_hash
+    )
+    assert PackageConfigModel.get_by_hash(
+        branch_project_event_model.packages_config_hash
+    ).config == {"a": 1, "b": 2}
+
+    branch_project_event_model.set_packages_config(None)
+    assert PackageConfigModel.get_unreferenced().count() == 0
+    pr_project_event_model.set_packages_config(None)
+    assert PackageConfigModel.get_unreferenced().count() == 1
+
+
+def test_update_batch_of_project_events(
+    clean_before_and_after, branch_project_event_model, pr_project_event_model
+):
+    for event in (branch_project_event_model, pr_project_event_model):
+        event.set_packages_config({"key": "value"})
+        run = PipelineModel.create(project_event=event)
+        run.datetime = datetime(2024, 4, 8, 12, 0, 0)
+
+    def outdated():
+        return ProjectEventModel.get_older_than_with_packages_config(timedelta(days=1))
+
+    assert update_batch(outdated(), {"packages_config_hash": None}, 1) == 1
+    assert update_batch(outdated(), {"packages_config_hash": None}, 1) == 1
+    assert update_batch(outdated(), {"packages_config_hash": None}, 1) == 0
+    assert update_batch(PackageConfigModel.get_unreferenced(), None, 10) == 1
+
+
+def get_usage_numbers(**kwargs):
+    return {
+        (project_url, project_event_type, job_type): count
+        for project_url, _, project_event_type, job_type, count in (
+            UsageRollupModel.get_usage_numbers(**kwargs)
+        )
+    }
+
+
+def test_usage_rollups_fold_new_usage(
+    clean_before_and_after, multiple_copr_builds, pr_project_event_model
+):
+    assert UsageRollupModel.fold_new_usage() == 3
+    assert UsageRollupModel.fold_new_usage() == 0
+
+    usage_numbers = get_usage_numbers()
+    for job_type in ("srpm_builds", "copr_build_groups"):
+        assert (
+            usage_numbers[(SampleValues.project_url, "pull_request", job_type)]
+            == GitProjectModel.get_job_usage_numbers(
+                job_result_model=(
+                    SRPMBuildModel if job_type == "srpm_builds" else CoprBuildGroupModel
+                ),
+                project_event_type=ProjectEventModelType.pull_request,
+            )[SampleValues.project_url]
+            == 3
+        )
+    # two different PRs
+    assert (
+        usage_numbers[(SampleValues.project_url, "pull_request", "events")]
+        == GitProjectModel.get_project_event_usage_numbers(
+            project_event_type=ProjectEventModelType.pull_request
+        )[SampleValues.project_url]
+        == 2
+    )
+
+    # only the new pipeline is folded, the (already active) PR is not counted again
+    SRPMBuildModel.create_with_new_run(project_event_model=pr_project_event_model)
+    assert UsageRollupModel.fold_new_usage() == 1
+    usage_numbers = get_usage_numbers()
+    assert usage_numbers[(SampleValues.project_url, "pull_request", "srpm_builds")] == 4
+    assert usage_numbers[(SampleValues.project_url, "pull_request", "events")] == 2
+
+
+def test_usage_rollups_job_attached_later(
+    clean_before_and_after, pr_project_event_model
+):
+    _, run_model = SRPMBuildModel.create_with_new_run(
+        project_event_model=pr_project_event_model
+    )
+    UsageRollupModel.fold_new_usage()
+    assert (
+        SampleValues.project_url,
+        "pull_request",
+        "copr_build_groups",
+    ) not in get_usage_numbers()
+
+    # the group is attached to the already folded pipeline
+    CoprBuildGroupModel.create(run_model)
+    assert UsageRollupModel.fold_new_usage() == 1
+    usage_numbers = get_usage_numbers()
+    assert (
+        usage_numbers[(SampleValues.project_url, "pull_request", "copr_build_groups")]
+        == 1
+    )
+    assert usage_numbers[(SampleValues.project_url, "pull_request", "srpm_builds")] == 1
+
+
+def test_usage_rollups_event_counted_once(
+    clean_before_and_after, pr_project_event_model
+):
+    for days in (2, 1):
+        _, run_model = SRPMBuildModel.create_with_new_run(
+            project_event_model=pr_project_event_model
+        )
+        with sa_session_transaction(commit=True) as session:
+            run_model.datetime = datetime.utcnow() - timedelta(days=days)
+            session.add(run_model)
+    UsageRollupModel.fold_new_usage()
+
+    # the PR is active during two days of the period
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    for datetime_from in (None, today - timedelta(days=3)):
+        usage_numbers = get_usage_numbers(datetime_from=datetime_from)
+        assert usage_numbers[(SampleValues.project_url, "pull_request", "events")] == 1
+        assert (
+            usage_numbers[(SampleValues.project_url, "pull_request", "srpm_builds")]
+            == 2
+        )
+    usage_numbers = get_usage_numbers(datetime_from=today - timedelta(days=1))
+    assert usage_numbers[(SampleValues.project_url, "pull_request", "events")] == 1
+    assert usage_numbers[(SampleValues.project_url, "pull_request", "srpm_builds")] == 1
+
+
+def test_usage_rollups_period(
+    clean_before_and_after, multiple_copr_builds, pr_project_event_model
+):
+    UsageRollupModel.fold_new_usage()
+
+    assert get_usage_data(datetime_to="2022-12-12")["active_projects"] == {
+        "project_count": 0,
+        "top_projects_by_events_handled": {},
+        "instances": {},
+    }
+    assert (
+        get_usage_data(datetime_from=datetime.utcnow() - timedelta(hours=1))["jobs"][
+            "copr_build_groups"
+        ]["job_runs"]
+        == 3
+    )
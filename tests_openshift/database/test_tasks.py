@@ -25,6 +25,7 @@ from packit_service.models import (
 from packit_service.worker.events import AbstractCoprBuildEvent
 from packit_service.worker.helpers.build.babysit import check_copr_build
 from packit_service.worker.monitoring import Pushgateway
+from packit_service.worker.reporting import CheckRunBuffer
 
 BUILD_ID = 1300329
 
@@ -215,4 +216,5 @@ def test_check_copr_build(clean_before_and_after, packit_build_752):
     flexmock(Pushgateway).should_receive("push").once().and_return()
 
     check_copr_build(BUILD_ID)
+    CheckRunBuffer.flush_all()
     assert packit_build_752.status == BuildStatus.success
@@ -1,10 +1,15 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
+import gzip
+import json
+
 import pytest
 from flask import url_for
 from packit.utils import nested_get
+from sqlalchemy import event
 
 from packit_service.models import (
+    engine,
     TestingFarmResult,
     PipelineModel,
     SyncReleaseStatus,
@@ -78,6 +83,40 @@ def test_pagination(client, clean_before_and_after, too_many_copr_builds):
     assert len(response_dict_2) == 30  # three builds, but two unique build ids
 
 
+def test_pagination_after_cursor(client, clean_before_and_after, too_many_copr_builds):
+    url = url_for("api.copr-builds_copr_builds_list")
+    page_1 = client.get(url + "?per_page=20")
+    page_2 = client.get(url + "?page=2&per_page=20")
+
+    unit, _, after = page_1.headers["Next-Range"].partition(" ")
+    assert unit == "copr-builds"
+    assert after.startswith("after=")
+    page_2_after = client.get(url + f"?per_page=20&{after}")
+    assert page_2_after.json == page_2.json
+
+    assert client.get(url + "?after=invalid").status_code == 400
+
+
+def test_export_copr_builds(client, clean_before_and_after, multiple_copr_builds):
+    response = client.get(url_for("api.export_export", model_type="copr-builds"))
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line["packit_id"] for line in lines] == sorted(
+        build.id for build in multiple_copr_builds
+    )
+    assert lines[0]["project_url"] == SampleValues.project_url
+    assert lines[0]["commit_sha"] == SampleValues.commit_sha
+
+    response = client.get(
+        url_for("api.export_export", model_type="copr-builds"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).decode().splitlines() == [
+        json.dumps(line) for line in lines
+    ]
+
+
 # Test detailed build info
 def test_detailed_copr_build_info(client, clean_before_and_after, a_copr_build_for_pr):
     response = client.get(
@@ -507,6 +546,30 @@ def test_process_runs_without_build(clean_before_and_after, runs_without_build):
         assert item["trigger"]
 
 
+def test_process_runs_query_count(clean_before_and_after, too_many_copr_builds):
+    statements = []
+
+    def count_statement(*args, **kwargs):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        small_page = process_runs(PipelineModel.get_merged_chroots(0, 2))
+        small_page_statements = len(statements)
+
+        statements.clear()
+        big_page = process_runs(PipelineModel.get_merged_chroots(0, 50))
+        big_page_statements = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len(small_page) == 2
+    assert len(big_page) == 50
+    assert all(item["srpm"] and item["copr"] and item["trigger"] for item in big_page)
+    # number of statements does not depend on the number of processed runs
+    assert big_page_statements <= small_page_statements
+
+
 def test_propose_downstream_list_releases(
     client,
     clean_before_and_after,
@@ -744,7 +807,7 @@ def test_detailed_pull_from_upstream_without_pr_model(
 def test_usage_info_structure(
     client,
     clean_before_and_after,
-    full_database,
+    full_database_with_usage_rollups,
     key_to_check,
 ):
     response = client.get(url_for("api.usage_usage"))
@@ -753,14 +816,18 @@ def test_usage_info_structure(
     assert nested_get(response_dict, *key_to_check.split("/")) is not None
 
 
-def test_usage_info_datetime(client, clean_before_and_after, full_database):
+def test_usage_info_datetime(
+    client, clean_before_and_after, full_database_with_usage_rollups
+):
     response = client.get(url_for("api.usage_usage") + "?to=2022-12-12")
     response_dict = response.json
 
     assert response_dict["active_projects"]["project_count"] == 0
 
 
-def test_usage_info_top(client, clean_before_and_after, full_database):
+def test_usage_info_top(
+    client, clean_before_and_after, full_database_with_usage_rollups
+):
     response = client.get(url_for("api.usage_usage") + "?top=0")
     response_dict = response.json
 
@@ -810,7 +877,7 @@ def test_usage_info_top(client, clean_before_and_after, full_database):
 def test_usage_info_values(
     client,
     clean_before_and_after,
-    full_database,
+    full_database_with_usage_rollups,
     key_to_check,
     expected_value,
 ):
@@ -823,7 +890,7 @@ def test_usage_info_values(
 def test_project_usage_info(
     client,
     clean_before_and_after,
-    full_database,
+    full_database_with_usage_rollups,
 ):
     response = client.get(
         url_for(